@@ -1,13 +1,13 @@
 import argparse
 from typing import Callable
 
-from decom.parsers import calculator_parser, measurand_parser, parameter_parser
+from decom import parsers
 
 
 def calculator(args) -> None:
     text = args.text
     pv = args.pv
-    out = calculator_parser.parse(text)
+    out = parsers.calculator_parser.parse(text)
     if isinstance(out, Callable):
         print(f"func(pv) = {out(pv)}")
     else:
@@ -17,14 +17,14 @@ def calculator(args) -> None:
 def parameter(args) -> None:
     text = args.text
     print(f"Parameter Parser: {text!r}")
-    out = parameter_parser.parse(text)
+    out = parsers.parameter_parser.parse(text)
     print(f"out = {out}")
 
 
 def measurand(args) -> None:
     text = args.text
     print(f"Mesurand Parser: {text!r}")
-    out = measurand_parser.parse(text)
+    out = parsers.measurand_parser.parse(text)
     print(f"out = {out}")
 
 
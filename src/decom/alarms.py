@@ -0,0 +1,199 @@
+"""Limit checking of decom results, reporting only alarm transitions.
+
+The samples of every measurand with `Measurand.limits` are checked a batch at a
+time. Measurands with the same number of samples in a batch are stacked, so the
+yellow and red checks, hysteresis and persistence run as a few NumPy operations
+over all of them at once. The alarm state of each measurand carries over from
+batch to batch.
+
+Each limit level is a latch: it is set when a value goes beyond the limit and
+cleared once the value is back inside the limit by at least the hysteresis. A
+level is reported once it has been set for `persistence` consecutive samples,
+and the alarm level of a sample is the highest level reported.
+"""
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.measurand import AlarmLevel, Limits, Measurand
+from decom.plan import DecomResult
+
+_LEVELS = [AlarmLevel.YELLOW, AlarmLevel.RED]
+
+
+@dataclass(frozen=True)
+class AlarmEvent:
+    """A change of the alarm level of a measurand."""
+
+    time: np.datetime64
+    name: str
+    level: AlarmLevel
+    previous: AlarmLevel
+    value: float
+
+
+@dataclass
+class _State:
+    # Whether each level is latched, and for how many samples, per measurand
+    latched: NDArray[np.bool]
+    run: NDArray[np.int64]
+    level: int
+
+    @classmethod
+    def nominal(cls) -> "_State":
+        return cls(
+            latched=np.zeros(len(_LEVELS), dtype=bool),
+            run=np.zeros(len(_LEVELS), dtype=np.int64),
+            level=0,
+        )
+
+
+def _fill_forward(
+    decisive: NDArray[np.int8], initial: NDArray[np.bool]
+) -> NDArray[np.bool]:
+    """The latch state after each sample, given 1 (set), 0 (clear) or -1 (hold)."""
+    position = np.arange(decisive.shape[1])
+    last = np.maximum.accumulate(np.where(decisive >= 0, position, -1), axis=1)
+    held = np.take_along_axis(decisive, np.maximum(last, 0), axis=1) == 1
+    return np.where(last >= 0, held, initial[:, None])
+
+
+def _run_lengths(
+    condition: NDArray[np.bool], initial: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """The number of consecutive samples, up to each one, where `condition` holds."""
+    position = np.arange(condition.shape[1])
+    last = np.maximum.accumulate(np.where(condition, -1, position), axis=1)
+    return np.where(last >= 0, position - last, position + 1 + initial[:, None])
+
+
+class AlarmEngine:
+    """Check decom results against the limits of their measurands.
+
+    Call `process` with each DecomResult, in order; it returns the alarm level
+    transitions, including a transition back to NOMINAL when an alarm clears.
+    Measurands start out NOMINAL.
+
+    Parameters
+    ----------
+    measurands
+        The measurands to check; those without limits are ignored.
+    """
+
+    def __init__(self, measurands: Mapping[str, Measurand]) -> None:
+        self.limits: dict[str, Limits] = {
+            name: measurand.limits
+            for name, measurand in measurands.items()
+            if measurand.limits is not None
+        }
+        self._state: dict[str, _State] = {}
+
+    def level(self, name: str) -> AlarmLevel:
+        """The current alarm level of `name`."""
+        state = self._state.get(name)
+        return AlarmLevel(0 if state is None else state.level)
+
+    def reset(self) -> None:
+        """Return every measurand to NOMINAL."""
+        self._state.clear()
+
+    def process(self, result: DecomResult) -> list[AlarmEvent]:
+        """The alarm transitions in `result`, in time order."""
+        groups: dict[int, list[str]] = {}
+        series = {}
+        for name in self.limits:
+            if name in result:
+                series[name] = result.series(name)
+                groups.setdefault(len(series[name][1]), []).append(name)
+
+        found = [
+            self._check(result, names, series) for size, names in groups.items() if size
+        ]
+        if not found:
+            return []
+        names, times, levels, previous, values = (
+            np.concatenate(field) for field in zip(*found)
+        )
+        order = np.argsort(times, kind="stable")
+        return [
+            AlarmEvent(time, name, AlarmLevel(level), AlarmLevel(prev), value)
+            for time, name, level, prev, value in zip(
+                times[order],
+                names[order].tolist(),
+                levels[order].tolist(),
+                previous[order].tolist(),
+                values[order].tolist(),
+            )
+        ]
+
+    def _state_values(self, result: DecomResult, name: str, state: str) -> NDArray:
+        """The value of the `state` measurand at each sample of `name`."""
+        if state not in result:
+            msg = f"the state measurand {state!r} of {name!r} is not in the result"
+            raise ValueError(msg)
+        values = np.asarray(result[state])
+        if values.shape != result.time.shape:
+            msg = f"the state measurand {state!r} must have one value per frame"
+            raise ValueError(msg)
+        if name in result.rows:
+            values = values[result.rows[name]]
+        samples = int(np.prod(result[name].shape[1:]))
+        return np.repeat(values, samples)
+
+    def _bounds(
+        self, result: DecomResult, names: list[str], level: AlarmLevel
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """The (low, high) limits of `level`, broadcastable over the stacked values."""
+        bounds = []
+        for name in names:
+            limits = self.limits[name]
+            state = None
+            if limits.states:
+                state = self._state_values(result, name, limits.state)
+            bounds.append(limits.bounds(level, state))
+        low = np.stack(np.broadcast_arrays(*[b[0] for b in bounds]))
+        high = np.stack(np.broadcast_arrays(*[b[1] for b in bounds]))
+        return low.reshape(len(names), -1), high.reshape(len(names), -1)
+
+    def _check(self, result: DecomResult, names: list[str], series: dict) -> tuple:
+        """Check the stacked `names` and return their transitions as arrays."""
+        values = np.stack([series[name][1] for name in names]).astype(np.float64)
+        states = [self._state.get(name) or _State.nominal() for name in names]
+        hysteresis = np.array([[self.limits[name].hysteresis] for name in names])
+        persistence = np.array([[self.limits[name].persistence] for name in names])
+
+        levels = np.zeros(values.shape, dtype=np.int8)
+        last_latched, last_run = [], []
+        for i, level in enumerate(_LEVELS):
+            low, high = self._bounds(result, names, level)
+            beyond = (values < low) | (values > high)
+            inside = (values >= low + hysteresis) & (values <= high - hysteresis)
+            decisive = np.where(beyond, 1, np.where(inside, 0, -1)).astype(np.int8)
+            latched = _fill_forward(decisive, np.array([s.latched[i] for s in states]))
+            run = _run_lengths(latched, np.array([s.run[i] for s in states]))
+            levels = np.maximum(levels, np.where(run >= persistence, level, 0))
+            last_latched.append(latched[:, -1])
+            last_run.append(run[:, -1])
+
+        initial = np.array([[state.level] for state in states], dtype=np.int8)
+        previous = np.concatenate([initial, levels[:, :-1]], axis=1)
+        rows, columns = np.nonzero(levels != previous)
+        times = np.stack([series[name][0] for name in names])
+        transitions = (
+            np.array(names, dtype=object)[rows],
+            times[rows, columns],
+            levels[rows, columns],
+            previous[rows, columns],
+            values[rows, columns],
+        )
+
+        for row, name in enumerate(names):
+            self._state[name] = _State(
+                latched=np.array([latched[row] for latched in last_latched]),
+                run=np.array([run[row] for run in last_run]),
+                level=int(levels[row, -1]),
+            )
+        return transitions
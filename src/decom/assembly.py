@@ -0,0 +1,85 @@
+from typing import Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.measurand import Parameter
+from decom.model import FrameBatch, MajorFrameBatch, VarUIntArray
+
+
+def assemble_major_frames(
+    frames: FrameBatch,
+    counter: Union[Parameter, NDArray],
+    minor_frames: int,
+    first: int = 0,
+) -> MajorFrameBatch:
+    """Arrange minor frames into major frames using a minor frame counter.
+
+    A new major frame starts whenever the counter does not increase. Minor
+    frames whose counter is outside [first, first + minor_frames) are dropped.
+    When the counter runs through every value in order, from the first minor
+    frame to the last, the result is a zero-copy reshape of the frame data.
+
+    Parameters
+    ----------
+    frames
+        The minor frames, in time order.
+    counter
+        The counter Parameter, or its already built values.
+    minor_frames
+        The number of minor frames in each major frame.
+    first
+        The counter value of the first minor frame in a major frame.
+
+    Returns
+    -------
+    MajorFrameBatch
+        The (major frames x minor frames x words) frames.
+    """
+    if isinstance(counter, Parameter):
+        counter = counter.build(frames.data)
+    counter = np.asarray(counter).ravel()
+    if len(counter) != len(frames.time):
+        msg = f"counter has {len(counter)} values, but there are {len(frames.time)} frames"
+        raise ValueError(msg)
+
+    slot = counter.astype(np.int64) - first
+    keep = (slot >= 0) & (slot < minor_frames)
+    if not keep.all():
+        frames = frames[np.flatnonzero(keep)]
+        slot = slot[keep]
+
+    data = frames.data
+    num_rows, num_words = data.shape
+
+    if num_rows % minor_frames == 0 and np.array_equal(
+        slot, np.tile(np.arange(minor_frames), num_rows // minor_frames)
+    ):
+        shape = (num_rows // minor_frames, minor_frames)
+        return MajorFrameBatch(
+            ctime=frames.ctime.reshape(shape),
+            time=frames.time.reshape(shape),
+            data=data.reshape(shape + (num_words,)),
+            valid=np.ones(shape, dtype=np.bool),
+        )
+
+    major = np.zeros(num_rows, dtype=np.intp)
+    if num_rows:
+        major[1:] = np.cumsum(slot[1:] <= slot[:-1])
+    shape = (int(major[-1]) + 1 if num_rows else 0, minor_frames)
+
+    result = np.zeros(shape + (num_words,), dtype=data.dtype)
+    result[major, slot] = data
+    ctime = np.full(shape, np.datetime64("NaT", "ns"), dtype=frames.ctime.dtype)
+    ctime[major, slot] = frames.ctime
+    time = np.full(shape, np.datetime64("NaT", "ns"), dtype=frames.time.dtype)
+    time[major, slot] = frames.time
+    valid = np.zeros(shape, dtype=np.bool)
+    valid[major, slot] = True
+
+    return MajorFrameBatch(
+        ctime=ctime,
+        time=time,
+        data=VarUIntArray(result, word_size=data.word_size),
+        valid=valid,
+    )
@@ -0,0 +1,123 @@
+from typing import Literal, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.model import VarUIntArray
+
+# Words up to this size always fit in a 64-bit window starting at their first byte
+_MAX_WINDOW_WORD_SIZE = 57
+
+
+def _as_bytes(buffer: Union[bytes, bytearray, memoryview, NDArray]) -> NDArray:
+    if isinstance(buffer, np.ndarray):
+        return buffer.view(np.uint8).ravel()
+    return np.frombuffer(buffer, dtype=np.uint8)
+
+
+def unpack_words(
+    buffer: Union[bytes, bytearray, memoryview, NDArray],
+    word_size: int,
+    words_per_frame: int,
+    bit_order: Literal["msb", "lsb"] = "msb",
+) -> VarUIntArray:
+    """Unpack a stream of back-to-back `word_size`-bit words into frames.
+
+    Each word is read from a 64-bit window that starts at the byte holding its
+    first bit. The windows are strided views of the buffer, shifted eight
+    phases at a time, so there is no per-word Python loop. Incomplete frames at
+    the end of the buffer are dropped.
+
+    Parameters
+    ----------
+    buffer
+        The packed bytes.
+    word_size
+        The number of bits in each word, from 1 to 64.
+    words_per_frame
+        The number of words in each frame.
+    bit_order
+        "msb" if the first bit of the stream is the most significant bit of the
+        first byte and of the first word, "lsb" if it is the least significant.
+
+    Returns
+    -------
+    VarUIntArray
+        A (frames x words_per_frame) array of words.
+    """
+    if not 1 <= word_size <= 64:
+        msg = f"word_size={word_size!r} must be between 1 and 64"
+        raise ValueError(msg)
+    if bit_order not in ("msb", "lsb"):
+        msg = f"bit_order={bit_order!r} must be 'msb' or 'lsb'"
+        raise ValueError(msg)
+
+    data = _as_bytes(buffer)
+    num_frames = (len(data) * 8) // (word_size * words_per_frame)
+    num_words = num_frames * words_per_frame
+
+    if word_size > _MAX_WINDOW_WORD_SIZE:
+        words = _unpack_bits(data, word_size, num_words, bit_order)
+    elif word_size % 8 == 0 and bit_order == "msb":
+        words = _unpack_aligned(data, word_size, num_words)
+    else:
+        words = _unpack_windows(data, word_size, num_words, bit_order)
+
+    return VarUIntArray(words.reshape(num_frames, words_per_frame), word_size=word_size)
+
+
+def _unpack_aligned(data: NDArray, word_size: int, num_words: int) -> NDArray:
+    """Unpack byte-aligned big-endian words by combining their bytes."""
+    width = word_size // 8
+    octets = data[: num_words * width].reshape(num_words, width).astype(np.uint64)
+    result = np.zeros(num_words, dtype=np.uint64)
+    for idx in range(width):
+        result <<= np.uint64(8)
+        result |= octets[:, idx]
+    return result
+
+
+def _unpack_windows(
+    data: NDArray, word_size: int, num_words: int, bit_order: str
+) -> NDArray:
+    """Unpack words by shifting and masking the 64-bit window of each word.
+
+    Every eighth word starts `word_size` bytes after the one before, at the
+    same bit within its byte, so the windows of each of the eight phases are a
+    strided view of the buffer and are shifted out without gathering.
+    """
+    # Pad so that the window of the last word never runs off the end of the buffer
+    padded = np.concatenate([data, np.zeros(8, dtype=np.uint8)])
+    dtype = ">u8" if bit_order == "msb" else "<u8"
+    mask = np.uint64(2**word_size - 1)
+
+    result = np.empty(num_words, dtype=np.uint64)
+    for phase in range(min(8, num_words)):
+        start = phase * word_size
+        windows = np.ndarray(
+            (len(range(phase, num_words, 8)),),
+            dtype=dtype,
+            buffer=padded,
+            offset=start // 8,
+            strides=(word_size,),
+        )
+        if bit_order == "msb":
+            shift = np.uint64(64 - word_size - start % 8)
+        else:
+            shift = np.uint64(start % 8)
+        result[phase::8] = (windows >> shift) & mask
+    return result
+
+
+def _unpack_bits(
+    data: NDArray, word_size: int, num_words: int, bit_order: str
+) -> NDArray:
+    """Unpack words too large for a 64-bit window from the individual bits."""
+    order = "big" if bit_order == "msb" else "little"
+    bits = np.unpackbits(data, bitorder=order)[: num_words * word_size]
+    bits = bits.reshape(num_words, word_size).astype(np.uint64)
+    if bit_order == "msb":
+        weights = np.uint64(1) << np.arange(word_size - 1, -1, -1, dtype=np.uint64)
+    else:
+        weights = np.uint64(1) << np.arange(word_size, dtype=np.uint64)
+    return np.bitwise_or.reduce(bits * weights, axis=1)
@@ -0,0 +1,174 @@
+import hashlib
+import importlib.metadata
+import os
+import pathlib
+import pickle
+import re
+import sys
+import tempfile
+from typing import Any, Callable, Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+# Bump to invalidate every cache entry when the payload layout changes
+CACHE_FORMAT = 1
+
+_INCLUDE_RE = re.compile(
+    r"^\s*INCLUDE\s*=\s*(?P<path>[^#\r\n]+?)\s*(?:#.*)?$", re.MULTILINE
+)
+
+
+def _decom_version() -> str:
+    try:
+        return importlib.metadata.version("decom")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def default_cache_dir() -> pathlib.Path:
+    """The cache directory: $DECOM_CACHE_DIR, else $XDG_CACHE_HOME/decom or ~/.cache/decom."""
+    if "DECOM_CACHE_DIR" in os.environ:
+        return pathlib.Path(os.environ["DECOM_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "decom"
+
+
+def include_closure(path: PathLike) -> list[pathlib.Path]:
+    """The file at `path` followed by every file it INCLUDEs, directly or not.
+
+    Relative include paths are resolved against the directory of the including
+    file. Includes that do not exist are skipped.
+    """
+    root = pathlib.Path(path).resolve()
+    seen: dict[pathlib.Path, None] = {}
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        if current in seen or not current.is_file():
+            continue
+        seen[current] = None
+        text = current.read_text()
+        for match in _INCLUDE_RE.finditer(text):
+            pending.append((current.parent / match["path"]).resolve())
+    return list(seen)
+
+
+def _parse_decom_file(path: PathLike) -> Any:
+    from decom.parsers import decom_parser
+
+    return decom_parser.parse(pathlib.Path(path).read_text())
+
+
+def _namespace(parse: Callable[[PathLike], Any], namespace: Optional[str]) -> str:
+    """The name distinguishing the entries of `parse` from other parsers'."""
+    if namespace is not None:
+        return namespace
+    module = sys.modules.get(getattr(parse, "__module__", None) or "")
+    qualname = getattr(parse, "__qualname__", "")
+    obj: Any = module
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr, None)
+    if module is None or obj is not parse:
+        msg = (
+            f"{parse!r} is not a module-level function, so it has no stable name; "
+            "pass a namespace"
+        )
+        raise ValueError(msg)
+    return f"{parse.__module__}.{qualname}"
+
+
+class ParseCache:
+    """Pickled parse results stored on disk, keyed by the content they came from.
+
+    The key is a hash of the decom version, a namespace naming the parse
+    function and the path and contents of every file in the INCLUDE closure of
+    the parsed file, so editing any included file invalidates the entry. The
+    namespace defaults to the qualified name of a module-level parse function;
+    other callables, e.g. lambdas, need an explicit one. Entries are written atomically, and
+    an unreadable entry is treated as a miss.
+
+    Parameters
+    ----------
+    directory
+        Where the cache files are kept, by default `default_cache_dir()`.
+    """
+
+    def __init__(self, directory: Optional[PathLike] = None) -> None:
+        self.directory = pathlib.Path(
+            default_cache_dir() if directory is None else directory
+        )
+
+    def key(
+        self,
+        path: PathLike,
+        parse: Callable[[PathLike], Any],
+        recursive: bool = True,
+        namespace: Optional[str] = None,
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT}\0{_decom_version()}\0".encode())
+        digest.update(f"{_namespace(parse, namespace)}\0".encode())
+        files = include_closure(path) if recursive else [pathlib.Path(path).resolve()]
+        for file in files:
+            content = file.read_bytes()
+            digest.update(f"{file}\0{len(content)}\0".encode())
+            digest.update(content)
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.pickle"
+
+    def load(
+        self,
+        path: PathLike,
+        parse: Optional[Callable[[PathLike], Any]] = None,
+        recursive: bool = True,
+        namespace: Optional[str] = None,
+    ) -> Any:
+        """Parse `path` with `parse`, or load the cached result of doing so.
+
+        Parameters
+        ----------
+        path
+            The file to parse.
+        parse
+            Called with `path` on a cache miss; its result must be picklable.
+            By default the file is parsed with `decom_parser`.
+        recursive
+            Whether the result depends on the files `path` INCLUDEs. If False,
+            only `path` itself is hashed.
+        namespace
+            Distinguishes the results of `parse` from those of other parsers.
+            Required unless `parse` is a module-level function.
+        """
+        parse = _parse_decom_file if parse is None else parse
+        entry = self._entry(self.key(path, parse, recursive, namespace))
+
+        try:
+            with open(entry, "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Written by an incompatible version or truncated; parse again
+            entry.unlink(missing_ok=True)
+
+        result = parse(path)
+        self._store(entry, result)
+        return result
+
+    def _store(self, entry: pathlib.Path, result: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for entry in self.directory.glob("*.pickle"):
+            entry.unlink(missing_ok=True)
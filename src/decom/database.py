@@ -0,0 +1,147 @@
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Union
+
+from decom.cache import ParseCache
+from decom.measurand import Measurand
+
+PathLike = Union[str, os.PathLike]
+
+
+@dataclass
+class Function:
+    """A named call to an external function, e.g. `name = function(args)`."""
+
+    name: str
+    function: str
+    args: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Database:
+    """The measurands, USELISTs, functions and directives of a decom file tree.
+
+    Measurands are indexed by name, as are the members of each USELIST, so
+    lookups and membership tests do not scan the database. Members of a USELIST
+    are also measurands of the database in their own right.
+
+    `includes` holds the INCLUDE paths as written in a single parsed file;
+    `files` holds the resolved files a loaded database was built from.
+    """
+
+    measurands: dict[str, Measurand] = field(default_factory=dict)
+    uselists: dict[str, dict[str, Measurand]] = field(default_factory=dict)
+    functions: dict[str, Function] = field(default_factory=dict)
+    directives: dict[str, str] = field(default_factory=dict)
+    includes: list[str] = field(default_factory=list)
+    files: list[pathlib.Path] = field(default_factory=list)
+
+    def __getitem__(self, name: str) -> Measurand:
+        return self.measurands[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.measurands
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.measurands)
+
+    def __len__(self) -> int:
+        return len(self.measurands)
+
+    def add_measurand(self, name: str, measurand: Measurand) -> None:
+        if name in self.measurands:
+            msg = f"measurand {name!r} is defined more than once"
+            raise ValueError(msg)
+        self.measurands[name] = measurand
+
+    def add_uselist(self, name: str, members: dict[str, Measurand]) -> None:
+        for member, measurand in members.items():
+            self.add_measurand(member, measurand)
+        self.uselists.setdefault(name, {}).update(members)
+
+    def uselist(self, name: str) -> dict[str, Measurand]:
+        """The members of USELIST `name`, keyed by measurand name."""
+        return self.uselists[name]
+
+    def merge(self, other: "Database") -> None:
+        """Add the definitions of `other`; measurand names must not repeat."""
+        for name, measurand in other.measurands.items():
+            self.add_measurand(name, measurand)
+        for name, members in other.uselists.items():
+            self.uselists.setdefault(name, {}).update(members)
+        self.functions.update(other.functions)
+        self.directives.update(other.directives)
+        self.files.extend(other.files)
+
+
+def parse_file(path: PathLike, cache: Optional[ParseCache] = None) -> Database:
+    """Parse a single decom file, without following its INCLUDEs."""
+    if cache is not None:
+        return cache.load(path, _parse_file, recursive=False)
+    return _parse_file(path)
+
+
+def _parse_file(path: PathLike) -> Database:
+    from decom.parsers import decom_parser
+
+    database = decom_parser.parse(pathlib.Path(path).read_text())
+    database.files = [pathlib.Path(path).resolve()]
+    return database
+
+
+def load_database(
+    path: PathLike,
+    max_workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+) -> Database:
+    """Load a decom file and every file it INCLUDEs into one Database.
+
+    Files are parsed a level of the include tree at a time, with the files of
+    each level parsed in parallel across a process pool. Relative INCLUDE paths
+    are resolved against the directory of the including file. A file included
+    more than once, including through a cycle, is only parsed and merged once.
+
+    Parameters
+    ----------
+    path
+        The top-level decom file.
+    max_workers
+        The number of worker processes. With 1, every file is parsed in this
+        process.
+    cache
+        If given, parsed files are loaded from and stored in this cache.
+    """
+    root = pathlib.Path(path).resolve()
+    seen = {root}
+    level = [root]
+    parsed: list[Database] = []
+
+    # Only start worker processes once a level has more than one file
+    executor = None
+    try:
+        while level:
+            if max_workers == 1 or len(level) == 1:
+                results = [parse_file(file, cache) for file in level]
+            else:
+                executor = executor or ProcessPoolExecutor(max_workers)
+                results = list(executor.map(parse_file, level, [cache] * len(level)))
+
+            following = []
+            for file, result in zip(level, results):
+                parsed.append(result)
+                for include in result.includes:
+                    target = (file.parent / include).resolve()
+                    if target not in seen:
+                        seen.add(target)
+                        following.append(target)
+            level = following
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    database = Database()
+    for result in parsed:
+        database.merge(result)
+    return database
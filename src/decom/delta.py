@@ -0,0 +1,125 @@
+"""Change-only output for slowly varying measurands.
+
+Instead of every sample, only the samples where a measurand's value changes are
+kept, plus periodic keyframes so that a reader joining the stream late, or a
+gap in the data, never leaves a value unknown for long. The last value and the
+samples since the last kept one carry over from batch to batch, so a value that
+stays the same across a batch boundary is not repeated.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.plan import DecomResult
+
+Series = tuple[NDArray[np.datetime64], NDArray]
+
+
+@dataclass
+class _State:
+    # The last sample seen
+    last: NDArray
+    # The samples seen since the last one kept
+    since: int
+
+
+def _changes(values: NDArray, last: Optional[NDArray]) -> NDArray[np.bool]:
+    """Which samples differ from the one before; NaN equals NaN."""
+    previous = values[:-1] if last is None else np.concatenate([last, values[:-1]])
+    current = values[len(values) - len(previous) :]
+    changed = current != previous
+    if np.issubdtype(values.dtype, np.inexact):
+        changed &= ~(np.isnan(current) & np.isnan(previous))
+    if last is None:
+        changed = np.concatenate([[True], changed])
+    return changed
+
+
+def _keyframes(
+    kept: NDArray[np.intp], first: int, end: int, every: int
+) -> NDArray[np.intp]:
+    """Samples to keep so no run of `every` samples goes without a kept one.
+
+    `kept` are the indices already kept, `first` the index of the last sample
+    kept before them (possibly negative, from an earlier batch) and `end` the
+    number of samples.
+    """
+    anchors = np.concatenate([[first], kept])
+    ends = np.concatenate([kept, [end]])
+    counts = np.maximum((ends - anchors - 1) // every, 0)
+    total = counts.sum()
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    starts = np.cumsum(counts) - counts
+    steps = np.arange(total) - np.repeat(starts, counts) + 1
+    return np.repeat(anchors, counts) + steps * every
+
+
+class ChangeOnly:
+    """Keep only the changes, and periodic keyframes, of measurand series.
+
+    Call `process` with each DecomResult, in order. Each measurand is returned
+    as a time-ordered (times, values) series, like `DecomResult.series`. To
+    write the changes out, pass this to a `ColumnWriter` instead.
+
+    Parameters
+    ----------
+    names
+        The measurands output change-only; the others are output in full. By
+        default, every measurand is output change-only.
+    keyframe_every
+        Keep at least one sample in every run of this many samples, even if the
+        value has not changed. By default, only changes are kept.
+    """
+
+    def __init__(
+        self,
+        names: Optional[Iterable[str]] = None,
+        keyframe_every: Optional[int] = None,
+    ) -> None:
+        if keyframe_every is not None and keyframe_every < 1:
+            msg = f"keyframe_every={keyframe_every!r} must be positive"
+            raise ValueError(msg)
+        self.names = None if names is None else set(names)
+        self.keyframe_every = keyframe_every
+        self._state: dict[str, _State] = {}
+
+    def reset(self) -> None:
+        """Forget the carried-over state, so the next samples are all kept."""
+        self._state.clear()
+
+    def includes(self, name: str) -> bool:
+        """Whether measurand `name` is output change-only."""
+        return self.names is None or name in self.names
+
+    def process(self, result: DecomResult) -> dict[str, Series]:
+        """The series of every measurand in `result`, with only its changes kept."""
+        output = {}
+        for name in result:
+            time, values = result.series(name)
+            if self.includes(name):
+                keep = self.select(name, values)
+                time, values = time[keep], values[keep]
+            output[name] = (time, values)
+        return output
+
+    def select(self, name: str, values: NDArray) -> NDArray[np.intp]:
+        """The indices of the samples of `name` to keep, updating its state."""
+        state = self._state.get(name)
+        if not len(values):
+            return np.empty(0, dtype=np.intp)
+
+        keep = np.flatnonzero(_changes(values, None if state is None else state.last))
+        if self.keyframe_every is not None:
+            first = -1 if state is None else -1 - state.since
+            keyframes = _keyframes(keep, first, len(values), self.keyframe_every)
+            keep = np.union1d(keep, keyframes).astype(np.intp)
+
+        since = len(values) - 1 - keep[-1] if len(keep) else len(values)
+        if state is not None and not len(keep):
+            since += state.since
+        self._state[name] = _State(last=values[-1:].copy(), since=since)
+        return keep
@@ -1,4 +1,5 @@
 # ruff: noqa: F401
+from .limits import AlarmLevel, Limits, LimitSet
 from .measurand import EUC, Interp, Measurand
 from .parameter import (
     BasicParameter,
@@ -9,5 +10,13 @@ from .parameter import (
     GeneratorParameter,
     Iterator,
     Parameter,
+    ParameterKernel,
     SupercomParameter,
 )
+from .sampling import (
+    FrameSelector,
+    MinorFrameOffset,
+    MinorFrameValue,
+    SamplingStrategy,
+    SelectorState,
+)
@@ -1,9 +1,18 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, Optional, Union
 
 import numpy as np
 from numpy.typing import NDArray
 
+from .expression import (
+    Coefficients,
+    Node,
+    horner,
+    optimize,
+    poly_compose_shift,
+    to_polynomial,
+)
+
 Number = Union[int, float]
 
 
@@ -13,11 +22,42 @@ class EUC:
     data_bias: Optional[Number] = None
     scaled_bias: Optional[Number] = None
 
+    _polynomial: Optional[Coefficients] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
     def __post_init__(self) -> None:
-        if isinstance(self.scale_factor, Callable):
+        if isinstance(self.scale_factor, Node):
+            self.scale_factor = optimize(self.scale_factor)
+        elif isinstance(self.scale_factor, Callable):
             self.scale_factor = np.vectorize(self.scale_factor)
 
+        self._polynomial = self._as_polynomial()
+
+    def _as_polynomial(self) -> Optional[Coefficients]:
+        """Combine the biases and scale factor into a single polynomial, if possible."""
+        if isinstance(self.scale_factor, Node):
+            coefficients = to_polynomial(self.scale_factor)
+        elif isinstance(self.scale_factor, Callable):
+            coefficients = None
+        else:
+            coefficients = (0, self.scale_factor)
+
+        if coefficients is None:
+            return None
+
+        if self.data_bias is not None:
+            coefficients = poly_compose_shift(coefficients, -self.data_bias)
+
+        if self.scaled_bias is not None:
+            coefficients = (coefficients[0] + self.scaled_bias,) + coefficients[1:]
+
+        return coefficients
+
     def apply(self, data: NDArray) -> NDArray:
+        if self._polynomial is not None:
+            return horner(data, self._polynomial)
+
         result = data
 
         if self.data_bias is not None:
@@ -0,0 +1,517 @@
+import abc
+import functools
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+Number = Union[int, float]
+
+
+def nxtwo(val: Number) -> int:
+    return 2 ** math.ceil(math.log(val, 2))
+
+
+def deg(val: Number) -> float:
+    return 180 / math.pi * val
+
+
+def rad(val: Number) -> float:
+    return math.pi / 180 * val
+
+
+def tento(val: Number) -> Number:
+    return 10**val
+
+
+def hamdist(a: int, b: int) -> int:
+    return f"{a ^ b:b}".count("1")
+
+
+def if_(a: Number, b: Number, c: Number) -> Number:
+    return b if a > 0 else c
+
+
+def _nxtwo(val: NDArray) -> NDArray:
+    return np.exp2(np.ceil(np.log2(val)))
+
+
+def _hamdist(a: NDArray, b: NDArray) -> NDArray:
+    # Values arrive as floats, so reject those that are not whole numbers, as
+    # `hamdist` does, rather than truncating them
+    a, b = np.asarray(a), np.asarray(b)
+    for values in (a, b):
+        if not np.all(np.mod(values, 1) == 0):
+            msg = "hamdist requires integer arguments"
+            raise TypeError(msg)
+    a, b = a.astype(np.int64), b.astype(np.int64)
+    return np.bitwise_count(np.bitwise_xor(a, b)).astype(np.float64)
+
+
+def _if(a: NDArray, b: NDArray, c: NDArray) -> NDArray:
+    return np.where(np.greater(a, 0), b, c)
+
+
+def _max(*args: NDArray) -> NDArray:
+    return functools.reduce(np.maximum, args)
+
+
+def _min(*args: NDArray) -> NDArray:
+    return functools.reduce(np.minimum, args)
+
+
+@dataclass(frozen=True)
+class Operator:
+    """A calculator operation with a scalar and a vectorized implementation.
+
+    The scalar implementation is the reference behavior of the calculator and is
+    used when folding constants. The vectorized implementation operates on whole
+    float64 arrays with NumPy ufuncs and must agree with the scalar one.
+    """
+
+    name: str
+    scalar: Callable[..., Number]
+    vector: Callable[..., NDArray]
+
+
+OPERATORS: dict[str, Operator] = {
+    op.name: op
+    for op in [
+        Operator("neg", lambda a: -a, np.negative),
+        Operator("float", float, lambda a: np.asarray(a, dtype=np.float64)),
+        Operator("integer", int, np.trunc),
+        Operator("add", lambda a, b: a + b, np.add),
+        Operator("sub", lambda a, b: a - b, np.subtract),
+        Operator("mul", lambda a, b: a * b, np.multiply),
+        Operator("div", lambda a, b: a / b, np.true_divide),
+        Operator("pow", lambda a, b: a**b, np.power),
+        Operator("exp", lambda a: math.e**a, np.exp),
+        Operator("round", round, np.round),
+        Operator("floor", math.floor, np.floor),
+        Operator("ceil", math.ceil, np.ceil),
+        Operator("nxtwo", nxtwo, _nxtwo),
+        Operator("sin", math.sin, np.sin),
+        Operator("cos", math.cos, np.cos),
+        Operator("tan", math.tan, np.tan),
+        Operator("asin", math.asin, np.arcsin),
+        Operator("acos", math.acos, np.arccos),
+        Operator("atan", math.atan, np.arctan),
+        Operator("atan2", math.atan2, np.arctan2),
+        Operator("deg", deg, np.degrees),
+        Operator("rad", rad, np.radians),
+        Operator("abs", abs, np.abs),
+        Operator("tento", tento, lambda a: np.power(10.0, a)),
+        Operator("log", math.log, np.log),
+        Operator("log10", math.log10, np.log10),
+        Operator("sqrt", math.sqrt, np.sqrt),
+        Operator("hamdist", hamdist, _hamdist),
+        Operator("max", lambda *args: max(args), _max),
+        Operator("min", lambda *args: min(args), _min),
+        Operator("if_", if_, _if),
+    ]
+}
+
+
+class Node(abc.ABC):
+    """A node of a compiled calculator expression.
+
+    Calling a node evaluates the expression for every element of `pv` at once.
+    Scalar inputs produce Python scalars, array inputs produce float64 arrays.
+    """
+
+    def __call__(self, pv: Union[Number, NDArray]) -> Union[Number, NDArray]:
+        values = np.asarray(pv, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            result = np.asarray(self.evaluate(values), dtype=np.float64)
+        if values.ndim == 0:
+            return result.item()
+        if result.shape != values.shape:
+            result = np.broadcast_to(result, values.shape).copy()
+        return result
+
+    @abc.abstractmethod
+    def evaluate(self, pv: NDArray) -> NDArray:
+        """Evaluate the expression over an array of values with NumPy ufuncs."""
+
+    @abc.abstractmethod
+    def reference(self, pv: Number) -> Number:
+        """Evaluate the expression for a single value with the scalar functions."""
+
+
+@dataclass(frozen=True)
+class Variable(Node):
+    """The calculator input, `PV`."""
+
+    def __str__(self) -> str:
+        return "PV"
+
+    def evaluate(self, pv: NDArray) -> NDArray:
+        return pv
+
+    def reference(self, pv: Number) -> Number:
+        return pv
+
+
+@dataclass(frozen=True)
+class Constant(Node):
+    value: Number
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def evaluate(self, pv: NDArray) -> NDArray:
+        return np.float64(self.value)
+
+    def reference(self, pv: Number) -> Number:
+        return self.value
+
+
+@dataclass(frozen=True)
+class Apply(Node):
+    op: str
+    args: tuple[Node, ...]
+
+    def __post_init__(self) -> None:
+        if self.op not in OPERATORS:
+            msg = f"{self.op!r} is not a valid calculator operation"
+            raise ValueError(msg)
+
+    def __str__(self) -> str:
+        return f"{self.op}({', '.join(str(a) for a in self.args)})"
+
+    def evaluate(self, pv: NDArray) -> NDArray:
+        return OPERATORS[self.op].vector(*[a.evaluate(pv) for a in self.args])
+
+    def reference(self, pv: Number) -> Number:
+        return OPERATORS[self.op].scalar(*[a.reference(pv) for a in self.args])
+
+
+def apply(op: str, *args: Union[Node, Number]) -> Union[Node, Number]:
+    """Build the node for `op(*args)`.
+
+    If none of the arguments depend on `PV`, the operation is evaluated immediately
+    with the scalar reference implementation and a plain number is returned.
+    """
+    if not any(isinstance(a, Node) for a in args):
+        return OPERATORS[op].scalar(*args)
+    nodes = tuple(a if isinstance(a, Node) else Constant(a) for a in args)
+    return Apply(op, nodes)
+
+
+# The largest polynomial degree recognized by `to_polynomial`. Higher-order forms
+# are left as expression trees.
+MAX_POLYNOMIAL_DEGREE = 8
+
+Coefficients = tuple[Number, ...]
+
+
+def horner(pv: NDArray, coefficients: Coefficients) -> NDArray:
+    """Evaluate the polynomial `sum(c[i] * pv**i)` with Horner's method.
+
+    Coefficients are in ascending order of degree. Degree-one polynomials are
+    evaluated as a single multiply-add.
+    """
+    pv = np.asarray(pv, dtype=np.float64)
+    if len(coefficients) == 1:
+        return np.full(pv.shape, coefficients[0], dtype=np.float64)
+
+    result = np.multiply(pv, coefficients[-1], dtype=np.float64)
+    for idx, c in enumerate(reversed(coefficients[:-1])):
+        if idx:
+            result *= pv
+        if c:
+            result += c
+    return result
+
+
+def _poly_trim(a: Coefficients) -> Coefficients:
+    a = list(a)
+    while len(a) > 1 and a[-1] == 0:
+        a.pop()
+    return tuple(a)
+
+
+def _poly_add(a: Coefficients, b: Coefficients) -> Coefficients:
+    n = max(len(a), len(b))
+    a = tuple(a) + (0,) * (n - len(a))
+    b = tuple(b) + (0,) * (n - len(b))
+    return _poly_trim(x + y for x, y in zip(a, b))
+
+
+def _poly_scale(a: Coefficients, k: Number) -> Coefficients:
+    return _poly_trim(x * k for x in a)
+
+
+def _poly_mul(a: Coefficients, b: Coefficients) -> Coefficients:
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            result[i + j] += x * y
+    return _poly_trim(result)
+
+
+def _poly_cancels(a: Coefficients, b: Coefficients, result: Coefficients) -> bool:
+    """Whether a term in `PV` of `a` or `b` is missing from `result`.
+
+    Such a cancellation, e.g. in `PV-PV`, only holds for finite `PV`; for inf or
+    nan the expression is nan, so it must not be simplified away.
+    """
+    for i in range(1, max(len(a), len(b))):
+        used = (i < len(a) and a[i] != 0) or (i < len(b) and b[i] != 0)
+        if used and (i >= len(result) or result[i] == 0):
+            return True
+    return False
+
+
+def _exact_reciprocal(c: Number) -> bool:
+    """Whether `1 / c` is exact, i.e. `c` is a finite power of two."""
+    if c == 0 or not math.isfinite(c) or not math.isfinite(1 / c):
+        return False
+    return abs(math.frexp(c)[0]) == 0.5
+
+
+def poly_compose_shift(a: Coefficients, shift: Number) -> Coefficients:
+    """Return the coefficients of `p(PV + shift)` given those of `p(PV)`."""
+    result = (0,)
+    for c in reversed(a):
+        result = _poly_add(_poly_mul(result, (shift, 1)), (c,))
+    return result
+
+
+def to_polynomial(node: Union[Node, Number]) -> Optional[Coefficients]:
+    """Recognize `node` as a polynomial in `PV`.
+
+    Returns
+    -------
+    tuple or None
+        The coefficients in ascending order of degree, or None if the expression
+        is not a polynomial of degree `MAX_POLYNOMIAL_DEGREE` or less.
+    """
+    if not isinstance(node, Node):
+        return (node,)
+    if isinstance(node, Variable):
+        return (0, 1)
+    if isinstance(node, Constant):
+        return (node.value,)
+    if isinstance(node, Polynomial):
+        return node.coefficients
+    if not isinstance(node, Apply):
+        return None
+
+    if node.op == "float":
+        return to_polynomial(node.args[0])
+    if node.op == "neg":
+        a = to_polynomial(node.args[0])
+        return None if a is None else _poly_scale(a, -1)
+
+    if node.op not in ("add", "sub", "mul", "div", "pow"):
+        return None
+
+    lhs, rhs = node.args
+    a = to_polynomial(lhs)
+    if a is None:
+        return None
+
+    if node.op == "pow":
+        if not isinstance(rhs, Constant):
+            return None
+        exponent = rhs.value
+        if exponent != int(exponent) or not 0 <= exponent <= MAX_POLYNOMIAL_DEGREE:
+            return None
+        result = (1,)
+        for _ in range(int(exponent)):
+            result = _poly_mul(result, a)
+    else:
+        b = to_polynomial(rhs)
+        if b is None:
+            return None
+        if node.op == "add":
+            result = _poly_add(a, b)
+            if _poly_cancels(a, b, result):
+                return None
+        elif node.op == "sub":
+            result = _poly_add(a, _poly_scale(b, -1))
+            if _poly_cancels(a, b, result):
+                return None
+        elif node.op == "mul":
+            # `PV*0` is nan, not 0, for inf or nan `PV`
+            if (a == (0,) and len(b) > 1) or (b == (0,) and len(a) > 1):
+                return None
+            result = _poly_mul(a, b)
+        else:
+            # Multiplying by the reciprocal rounds differently from dividing,
+            # e.g. `floor(PV/49)` at 49, unless the reciprocal is exact
+            if len(b) != 1 or not _exact_reciprocal(b[0]):
+                return None
+            result = _poly_scale(a, 1 / b[0])
+
+    if len(result) - 1 > MAX_POLYNOMIAL_DEGREE:
+        return None
+    return result
+
+
+@dataclass(frozen=True)
+class Polynomial(Node):
+    """A polynomial in `PV`, evaluated with Horner's method.
+
+    Coefficients are in ascending order of degree.
+    """
+
+    coefficients: Coefficients
+
+    def __str__(self) -> str:
+        return f"poly({', '.join(str(c) for c in self.coefficients)})"
+
+    def evaluate(self, pv: NDArray) -> NDArray:
+        return horner(pv, self.coefficients)
+
+    def reference(self, pv: Number) -> Number:
+        result = 0
+        for c in reversed(self.coefficients):
+            result = result * pv + c
+        return result
+
+
+@dataclass(frozen=True)
+class Program(Node):
+    """An expression in which repeated subexpressions are evaluated only once.
+
+    `steps` lists every distinct subexpression of `root` in evaluation order.
+    Each step is an operation name and the indices of the earlier steps it uses.
+    """
+
+    root: Node
+    steps: tuple[Union[Node, tuple[str, tuple[int, ...]]], ...]
+
+    def __str__(self) -> str:
+        return str(self.root)
+
+    def evaluate(self, pv: NDArray) -> NDArray:
+        values = []
+        for step in self.steps:
+            if isinstance(step, Node):
+                values.append(step.evaluate(pv))
+            else:
+                op, args = step
+                values.append(OPERATORS[op].vector(*[values[i] for i in args]))
+        return values[-1]
+
+    def reference(self, pv: Number) -> Number:
+        return self.root.reference(pv)
+
+
+def fold_constants(node: Node) -> Node:
+    """Evaluate every subexpression that does not depend on `PV`."""
+    if not isinstance(node, Apply):
+        return node
+    args = tuple(fold_constants(a) for a in node.args)
+    if all(isinstance(a, Constant) for a in args):
+        return Constant(OPERATORS[node.op].scalar(*[a.value for a in args]))
+    return Apply(node.op, args)
+
+
+def _is_constant(node: Node, value: Number) -> bool:
+    return isinstance(node, Constant) and node.value == value
+
+
+def remove_identities(node: Node) -> Node:
+    """Remove operations that do not change their argument, e.g. `PV+0` or `PV*1`."""
+    if not isinstance(node, Apply):
+        return node
+    args = tuple(remove_identities(a) for a in node.args)
+
+    if node.op == "add":
+        if _is_constant(args[0], 0):
+            return args[1]
+        if _is_constant(args[1], 0):
+            return args[0]
+    elif node.op == "sub":
+        if _is_constant(args[1], 0):
+            return args[0]
+        if _is_constant(args[0], 0):
+            return Apply("neg", (args[1],))
+    elif node.op == "mul":
+        if _is_constant(args[0], 1):
+            return args[1]
+        if _is_constant(args[1], 1):
+            return args[0]
+    elif node.op in ("div", "pow"):
+        if _is_constant(args[1], 1):
+            return args[0]
+    elif node.op == "neg":
+        if isinstance(args[0], Apply) and args[0].op == "neg":
+            return args[0].args[0]
+    elif node.op == "float":
+        # All values are evaluated as floats already
+        return args[0]
+    return Apply(node.op, args)
+
+
+def simplify_polynomials(node: Node) -> Node:
+    """Replace the largest polynomial subexpressions with `Polynomial` nodes."""
+    if isinstance(node, Polynomial):
+        coefficients = node.coefficients
+    elif isinstance(node, Apply):
+        coefficients = to_polynomial(node)
+    else:
+        return node
+
+    if coefficients is None:
+        return Apply(node.op, tuple(simplify_polynomials(a) for a in node.args))
+    if len(coefficients) == 1:
+        return Constant(coefficients[0])
+    if coefficients == (0, 1):
+        return Variable()
+    return Polynomial(coefficients)
+
+
+def eliminate_common_subexpressions(node: Node) -> Node:
+    """Share repeated subexpressions so that each is evaluated only once.
+
+    Returns `node` unchanged if it has no repeated subexpressions, otherwise a
+    `Program` which evaluates each distinct subexpression a single time.
+    """
+    slots: dict[Node, int] = {}
+    steps: list = []
+    repeated = False
+
+    def visit(n: Node) -> int:
+        nonlocal repeated
+        if n in slots:
+            repeated = repeated or not isinstance(n, (Variable, Constant))
+            return slots[n]
+        if isinstance(n, Apply):
+            args = tuple(visit(a) for a in n.args)
+            steps.append((n.op, args))
+        else:
+            steps.append(n)
+        slots[n] = len(steps) - 1
+        return slots[n]
+
+    visit(node)
+    if not repeated:
+        return node
+    return Program(root=node, steps=tuple(steps))
+
+
+def optimize(node: Union[Node, Number]) -> Union[Node, Number]:
+    """Run the optimization passes over an expression until it stops changing.
+
+    Constants are folded, identity operations removed, polynomial forms in `PV`
+    replaced by `Polynomial` nodes and repeated subexpressions shared. A number
+    is returned unchanged, but an expression in `PV` always stays a `Node`, even
+    if it simplifies to a constant.
+    """
+    if not isinstance(node, Node) or isinstance(node, Program):
+        return node
+
+    previous = None
+    while node != previous:
+        previous = node
+        node = fold_constants(node)
+        node = remove_identities(node)
+        node = simplify_polynomials(node)
+
+    return eliminate_common_subexpressions(node)
@@ -1,6 +1,7 @@
 import abc
-from typing import Callable
+from typing import Callable, Optional
 
+import numpy as np
 from numpy.typing import NDArray
 from typeconvert import ufunc
 
@@ -42,7 +43,7 @@ class Interp:
 
     def __init__(self, mode: str) -> None:
         if mode not in InterpFactory._registry:
-            msg = f"{self.mode!r} is not a valid interpretation type"
+            msg = f"{mode!r} is not a valid interpretation type"
             raise ValueError(msg)
         self.mode = mode
         self._func = InterpFactory.create(self.mode)
@@ -67,3 +68,81 @@ class OnesComplement(InterpImplementation):
 class TwosComplement(InterpImplementation):
     def apply(self, data: VarUIntArray) -> NDArray:
         return ufunc.twoscomp(data, data.word_size)
+
+
+@InterpFactory.register("sm")
+class SignMagnitude(InterpImplementation):
+    def apply(self, data: VarUIntArray) -> NDArray:
+        raw = data.view(np.ndarray)
+        signed = np.dtype(f"int{raw.dtype.itemsize * 8}")
+
+        result = np.bitwise_and(raw, 2 ** (data.word_size - 1) - 1).astype(signed)
+        sign = np.bitwise_and(raw, 2 ** (data.word_size - 1)).astype(bool)
+        np.negative(result, out=result, where=sign)
+        return result
+
+
+class FloatImplementation(InterpImplementation):
+    """Reinterpret fixed-size words as floating point values.
+
+    Subclasses define the required `word_size` and either the `view` dtype, for
+    formats NumPy understands natively, or a typeconvert ufunc to `convert` with.
+    """
+
+    word_size: int
+    container: str
+    view: Optional[str] = None
+    convert: Optional[Callable[[NDArray], NDArray]] = None
+
+    def apply(self, data: VarUIntArray) -> NDArray:
+        if data.word_size != self.word_size:
+            msg = f"{type(self).__name__} requires word_size={self.word_size}, but got word_size={data.word_size}"
+            raise ValueError(msg)
+
+        # No copy is made when the data is already in its natural container
+        raw = np.asarray(data.view(np.ndarray), dtype=self.container)
+        if self.view is not None:
+            return raw.view(self.view)
+        return self.convert(raw)
+
+
+@InterpFactory.register("ieee32")
+class IEEE32(FloatImplementation):
+    word_size = 32
+    container = "uint32"
+    view = "float32"
+
+
+@InterpFactory.register("ieee64")
+class IEEE64(FloatImplementation):
+    word_size = 64
+    container = "uint64"
+    view = "float64"
+
+
+@InterpFactory.register("1750a32")
+class MilStd1750A32(FloatImplementation):
+    word_size = 32
+    container = "uint32"
+    convert = staticmethod(ufunc.milstd1750a32)
+
+
+@InterpFactory.register("1750a48")
+class MilStd1750A48(FloatImplementation):
+    word_size = 48
+    container = "uint64"
+    convert = staticmethod(ufunc.milstd1750a48)
+
+
+@InterpFactory.register("ti32")
+class TI32(FloatImplementation):
+    word_size = 32
+    container = "uint32"
+    convert = staticmethod(ufunc.ti32)
+
+
+@InterpFactory.register("ti40")
+class TI40(FloatImplementation):
+    word_size = 40
+    container = "uint64"
+    convert = staticmethod(ufunc.ti40)
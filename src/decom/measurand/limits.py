@@ -0,0 +1,88 @@
+import enum
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class AlarmLevel(enum.IntEnum):
+    NOMINAL = 0
+    YELLOW = 1
+    RED = 2
+
+
+@dataclass(frozen=True)
+class LimitSet:
+    """Yellow and red limits; a value below a low or above a high limit is out.
+
+    A missing limit is never exceeded.
+    """
+
+    red_low: Optional[float] = None
+    yellow_low: Optional[float] = None
+    yellow_high: Optional[float] = None
+    red_high: Optional[float] = None
+
+    def bounds(self, level: AlarmLevel) -> tuple[float, float]:
+        """The (low, high) limits of `level`, infinite where missing."""
+        if level == AlarmLevel.RED:
+            low, high = self.red_low, self.red_high
+        else:
+            low, high = self.yellow_low, self.yellow_high
+        return (-np.inf if low is None else low, np.inf if high is None else high)
+
+
+@dataclass(frozen=True)
+class Limits:
+    """The alarm limits of a measurand.
+
+    Parameters
+    ----------
+    default
+        The limits used when no state limits apply.
+    state
+        The name of the measurand whose value selects the limits, e.g. a mode.
+    states
+        The limits used for each value of the `state` measurand.
+    persistence
+        The number of consecutive samples a value must be out of limits before
+        the alarm is raised.
+    hysteresis
+        How far back inside a limit a value must come to clear the alarm.
+    """
+
+    default: LimitSet = LimitSet()
+    state: Optional[str] = None
+    states: dict[float, LimitSet] = field(default_factory=dict)
+    persistence: int = 1
+    hysteresis: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.persistence < 1:
+            msg = f"persistence={self.persistence!r} must be positive"
+            raise ValueError(msg)
+        if self.hysteresis < 0:
+            msg = f"hysteresis={self.hysteresis!r} must not be negative"
+            raise ValueError(msg)
+        if self.states and self.state is None:
+            msg = "state limits require the name of the state measurand"
+            raise ValueError(msg)
+
+    def bounds(
+        self, level: AlarmLevel, state: Optional[NDArray] = None
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """The (low, high) limits of `level` for each sample.
+
+        Without state limits these are scalars; otherwise they are picked by the
+        value of the `state` measurand at each sample.
+        """
+        low, high = self.default.bounds(level)
+        if not self.states or state is None:
+            return np.float64(low), np.float64(high)
+        conditions = [state == value for value in self.states]
+        limits = [limits.bounds(level) for limits in self.states.values()]
+        return (
+            np.select(conditions, [b[0] for b in limits], low),
+            np.select(conditions, [b[1] for b in limits], high),
+        )
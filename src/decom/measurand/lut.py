@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom import utils
+from decom.model import VarUIntArray
+
+from .euc import EUC
+
+# Default memory bound for all cached lookup tables, in bytes
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def euc_key(euc: Optional[EUC]) -> Hashable:
+    """Build a hashable key which identifies the conversion an EUC performs."""
+    if euc is None:
+        return None
+    return (euc.data_bias, euc.scale_factor, euc.scaled_bias)
+
+
+def build_table(convert: Callable[[VarUIntArray], NDArray], width: int) -> NDArray:
+    """Evaluate `convert` once for every raw code of a `width`-bit parameter."""
+    dtype = utils.word_size_to_uint(width)
+    codes = VarUIntArray(np.arange(2**width, dtype=dtype), word_size=width)
+    table = np.array(convert(codes))
+    table.flags.writeable = False
+    return table
+
+
+class LookupTableCache:
+    """A thread-safe LRU cache of raw-to-engineering lookup tables.
+
+    Tables are evicted, least recently used first, once the total size of all
+    cached tables exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tables: OrderedDict[Hashable, NDArray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tables
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self.nbytes = 0
+
+    def get(self, key: Hashable, build: Callable[[], NDArray]) -> NDArray:
+        """Return the table stored under `key`, building and caching it if needed."""
+        with self._lock:
+            if key in self._tables:
+                self._tables.move_to_end(key)
+                return self._tables[key]
+
+        table = build()
+
+        with self._lock:
+            if key not in self._tables:
+                self._tables[key] = table
+                self.nbytes += table.nbytes
+            self._evict(keep=key)
+            return self._tables.get(key, table)
+
+    def _evict(self, keep: Any) -> None:
+        while self.nbytes > self.max_bytes and len(self._tables) > 1:
+            key, table = next(iter(self._tables.items()))
+            if key == keep:
+                self._tables.move_to_end(key)
+                continue
+            del self._tables[key]
+            self.nbytes -= table.nbytes
+
+        if self.nbytes > self.max_bytes and keep in self._tables:
+            # A single table larger than the limit is used but not retained
+            self.nbytes -= self._tables.pop(keep).nbytes
+
+
+LUT_CACHE = LookupTableCache()
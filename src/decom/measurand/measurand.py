@@ -1,20 +1,89 @@
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.model import VarUIntArray
 
 from .euc import EUC
 from .interp import Interp
+from .limits import Limits
+from .lut import LUT_CACHE, build_table, euc_key
 from .parameter import Parameter
+from .sampling import SamplingStrategy
 
 Number = Union[int, float]
 
-
-class SamplingStrategy:
-    pass
+# Suggested `Measurand.lut_bits` threshold; a 16-bit table holds 65,536 entries
+DEFAULT_LUT_BITS = 16
 
 
 @dataclass
 class Measurand:
     parameter: Parameter
-    interp: Interp
-    euc: EUC
-    ss: SamplingStrategy
+    interp: Optional[Union[Interp, str]] = None
+    euc: Optional[EUC] = None
+    ss: Optional[SamplingStrategy] = None
+
+    # Opt-in lookup table mode: parameters at most this many bits wide are converted
+    # with a precomputed table of every raw code instead of per-sample interp + EUC.
+    lut_bits: Optional[int] = None
+
+    # Alarm limits checked by an `AlarmEngine`
+    limits: Optional[Limits] = None
+
+    # The largest allowed `lut_bits`, since a table holds 2**lut_bits entries
+    max_lut_bits: int = field(default=DEFAULT_LUT_BITS, repr=False, compare=False)
+
+    # The Interp built from `interp`, and the `interp` it was built from
+    _interp_cache: Optional[tuple[Any, Interp]] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    def __post_init__(self) -> None:
+        self._check_lut_bits()
+
+    def _check_lut_bits(self) -> None:
+        if self.lut_bits is not None and not 1 <= self.lut_bits <= self.max_lut_bits:
+            maximum = self.max_lut_bits
+            msg = f"lut_bits={self.lut_bits!r} must be between 1 and {maximum}"
+            raise ValueError(msg)
+
+    def _interp(self) -> Interp:
+        if self._interp_cache is None or self._interp_cache[0] is not self.interp:
+            if self.interp is None:
+                interp = Interp("u")
+            elif isinstance(self.interp, str):
+                interp = Interp(self.interp)
+            else:
+                interp = self.interp
+            self._interp_cache = (self.interp, interp)
+        return self._interp_cache[1]
+
+    def _convert(self, raw: VarUIntArray) -> NDArray:
+        result = self._interp().apply(raw)
+        if self.euc is not None:
+            result = self.euc.apply(result)
+        return result
+
+    def uses_lut(self, width: int) -> bool:
+        if self.lut_bits is None:
+            return False
+        self._check_lut_bits()
+        return width <= self.lut_bits
+
+    def lookup_table(self, width: int) -> NDArray:
+        """Return the table of engineering values for every `width`-bit raw code."""
+        key = (self._interp().mode, euc_key(self.euc), width)
+        return LUT_CACHE.get(key, lambda: build_table(self._convert, width))
+
+    def convert(self, raw: VarUIntArray) -> NDArray:
+        """Apply the interpretation and EUC to raw parameter values."""
+        if self.uses_lut(raw.word_size):
+            return np.take(self.lookup_table(raw.word_size), raw.view(np.ndarray))
+        return self._convert(raw)
+
+    def build(self, data: VarUIntArray) -> NDArray:
+        """Extract the parameter from `data` and convert it to engineering units."""
+        return self.convert(self.parameter.build(data))
@@ -1,4 +1,5 @@
 import abc
+import dataclasses
 from dataclasses import dataclass, field
 from typing import Any, Callable, Literal, Optional, Union, override
 
@@ -17,7 +18,9 @@ class Fragment(abc.ABC):
     complement: bool
     reverse: bool
 
-    def build(self, data: VarUIntArray, /, offset: int = 0) -> VarUIntArray:
+    def build(
+        self, data: VarUIntArray, /, offset: Union[int, np.ndarray] = 0
+    ) -> VarUIntArray:
         """Build the specified Fragment.
 
         Notes
@@ -53,14 +56,19 @@ class FragmentWord(Fragment):
 
     one_based: bool = True
 
-    _mask_shift: list[tuple[int, int]] = field(init=False, repr=False)
+    # (mask, shift, position) for each contiguous range of bits, where position is
+    # the location of the extracted range within the fragment
+    _mask_shift: list[tuple[int, int, int]] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.bits is not None:
             self._bit_ranges = utils.bit_list_to_ranges(self.bits)
             self._mask_shift = []
+            position = 0
             for bit_range in self._bit_ranges:
-                self._mask_shift.append(utils.bits_to_mask_and_shift(bit_range))
+                mask, shift = utils.bits_to_mask_and_shift(bit_range)
+                self._mask_shift.append((mask, shift, position))
+                position += bit_range[1] - bit_range[0] + 1
 
     def __str__(self) -> str:
         if self.bits:
@@ -94,24 +102,61 @@ class FragmentWord(Fragment):
         return NotImplemented
 
     @override
-    def build(self, data: VarUIntArray, /, offset: int = 0) -> VarUIntArray:
-        result = data[:, self.word - int(self.one_based) + offset].flatten()
+    def build(
+        self, data: VarUIntArray, /, offset: Union[int, np.ndarray] = 0
+    ) -> VarUIntArray:
+        column = self.word - int(self.one_based) + offset
+        if np.ndim(column):
+            # Gather every offset column at once as a (frames x offsets) array
+            column = np.take(data.view(np.ndarray), column, axis=1)
+        else:
+            column = data[:, column].flatten()
 
-        if self.word_size is None:
-            self.word_size = data.word_size
+        return self.extract(column, data.word_size)
 
-        if self.bits is not None:
-            if self.word_size != data.word_size:
-                msg = f"data.word_size={data.word_size} does not match fragment.word_size={self.word_size}"
-                raise ValueError(msg)
+    def bind(self, word_size: int) -> "FragmentWord":
+        """A copy of this fragment that only accepts `word_size` data."""
+        if self.word_size is not None and self.word_size != word_size:
+            msg = f"word_size={word_size} does not match fragment.word_size={self.word_size}"
+            raise ValueError(msg)
+        return dataclasses.replace(self, word_size=word_size)
+
+    def extract(self, column: np.ndarray, word_size: int) -> VarUIntArray:
+        """Extract the fragment from the values of its word.
+
+        Parameters
+        ----------
+        column
+            The values of the word (column) specified by `FragmentWord.word`.
+        word_size
+            The size of the words in `column`.
+
+        Returns
+        -------
+        VarUIntArray
+            The constructed fragment.
+        """
+        if self.word_size is not None and self.word_size != word_size:
+            msg = f"data.word_size={word_size} does not match fragment.word_size={self.word_size}"
+            raise ValueError(msg)
 
-            for mask, shift in self._mask_shift:
+        result = column
+
+        if self.bits is not None:
+            if len(self._mask_shift) == 1:
+                mask, shift, _ = self._mask_shift[0]
                 result = np.bitwise_and(result, mask)
                 result = np.bitwise_right_shift(result, shift)
+            else:
+                # Concatenate the ranges, with the highest bits the most significant
+                word = result
+                result = np.zeros_like(word)
+                for mask, shift, position in self._mask_shift:
+                    result |= np.bitwise_and(word, mask) >> shift << position
 
             frag_size = len(self.bits)
         else:
-            frag_size = data.word_size
+            frag_size = word_size
 
         if self.complement:
             # TODO: Should this really come after the fragment assemby, or should it be before???
@@ -169,7 +214,9 @@ class FragmentConstant(Fragment):
             self.value = utils.reverse_bits(self.value, self.size)
 
     @override
-    def build(self, data: VarUIntArray) -> VarUIntArray:
+    def build(
+        self, data: VarUIntArray, /, offset: Union[int, np.ndarray] = 0
+    ) -> VarUIntArray:
         return VarUIntArray(self.value, word_size=self.size)
 
 
@@ -234,12 +281,20 @@ class BasicParameter(Parameter):
                 if frag.bits is None:
                     size += word_size
                 else:
-                    size += (frag.bits[1] - frag.bits[0]) + 1
+                    size += len(frag.bits)
             else:
                 msg = f"expected Fragment subclass, but got {type(frag)}"
                 raise TypeError(msg)
         return size
 
+    def bind(self, word_size: int) -> "BasicParameter":
+        """A copy of this Parameter whose fragments only accept `word_size` data."""
+        fragments = [
+            frag.bind(word_size) if isinstance(frag, FragmentWord) else frag
+            for frag in self.fragments
+        ]
+        return dataclasses.replace(self, fragments=fragments)
+
     def _all_words(self) -> list[int]:
         """Generate a list of all the words in each Fragment"""
         return [f.word for f in self.fragments if isinstance(f, FragmentWord)]
@@ -252,30 +307,60 @@ class BasicParameter(Parameter):
         """Find the minimum word in all fragments"""
         return min(self._all_words())
 
-    def build(self, data: VarUIntArray, /, offset: int = 0) -> VarUIntArray:
+    def first_column(self) -> int:
+        """The zero-based column of the first word in the Parameter, or 0 if it has none."""
+        columns = [
+            f.word - int(f.one_based)
+            for f in self.fragments
+            if isinstance(f, FragmentWord)
+        ]
+        return min(columns, default=0)
+
+    def build(
+        self, data: VarUIntArray, /, offset: Union[int, np.ndarray] = 0
+    ) -> VarUIntArray:
         """Construct the Parameter from the input data array.
 
         Args:
             data (VarUIntArray): The input data array.
 
-            offset (int): An offset applied to the fragment words. This is useful
+            offset (int | ndarray): An offset applied to the fragment words. This is useful
             for Parameters defined relative to another Parameter, e.g. for Supercom or Generator Parameters.
+            If an array of offsets is given, the Parameter is built at every offset at once.
 
         Returns;
-            VarUIntArray: The assembled Parameter vector.
+            VarUIntArray: The assembled Parameter vector, or a (frames x offsets) array.
         """
         # Determine the total number of bits in the complete Parameter
-        # Set the uint dtype to the minimum sized container for the Parameter size
         size = self._calculate_parameter_size(data.word_size)
+        fragments = [frag.build(data, offset=offset) for frag in self.fragments]
+        return self.assemble(fragments, size, data.shape[:1] + np.shape(offset))
+
+    def assemble(
+        self,
+        fragments: list[VarUIntArray],
+        size: int,
+        shape: Union[int, tuple[int, ...]],
+    ) -> VarUIntArray:
+        """Concatenate built fragments into the complete Parameter.
+
+        Args:
+            fragments (list[VarUIntArray]): The built value of each Fragment, in order.
+
+            size (int): The total number of bits in the Parameter.
+
+            shape (int | tuple): The shape of the result, e.g. the number of rows (frames).
+
+        Returns:
+            VarUIntArray: The assembled Parameter vector.
+        """
+        # Set the uint dtype to the minimum sized container for the Parameter size
         dtype = utils.word_size_to_uint(size)
 
         # Initialize the result vector with the necessary dtype
-        result = np.zeros(data.shape[0], dtype=dtype)
-
-        for frag_idx, frag in enumerate(self.fragments):
-            # Build the fragment
-            tmp = frag.build(data, offset=offset)
+        result = np.zeros(shape, dtype=dtype)
 
+        for frag_idx, tmp in enumerate(fragments):
             # Shift the previous result left by the fragment size
             if frag_idx != 0:
                 result = np.left_shift(result, tmp.word_size)
@@ -288,6 +373,230 @@ class BasicParameter(Parameter):
 
         return VarUIntArray(result, word_size=size)
 
+    def compile(self, word_size: int) -> "ParameterKernel":
+        """Precompute the steps needed to build this Parameter from `word_size` data."""
+        return ParameterKernel(self, word_size)
+
+
+# Bit reversal of fragments up to this size uses a lookup table
+_REVERSE_TABLE_BITS = 16
+
+
+def _reverse_table(size: int, dtype: np.dtype) -> Optional[np.ndarray]:
+    """The bit reversal of every `size`-bit code, if small enough to tabulate."""
+    if size > _REVERSE_TABLE_BITS:
+        return None
+    return utils.reverse_bits(np.arange(2**size, dtype=dtype), size)
+
+
+@dataclass(frozen=True)
+class _KernelRange:
+    """One contiguous bit range of a fragment with several ranges."""
+
+    shift: int
+    size: int
+    # Where the range goes in the fragment value, after any reversal
+    position: int
+    reverse_table: Optional[np.ndarray] = None
+
+
+@dataclass(frozen=True)
+class _KernelStep:
+    size: int
+    column: Optional[int] = None
+    value: int = 0
+    mask_shift: tuple[tuple[int, int, int], ...] = ()
+    # Set instead of `mask_shift` for fragments with several bit ranges
+    ranges: tuple[_KernelRange, ...] = ()
+    complement: bool = False
+    reverse: bool = False
+    reverse_table: Optional[np.ndarray] = None
+
+
+class ParameterKernel:
+    """A compiled `BasicParameter` which builds into caller-supplied buffers.
+
+    The total size, dtype and the mask/shift/complement/reverse steps of each
+    fragment are computed once. Calling the kernel executes the steps in place,
+    writing into `out` (and using `work` as scratch space) when given, so the
+    same buffers can be reused from batch to batch without allocating.
+
+    The kernel holds no mutable state and may be shared between threads as long
+    as each thread supplies its own buffers.
+    """
+
+    def __init__(self, parameter: BasicParameter, word_size: int) -> None:
+        self.parameter = parameter
+        self.word_size = word_size
+        self.size = parameter._calculate_parameter_size(word_size)
+        self.dtype = np.dtype(utils.word_size_to_uint(self.size))
+        self.bit_op = parameter.bit_op
+        self.steps = [self._compile_fragment(frag) for frag in parameter.fragments]
+
+    def _compile_fragment(self, frag: Fragment) -> _KernelStep:
+        if isinstance(frag, FragmentConstant):
+            return _KernelStep(size=frag.size, value=int(frag.value))
+
+        if not isinstance(frag, FragmentWord):
+            msg = f"expected Fragment subclass, but got {type(frag)}"
+            raise TypeError(msg)
+
+        if frag.bits is None:
+            size, mask_shift = self.word_size, ()
+        else:
+            size, mask_shift = len(frag.bits), tuple(frag._mask_shift)
+
+        if len(mask_shift) > 1:
+            # Each range is extracted, complemented and reversed on its own, so
+            # the fragment can be assembled in place; reversing the fragment
+            # reverses each range and mirrors its position.
+            ranges = []
+            for mask, shift, position in mask_shift:
+                width = (mask >> shift).bit_length()
+                if frag.reverse:
+                    position = size - position - width
+                table = _reverse_table(width, self.dtype) if frag.reverse else None
+                ranges.append(_KernelRange(shift, width, position, table))
+            return _KernelStep(
+                size=size,
+                column=frag.word - int(frag.one_based),
+                ranges=tuple(ranges),
+                complement=frag.complement,
+                reverse=frag.reverse,
+            )
+
+        return _KernelStep(
+            size=size,
+            column=frag.word - int(frag.one_based),
+            mask_shift=mask_shift,
+            complement=frag.complement,
+            reverse=frag.reverse,
+            reverse_table=_reverse_table(size, self.dtype) if frag.reverse else None,
+        )
+
+    def _needs_work(self) -> bool:
+        return len(self.steps) > 1 or any(s.ranges for s in self.steps)
+
+    def allocate(self, num_rows: int) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Allocate an output buffer and, if needed, a scratch buffer for `num_rows` rows."""
+        out = np.empty(num_rows, dtype=self.dtype)
+        work = np.empty(num_rows, dtype=self.dtype) if self._needs_work() else None
+        return out, work
+
+    def _check_buffer(self, buffer: np.ndarray, num_rows: int, name: str) -> None:
+        if buffer.shape != (num_rows,) or buffer.dtype != self.dtype:
+            msg = f"{name} must have shape ({num_rows},) and dtype {self.dtype}, but got shape {buffer.shape} and dtype {buffer.dtype}"
+            raise ValueError(msg)
+
+    def _write(
+        self, step: _KernelStep, data: np.ndarray, offset: int, dest: np.ndarray
+    ) -> None:
+        """Write the value of one fragment into `dest`."""
+        if step.column is None:
+            dest.fill(step.value)
+            return
+
+        column = data[:, step.column + offset]
+        if not step.mask_shift:
+            np.copyto(dest, column, casting="unsafe")
+        else:
+            # Shift before masking: the cast into dest keeps only the low bits
+            mask, shift, _ = step.mask_shift[0]
+            np.right_shift(column, shift, out=dest, casting="unsafe")
+            np.bitwise_and(dest, mask >> shift, out=dest)
+
+        if step.complement:
+            np.bitwise_xor(dest, 2**step.size - 1, out=dest)
+
+        if step.reverse:
+            if step.reverse_table is not None:
+                np.take(step.reverse_table, dest, out=dest)
+            else:
+                dest[...] = utils.reverse_bits(dest, step.size)
+
+    def _write_ranges(
+        self,
+        step: _KernelStep,
+        data: np.ndarray,
+        offset: int,
+        out: np.ndarray,
+        work: np.ndarray,
+    ) -> None:
+        """OR the ranges of a fragment into the low `step.size` bits of `out`."""
+        column = data[:, step.column + offset]
+        for part in step.ranges:
+            ones = 2**part.size - 1
+            np.right_shift(column, part.shift, out=work, casting="unsafe")
+            np.bitwise_and(work, ones, out=work)
+            if step.complement:
+                np.bitwise_xor(work, ones, out=work)
+            if part.reverse_table is not None:
+                np.take(part.reverse_table, work, out=work)
+            elif step.reverse:
+                work[...] = utils.reverse_bits(work, part.size)
+            np.left_shift(work, part.position, out=work)
+            np.bitwise_or(out, work, out=out)
+
+    def __call__(
+        self,
+        data: VarUIntArray,
+        /,
+        offset: int = 0,
+        out: Optional[np.ndarray] = None,
+        work: Optional[np.ndarray] = None,
+    ) -> VarUIntArray:
+        """Build the Parameter from `data`.
+
+        Args:
+            data (VarUIntArray): The input data array.
+
+            offset (int): An offset applied to the fragment words.
+
+            out (ndarray): Optional buffer of shape (frames,) and dtype `self.dtype`
+            which receives the result.
+
+            work (ndarray): Optional scratch buffer with the same shape and dtype as `out`.
+
+        Returns:
+            VarUIntArray: The assembled Parameter vector, a view of `out`.
+        """
+        if data.word_size != self.word_size:
+            msg = f"data.word_size={data.word_size} does not match kernel.word_size={self.word_size}"
+            raise ValueError(msg)
+
+        num_rows = data.shape[0]
+        if out is None:
+            out = np.empty(num_rows, dtype=self.dtype)
+        self._check_buffer(out, num_rows, "out")
+
+        if self._needs_work():
+            if work is None:
+                work = np.empty(num_rows, dtype=self.dtype)
+            self._check_buffer(work, num_rows, "work")
+
+        raw = data.view(np.ndarray)
+        for idx, step in enumerate(self.steps):
+            if step.ranges:
+                if idx == 0:
+                    out.fill(0)
+                else:
+                    np.left_shift(out, step.size, out=out)
+                self._write_ranges(step, raw, offset, out, work)
+                continue
+            if idx == 0:
+                self._write(step, raw, offset, out)
+                continue
+            self._write(step, raw, offset, work)
+            np.left_shift(out, step.size, out=out)
+            np.bitwise_or(out, work, out=out)
+
+        if self.bit_op:
+            self.bit_op._func(out, self.bit_op.value, out=out)
+
+        result = out.view(VarUIntArray)
+        result.word_size = self.size
+        return result
+
 
 @dataclass
 class GeneratorParameter(Parameter):
@@ -300,14 +609,25 @@ class GeneratorParameter(Parameter):
         if self.iterator.stop is None and self.iterator.step < 0:
             self.iterator.stop = 0
 
-    def build(self, data: VarUIntArray) -> list[VarUIntArray]:
-        if self.word_size is None:
-            self.word_size = data.word_size
-        elif self.word_size != data.word_size:
-            raise ValueError
+    def bind(self, word_size: int) -> "GeneratorParameter":
+        """A copy of this Parameter that only accepts `word_size` data."""
+        if self.word_size is not None and self.word_size != word_size:
+            msg = f"word_size={word_size} does not match parameter.word_size={self.word_size}"
+            raise ValueError(msg)
+        return dataclasses.replace(
+            self, parameter=self.parameter.bind(word_size), word_size=word_size
+        )
 
-        results = []
+    def build(self, data: VarUIntArray) -> VarUIntArray:
+        if self.word_size is not None and self.word_size != data.word_size:
+            msg = f"data.word_size={data.word_size} does not match parameter.word_size={self.word_size}"
+            raise ValueError(msg)
 
+        # Build every generated parameter at once by gathering all the offset columns
+        return self.parameter.build(data, offset=self.sample_offsets(data.shape[1]))
+
+    def sample_offsets(self, num_words: int) -> np.ndarray:
+        """The word offset of each generated parameter in a frame of `num_words` words."""
         # If the iterator is positive, compare the largest word against the "stop before" limit
         # If the iterator is negative, compare the smallest
         if self.iterator.step > 0:
@@ -321,15 +641,17 @@ class GeneratorParameter(Parameter):
             stop = self.iterator.stop
         else:
             # If step is negative, the stop was implicitly 0 and set in __post_init__
-            stop = data.shape[1]
+            stop = num_words
+
+        return self.offsets(start, stop)
 
-        # Iterate through the generated parameters by using the offset
-        for target in range(start, stop, self.iterator.step):
-            offset = target - start
-            result = self.parameter.build(data, offset=offset)
-            results.append(result)
+    def sample_columns(self, num_words: int) -> np.ndarray:
+        """The zero-based column of the first word of each generated parameter."""
+        return self.parameter.first_column() + self.sample_offsets(num_words)
 
-        return VarUIntArray(results, word_size=results[0].word_size).T
+    def offsets(self, start: int, stop: int) -> np.ndarray:
+        """The word offset of each generated parameter relative to the first."""
+        return np.arange(start, stop, self.iterator.step, dtype=np.intp) - start
 
 
 @dataclass
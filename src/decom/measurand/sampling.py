@@ -0,0 +1,174 @@
+import abc
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class SamplingStrategy(abc.ABC):
+    """Select the minor frames in which a subcommutated measurand is sampled.
+
+    Each frame is given a key, e.g. the value of the minor frame counter, and a
+    frame is selected when its key is `value`, or with a `step` (`++step`) is one
+    of `value, value + step, ...` below `stop` (`<stop`), if given.
+
+    Strategies are immutable and hashable, so measurands with equal strategies
+    can share one selection; see `FrameSelector`.
+    """
+
+    value: int
+    step: Optional[int] = None
+    stop: Optional[int] = None
+
+    # The filter name used in decom files
+    name: ClassVar[str]
+
+    def __post_init__(self) -> None:
+        if self.step is not None and self.step < 1:
+            msg = f"step={self.step!r} must be positive"
+            raise ValueError(msg)
+
+    def __str__(self) -> str:
+        s = f"{self.name}({self.value}"
+        if self.step is not None:
+            s += f"++{self.step}"
+        if self.stop is not None:
+            s += f"<{self.stop}"
+        return s + ")"
+
+    @abc.abstractmethod
+    def keys(self, selector: "FrameSelector") -> NDArray[np.int64]:
+        """The key of each frame; negative keys are never selected."""
+
+    def mask(self, keys: NDArray[np.int64]) -> NDArray[np.bool]:
+        """Which frames with these keys are selected."""
+        if self.step is None:
+            selected = keys == self.value
+        else:
+            selected = (keys >= self.value) & ((keys - self.value) % self.step == 0)
+        if self.stop is not None:
+            selected &= keys < self.stop
+        return selected
+
+
+@dataclass(frozen=True)
+class MinorFrameValue(SamplingStrategy):
+    """Select frames by the value of the minor frame counter."""
+
+    name: ClassVar[str] = "mfv"
+
+    def keys(self, selector: "FrameSelector") -> NDArray[np.int64]:
+        return selector.counter
+
+
+@dataclass(frozen=True)
+class MinorFrameOffset(SamplingStrategy):
+    """Select frames by their offset from the start of the major frame.
+
+    The frame where the counter resets has offset 0. Frames before the first
+    reset in a batch have no known offset and are never selected.
+    """
+
+    name: ClassVar[str] = "mfo"
+
+    def keys(self, selector: "FrameSelector") -> NDArray[np.int64]:
+        return selector.offsets
+
+
+STRATEGIES = {cls.name: cls for cls in [MinorFrameOffset, MinorFrameValue]}
+
+
+@dataclass(frozen=True)
+class SelectorState:
+    """Where the minor frame count stood after the last frame of a batch."""
+
+    # The counter and offset of the last frame; the offset is -1 if unknown
+    counter: int
+    offset: int
+    # The counter value at the start of a major frame, if known
+    reset: Optional[int]
+
+
+class FrameSelector:
+    """The frames selected by sampling strategies, computed once per batch.
+
+    The keys of each kind of strategy, and the rows selected by each distinct
+    strategy, are computed on first use and then shared.
+
+    A major frame starts where the counter is `reset` or, if that is not given,
+    where the counter does not increase. The first frame of a batch is checked
+    against the last frame of the previous batch, given by `state`; without a
+    state it starts a major frame if its counter equals that of the first major
+    frame start found in the batch. Pass `next_state()` to the selector of the
+    next batch to carry the minor frame offsets across the batch boundary.
+
+    Parameters
+    ----------
+    counter
+        The minor frame counter of each frame.
+    reset
+        The counter value at the start of a major frame.
+    state
+        The state after the previous batch of the stream, if any.
+    """
+
+    def __init__(
+        self,
+        counter: NDArray,
+        reset: Optional[int] = None,
+        state: Optional[SelectorState] = None,
+    ) -> None:
+        self.counter = np.asarray(counter).ravel().astype(np.int64)
+        self.reset = reset
+        self.state = state
+        self._offsets: Optional[NDArray[np.int64]] = None
+        self._reset_value: Optional[int] = reset
+        self._rows: dict[SamplingStrategy, NDArray[np.intp]] = {}
+
+    @property
+    def offsets(self) -> NDArray[np.int64]:
+        """The offset of each frame from the last counter reset, or -1 if unknown."""
+        if self._offsets is None:
+            counter = self.counter
+            position = np.arange(len(counter))
+            if self.reset is not None:
+                starts = counter == self.reset
+            else:
+                starts = np.zeros(len(counter), dtype=bool)
+                starts[1:] = np.diff(counter) <= 0
+                found = np.flatnonzero(starts)
+                if self.state is not None and self.state.reset is not None:
+                    self._reset_value = self.state.reset
+                elif len(found):
+                    self._reset_value = int(counter[found[0]])
+                if len(counter):
+                    if self.state is not None:
+                        starts[0] = counter[0] <= self.state.counter
+                    starts[0] |= counter[0] == self._reset_value
+
+            last = np.maximum.accumulate(np.where(starts, position, -1))
+            offsets = np.where(last >= 0, position - last, -1)
+            if self.state is not None and self.state.offset >= 0:
+                # Frames before the first start continue the previous major frame
+                offsets = np.where(last >= 0, offsets, self.state.offset + 1 + position)
+            self._offsets = offsets
+        return self._offsets
+
+    def next_state(self) -> Optional[SelectorState]:
+        """The state to pass to the selector of the next batch."""
+        if not len(self.counter):
+            return self.state
+        offsets = self.offsets
+        return SelectorState(
+            counter=int(self.counter[-1]),
+            offset=int(offsets[-1]),
+            reset=self._reset_value,
+        )
+
+    def rows(self, strategy: SamplingStrategy) -> NDArray[np.intp]:
+        """The rows selected by `strategy`, in order."""
+        if strategy not in self._rows:
+            self._rows[strategy] = np.flatnonzero(strategy.mask(strategy.keys(self)))
+        return self._rows[strategy]
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Any, Iterable, Union
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
 
 import numpy as np
 from numpy.typing import NDArray
@@ -65,22 +65,160 @@ class FrameBatch:
         ):
             raise ValueError
 
+    @classmethod
+    def _view(
+        cls,
+        ctime: NDArray[np.datetime64],
+        time: NDArray[np.datetime64],
+        data: VarUIntArray,
+    ) -> "FrameBatch":
+        """Create a batch from arrays already known to be consistent, skipping validation."""
+        obj = cls.__new__(cls)
+        obj.ctime = ctime
+        obj.time = time
+        obj.data = data
+        return obj
+
+    def __len__(self) -> int:
+        return len(self.data)
+
     def __eq__(self, other) -> bool:
         if isinstance(other, FrameBatch):
             return all(
                 [
-                    self.time.tolist() == other.time.tolist(),
-                    self.ctime.tolist() == other.ctime.tolist(),
-                    self.data.tolist() == other.data.tolist(),
+                    np.array_equal(self.time, other.time, equal_nan=True),
+                    np.array_equal(self.ctime, other.ctime, equal_nan=True),
+                    np.array_equal(self.data, other.data),
                 ]
             )
         raise TypeError
 
     def __getitem__(self, key) -> "FrameBatch":
-        ctime = np.atleast_1d(self.ctime[key])
-        time = np.atleast_1d(self.time[key])
-        data = np.atleast_2d(self.data[key])
-        return FrameBatch(ctime=ctime, time=time, data=data)
+        """Select frames, always returning a batch.
+
+        Integers and slices give views of this batch; integer and boolean arrays
+        give copies, as with numpy indexing.
+        """
+        if isinstance(key, (int, np.integer)):
+            idx = range(len(self))[key]
+            key = slice(idx, idx + 1)
+        elif not isinstance(key, slice):
+            key = np.asarray(key)
+            if key.ndim == 0:
+                return self[key.item()]
+        return FrameBatch._view(self.ctime[key], self.time[key], self.data[key])
+
+    @classmethod
+    def concat(cls, batches: Iterable["FrameBatch"]) -> "FrameBatch":
+        """Join batches end to end, copying each into one preallocated batch."""
+        batches = list(batches)
+        if not batches:
+            msg = "cannot concatenate an empty sequence of batches"
+            raise ValueError(msg)
+
+        first = batches[0]
+        word_size = first.data.word_size
+        width = first.data.shape[1]
+        for batch in batches[1:]:
+            if batch.data.word_size != word_size or batch.data.shape[1] != width:
+                msg = "all batches must have the same word_size and words per frame"
+                raise ValueError(msg)
+
+        total = sum(len(batch) for batch in batches)
+        ctime = np.empty(total, dtype=first.ctime.dtype)
+        time = np.empty(total, dtype=first.time.dtype)
+        data = VarUIntArray(np.empty((total, width), dtype=first.data.dtype), word_size)
+
+        start = 0
+        for batch in batches:
+            stop = start + len(batch)
+            ctime[start:stop] = batch.ctime
+            time[start:stop] = batch.time
+            data[start:stop] = batch.data
+            start = stop
+        return cls._view(ctime, time, data)
+
+
+class FrameRingBuffer:
+    """A fixed-capacity window over the most recent frames of a stream.
+
+    Every frame is stored twice, `capacity` rows apart, so the most recent `n`
+    frames are always contiguous in storage and `latest` can return them as a
+    view without copying. Appending copies each new frame at most twice, no
+    matter how many frames are already held.
+
+    Views returned by `latest` are only valid until `capacity - n` more frames
+    have been appended, after which their rows are overwritten.
+
+    Parameters
+    ----------
+    capacity
+        The maximum number of frames held.
+    words_per_frame
+        The number of words in each frame.
+    word_size
+        The number of bits in each word.
+    """
+
+    def __init__(self, capacity: int, words_per_frame: int, word_size: int) -> None:
+        if capacity < 1:
+            msg = f"capacity={capacity!r} must be positive"
+            raise ValueError(msg)
+
+        self.capacity = capacity
+        self.words_per_frame = words_per_frame
+        self.word_size = word_size
+
+        dtype = utils.word_size_to_uint(word_size)
+        self._ctime = np.full(2 * capacity, np.datetime64("NaT", "ns"))
+        self._time = self._ctime.copy()
+        self._data = VarUIntArray(
+            np.zeros((2 * capacity, words_per_frame), dtype=dtype), word_size=word_size
+        )
+        self.clear()
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _write(self, start: int, batch: FrameBatch) -> None:
+        stop = start + len(batch)
+        for offset in (0, self.capacity):
+            self._ctime[offset + start : offset + stop] = batch.ctime
+            self._time[offset + start : offset + stop] = batch.time
+            self._data[offset + start : offset + stop] = batch.data
+
+    def append(self, batch: FrameBatch) -> None:
+        """Add frames to the end of the window, dropping the oldest beyond capacity."""
+        if batch.data.word_size != self.word_size:
+            msg = f"data.word_size={batch.data.word_size} does not match buffer.word_size={self.word_size}"
+            raise ValueError(msg)
+        if batch.data.shape[1] != self.words_per_frame:
+            msg = f"frames have {batch.data.shape[1]} words, expected {self.words_per_frame}"
+            raise ValueError(msg)
+
+        self.total += len(batch)
+        batch = batch[-self.capacity :]
+        count = len(batch)
+
+        # Split the write where it wraps around the end of the buffer
+        first = min(count, self.capacity - self._head)
+        self._write(self._head, batch[:first])
+        self._write(0, batch[first:])
+
+        self._head = (self._head + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def latest(self, n: Optional[int] = None) -> FrameBatch:
+        """A view of the most recent `n` frames, or of every frame held."""
+        n = self._size if n is None else min(n, self._size)
+        stop = self._head if self._head >= n else self._head + self.capacity
+        rows = slice(stop - n, stop)
+        return FrameBatch._view(self._ctime[rows], self._time[rows], self._data[rows])
 
 
 def ensure_n_by_2(
@@ -94,7 +232,7 @@ def ensure_n_by_2(
             if len(row) == 1:
                 result.append((row[0], fill))
             elif len(row) == 2:
-                result.append((row[0], row[2]))
+                result.append((row[0], row[1]))
             else:
                 raise ValueError
         else:
@@ -102,36 +240,72 @@ def ensure_n_by_2(
     return result
 
 
+@dataclass
+class _IndexGroups:
+    """The rows of an IndexedFrameBatch grouped by index value (modulo `mod`).
+
+    `order` lists the row numbers sorted by key, keeping the original order
+    within each key, so the rows for one key are a contiguous slice of it.
+    """
+
+    order: NDArray[np.intp]
+    keys: NDArray
+    offsets: Optional[NDArray[np.intp]] = None
+
+    def rows(self, value: int) -> NDArray[np.intp]:
+        if self.offsets is not None:
+            if not 0 <= value < len(self.offsets) - 1:
+                return self.order[:0]
+            return self.order[self.offsets[value] : self.offsets[value + 1]]
+        lo = np.searchsorted(self.keys, value, side="left")
+        hi = np.searchsorted(self.keys, value, side="right")
+        return self.order[lo:hi]
+
+
 @dataclass
 class IndexedFrameBatch:
     index: VarUIntArray
     frames: FrameBatch
 
+    _groups: dict[int, _IndexGroups] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+
     def __getitem__(self, idx) -> "IndexedFrameBatch":
         index = self.index[idx]
         frames = self.frames[idx]
         return IndexedFrameBatch(index=index, frames=frames)
 
-    def _select_one(self, value: int, mod: int = 0) -> FrameBatch:
-        if not isinstance(value, int):
+    def _group(self, mod: int = 0) -> _IndexGroups:
+        """Group the rows by index value modulo `mod`, computed once per modulus."""
+        if mod not in self._groups:
+            keys = np.asarray(self.index).ravel()
+            if mod:
+                keys = keys % mod
+            order = np.argsort(keys, kind="stable")
+            offsets = None
+            if mod:
+                counts = np.bincount(keys.astype(np.intp), minlength=mod)
+                offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+            self._groups[mod] = _IndexGroups(order, keys[order], offsets)
+        return self._groups[mod]
+
+    def rows(self, value: int, mod: int = 0) -> NDArray[np.intp]:
+        """The row numbers, in order, where `index % mod == value` (or `index == value`)."""
+        if not isinstance(value, (int, np.integer)):
             raise ValueError
 
-        if not isinstance(mod, int):
+        if not isinstance(mod, (int, np.integer)):
             raise ValueError
 
-        if mod:
-            return self.frames[self.index % mod == value]
-        return self.frames[self.index == value]
+        return self._group(int(mod)).rows(int(value))
+
+    def _select_one(self, value: int, mod: int = 0) -> FrameBatch:
+        return self.frames[self.rows(value, mod)]
 
     def _select_many(self, values: list[tuple[int, int]]) -> FrameBatch:
-        idx = np.zeros(self.index.shape, dtype=np.bool)
-        for value, mod in values:
-            if mod:
-                tmp = self.index % mod == value
-            else:
-                tmp = self.index == value
-            idx = np.logical_or(idx, tmp)
-        return self.frames[idx]
+        rows = [self.rows(value, mod) for value, mod in values]
+        return self.frames[np.unique(np.concatenate(rows))]
 
     def select(
         self, values: Union[int, tuple[int, int], Iterable[tuple[int, int]]]
@@ -139,15 +313,56 @@ class IndexedFrameBatch:
         values = np.asarray(values)
 
         if values.ndim == 0:
-            return self._select_one(values)
+            return self._select_one(int(values))
         elif values.ndim == 1:
-            return self._select_one(value=values[0], mod=values[1])
+            return self._select_one(value=int(values[0]), mod=int(values[1]))
         elif values.ndim == 2:
-            return self._select_many(ensure_n_by_2(values))
+            return self._select_many(ensure_n_by_2(values.tolist()))
 
         raise ValueError
 
 
+@dataclass
+class MajorFrameBatch:
+    """Minor frames arranged as (major frames x minor frames x words).
+
+    Slots without a minor frame, e.g. at the start or end of a recording or
+    where frames were dropped, are zero filled, have NaT times and are marked
+    False in `valid`.
+    """
+
+    ctime: NDArray[np.datetime64]
+    time: NDArray[np.datetime64]
+    data: VarUIntArray
+    valid: NDArray[np.bool]
+
+    def __post_init__(self):
+        if self.data.ndim != 3:
+            raise ValueError
+        if not all(
+            [
+                self.ctime.shape == self.data.shape[:2],
+                self.time.shape == self.data.shape[:2],
+                self.valid.shape == self.data.shape[:2],
+            ]
+        ):
+            raise ValueError
+
+    @property
+    def complete(self) -> NDArray[np.bool]:
+        """Whether each major frame has all of its minor frames."""
+        return self.valid.all(axis=1)
+
+    def minor(self, idx: int) -> FrameBatch:
+        """The minor frame in slot `idx` of every major frame that has one."""
+        rows = self.valid[:, idx]
+        return FrameBatch(
+            ctime=self.ctime[rows, idx],
+            time=self.time[rows, idx],
+            data=self.data[rows, idx],
+        )
+
+
 @dataclass
 class PacketBatch:
     packets: dict[Any, FrameBatch]
@@ -159,3 +374,95 @@ class PacketBatch:
 
     def __getitem__(self, idx) -> "PacketBatch":
         return self.select(idx)
+
+
+@dataclass
+class RaggedPacketBatch:
+    """Variable-length packets stored back-to-back in one byte buffer.
+
+    Packet `i` is `buffer[offsets[i] : offsets[i] + lengths[i]]`. Subsets, such
+    as the packets with one ID, share the buffer and only copy the per-packet
+    arrays.
+    """
+
+    buffer: NDArray[np.uint8]
+    offsets: NDArray[np.int64]
+    lengths: NDArray[np.int64]
+    ids: NDArray
+    time: NDArray[np.datetime64]
+
+    def __post_init__(self):
+        if self.buffer.ndim != 1:
+            raise ValueError
+        n = len(self.offsets)
+        if not all([len(self.lengths) == n, len(self.ids) == n, len(self.time) == n]):
+            raise ValueError
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, idx) -> "RaggedPacketBatch":
+        idx = np.atleast_1d(np.arange(len(self))[idx])
+        return RaggedPacketBatch(
+            buffer=self.buffer,
+            offsets=self.offsets[idx],
+            lengths=self.lengths[idx],
+            ids=self.ids[idx],
+            time=self.time[idx],
+        )
+
+    def packet(self, idx: int) -> NDArray[np.uint8]:
+        """A view of the bytes of packet `idx`."""
+        start = self.offsets[idx]
+        return self.buffer[start : start + self.lengths[idx]]
+
+    def select(self, pid: Any) -> "RaggedPacketBatch":
+        """The packets with ID `pid`."""
+        return self[np.flatnonzero(self.ids == pid)]
+
+    def groups(self) -> dict[Any, "RaggedPacketBatch"]:
+        """Split the packets by ID, keeping their order within each ID."""
+        order = np.argsort(self.ids, kind="stable")
+        ids, starts = np.unique(self.ids[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        return {
+            pid.item(): self[order[lo:hi]]
+            for pid, lo, hi in zip(ids, bounds[:-1], bounds[1:])
+        }
+
+    def to_frames(self, word_size: int = 8) -> FrameBatch:
+        """Gather equal-length packets into a FrameBatch of bytes.
+
+        If the packets are evenly spaced in the buffer, the frame data is a
+        strided view of the buffer instead of a copy.
+        """
+        if word_size != 8:
+            msg = f"word_size={word_size!r} is not supported; packets are bytes"
+            raise ValueError(msg)
+        if len(self) and np.any(self.lengths != self.lengths[0]):
+            msg = "all packets must have the same length to form frames"
+            raise ValueError(msg)
+
+        length = int(self.lengths[0]) if len(self) else 0
+        steps = np.diff(self.offsets)
+        if len(self) > 1 and np.all(steps == steps[0]) and steps[0] > 0:
+            data = np.lib.stride_tricks.as_strided(
+                self.buffer[self.offsets[0] :],
+                shape=(len(self), length),
+                strides=(
+                    int(steps[0]) * self.buffer.strides[0],
+                    self.buffer.strides[0],
+                ),
+                writeable=False,
+            )
+        else:
+            data = self.buffer[self.offsets[:, None] + np.arange(length)]
+
+        time = self.time
+        return FrameBatch(ctime=time, time=time, data=VarUIntArray(data, word_size=8))
+
+    def to_packet_batch(self) -> PacketBatch:
+        """Convert to a PacketBatch of FrameBatches, one per packet ID."""
+        return PacketBatch(
+            packets={pid: group.to_frames() for pid, group in self.groups().items()}
+        )
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from typing import Literal, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.model import RaggedPacketBatch
+
+
+@dataclass(frozen=True)
+class PacketFormat:
+    """The location of the length and ID fields in a packet header.
+
+    The defaults describe a CCSDS space packet: an 11-bit APID in the first two
+    bytes and a 16-bit "packet data length minus one" field at byte 4, so the
+    total packet length is the field value plus 7.
+    """
+
+    length_offset: int = 4
+    length_size: int = 2
+    length_adjust: int = 7
+    id_offset: int = 0
+    id_size: int = 2
+    id_mask: int = 0x07FF
+    byteorder: Literal["big", "little"] = "big"
+
+    @property
+    def header_size(self) -> int:
+        return max(self.length_offset + self.length_size, self.id_offset + self.id_size)
+
+    def read_field(
+        self, data: NDArray[np.uint8], offset: int, size: int, positions: NDArray
+    ) -> NDArray[np.int64]:
+        """Read an unsigned field at `offset` bytes from each of `positions`."""
+        positions = np.asarray(positions, dtype=np.int64)
+        result = np.zeros(len(positions), dtype=np.int64)
+        order = range(size) if self.byteorder == "big" else reversed(range(size))
+        for idx in order:
+            result <<= 8
+            result |= data[positions + offset + idx]
+        return result
+
+    def packet_length(self, header: bytes) -> int:
+        """The total length of the packet starting with `header`."""
+        field = header[self.length_offset : self.length_offset + self.length_size]
+        return int.from_bytes(field, self.byteorder) + self.length_adjust
+
+
+CCSDS = PacketFormat()
+
+
+def demux_packets(
+    buffer: Union[bytes, bytearray, memoryview, NDArray],
+    packet_format: PacketFormat = CCSDS,
+    time: Optional[np.datetime64] = None,
+) -> tuple[RaggedPacketBatch, int]:
+    """Split a stream of back-to-back packets using their length fields.
+
+    The chain of packets is followed by reading the length field of each packet
+    header in turn; the IDs and lengths are then gathered at the packet offsets
+    at once. Packets that run past the end of the buffer are left for the next
+    call.
+
+    Parameters
+    ----------
+    buffer
+        The packet stream, starting at the first byte of a packet.
+    packet_format
+        The header layout.
+    time
+        Optional time assigned to every packet; NaT by default.
+
+    Returns
+    -------
+    tuple[RaggedPacketBatch, int]
+        The complete packets, which share `buffer`, and the number of bytes they
+        use. The remaining bytes start the next packet.
+    """
+    if isinstance(buffer, np.ndarray):
+        data = buffer.view(np.uint8).ravel()
+    else:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+
+    fmt = packet_format
+    # Index a bytes object while following the chain; it is much faster than
+    # indexing the array one packet at a time
+    raw = buffer if isinstance(buffer, bytes) else data.tobytes()
+    minimum = max(fmt.header_size, 1)
+    offsets = []
+    position = 0
+    end = len(raw)
+    while end - position >= fmt.header_size:
+        length = fmt.packet_length(raw[position : position + fmt.header_size])
+        if length < minimum:
+            msg = f"packet at byte {position} is shorter than its header"
+            raise ValueError(msg)
+        if position + length > end:
+            break
+        offsets.append(position)
+        position += length
+
+    offsets = np.array(offsets, dtype=np.int64)
+    lengths = fmt.read_field(data, fmt.length_offset, fmt.length_size, offsets)
+    lengths += fmt.length_adjust
+    ids = fmt.read_field(data, fmt.id_offset, fmt.id_size, offsets) & fmt.id_mask
+    if time is None:
+        time = np.datetime64("NaT", "ns")
+    batch = RaggedPacketBatch(
+        buffer=data,
+        offsets=offsets,
+        lengths=lengths,
+        ids=ids,
+        time=np.full(len(offsets), time, dtype="datetime64[ns]"),
+    )
+    return batch, position
+
+
+class PacketDemultiplexer:
+    """Demultiplex a packet stream which arrives in arbitrary chunks.
+
+    Bytes of a packet which is incomplete at the end of one chunk are kept and
+    joined with the following chunks. Once the header of that packet has
+    arrived, chunks are only collected until the whole packet is there, so a
+    long packet spread over many chunks is not rescanned for every chunk.
+    """
+
+    def __init__(self, packet_format: PacketFormat = CCSDS) -> None:
+        self.packet_format = packet_format
+        self._pending: list[NDArray[np.uint8]] = []
+        self._pending_size = 0
+        # The number of bytes needed before a packet can be split off
+        self._needed = packet_format.header_size
+
+    def process(
+        self,
+        chunk: Union[bytes, bytearray, memoryview, NDArray],
+        time: Optional[np.datetime64] = None,
+    ) -> RaggedPacketBatch:
+        if isinstance(chunk, np.ndarray):
+            chunk = chunk.view(np.uint8).ravel()
+        else:
+            chunk = np.frombuffer(chunk, dtype=np.uint8)
+
+        if self._pending_size + len(chunk) < self._needed:
+            self._pending.append(chunk.copy())
+            self._pending_size += len(chunk)
+            return demux_packets(b"", self.packet_format)[0]
+
+        data = np.concatenate([*self._pending, chunk]) if self._pending else chunk
+        batch, used = demux_packets(data, self.packet_format, time=time)
+
+        rest = data[used:].copy()
+        self._pending = [rest] if len(rest) else []
+        self._pending_size = len(rest)
+        self._needed = self.packet_format.header_size
+        if len(rest) >= self._needed:
+            header = rest[: self._needed].tobytes()
+            self._needed = self.packet_format.packet_length(header)
+        return batch
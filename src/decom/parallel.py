@@ -0,0 +1,357 @@
+import multiprocessing.context
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Literal, Mapping, Optional, Self
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.measurand import Measurand, Parameter, SamplingStrategy
+from decom.model import FrameBatch, VarUIntArray
+from decom.plan import DecomPlan, DecomResult
+
+# Below this many rows a shard costs more to dispatch than to decom
+DEFAULT_MIN_ROWS = 4096
+
+Shard = tuple[int, int, tuple[str, ...]]
+
+Selection = dict[SamplingStrategy, NDArray[np.intp]]
+
+# Per-process state of a worker, set by `_init_worker`
+_worker_measurands: dict[str, Measurand] = {}
+_worker_word_size: int = 0
+_worker_counter: Optional[Parameter] = None
+_worker_plans: dict[tuple[str, ...], DecomPlan] = {}
+
+
+def _init_worker(
+    measurands: dict[str, Measurand], word_size: int, counter: Optional[Parameter]
+) -> None:
+    global _worker_measurands, _worker_word_size, _worker_counter
+    _worker_measurands = measurands
+    _worker_word_size = word_size
+    _worker_counter = counter
+    _worker_plans.clear()
+
+
+def _worker_plan(names: tuple[str, ...]) -> DecomPlan:
+    if names not in _worker_plans:
+        subset = {name: _worker_measurands[name] for name in names}
+        _worker_plans[names] = DecomPlan(
+            subset, word_size=_worker_word_size, counter=_worker_counter
+        )
+    return _worker_plans[names]
+
+
+def _run_shard(
+    shm_name: str,
+    shape: tuple[int, int],
+    dtype: str,
+    start: int,
+    stop: int,
+    names: tuple[str, ...],
+    raw: bool,
+    selection: Selection,
+) -> dict[str, NDArray]:
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    try:
+        frames = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        data = VarUIntArray(frames[start:stop], word_size=_worker_word_size)
+        time = np.full(stop - start, np.datetime64("NaT", "ns"))
+        batch = FrameBatch(ctime=time, time=time, data=data)
+        columns = _worker_plan(names).run(batch, raw=raw, selection=selection).columns
+        # Results may be views of the frames; copy them out before the block is closed
+        columns = {name: np.array(value) for name, value in columns.items()}
+        del frames, data, batch
+        return columns
+    finally:
+        shm.close()
+
+
+def _split(
+    names: tuple[str, ...],
+    num_rows: int,
+    workers: int,
+    shard: Literal["rows", "measurands"],
+    min_rows: int,
+) -> list[Shard]:
+    """Split the work into (start row, stop row, measurand names) shards."""
+    if shard == "measurands":
+        count = max(min(workers, len(names)), 1)
+        groups = np.array_split(np.arange(len(names)), count)
+        return [(0, num_rows, tuple(names[i] for i in group)) for group in groups]
+
+    count = max(min(workers, num_rows // min_rows), 1)
+    bounds = np.linspace(0, num_rows, count + 1).astype(int)
+    return [(int(lo), int(hi), names) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _gather(
+    measurands: Mapping[str, Measurand],
+    shard: Literal["rows", "measurands"],
+    parts: list[dict[str, NDArray]],
+) -> dict[str, NDArray]:
+    """Combine the columns computed for each shard, in measurand order."""
+    if shard == "measurands":
+        gathered = {name: value for part in parts for name, value in part.items()}
+        return {name: gathered[name] for name in measurands}
+    return {name: np.concatenate([part[name] for part in parts]) for name in measurands}
+
+
+def _shard_selection(selection: Selection, start: int, stop: int) -> Selection:
+    """The selected rows within rows `start` to `stop`, counted from `start`."""
+    shard = {}
+    for strategy, rows in selection.items():
+        lo, hi = np.searchsorted(rows, [start, stop])
+        shard[strategy] = rows[lo:hi] - start
+    return shard
+
+
+def _check_shard(shard: str) -> None:
+    if shard not in ("rows", "measurands"):
+        msg = f"shard={shard!r} must be 'rows' or 'measurands'"
+        raise ValueError(msg)
+
+
+class _ShardedDecom:
+    """The sharding and lifetime shared by the decom executors."""
+
+    def __init__(
+        self,
+        measurands: Mapping[str, Measurand],
+        word_size: int,
+        max_workers: Optional[int],
+        shard: Literal["rows", "measurands"],
+        min_rows: int,
+        counter: Optional[Parameter],
+        counter_reset: Optional[int],
+    ) -> None:
+        _check_shard(shard)
+
+        self.measurands = dict(measurands)
+        self.word_size = word_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard = shard
+        self.min_rows = max(min_rows, 1)
+        self.counter = counter
+        self.counter_reset = counter_reset
+        self._executor: Executor
+
+        # The frames sampled by each strategy are selected here, for the whole
+        # batch, so the minor frame count carries over in order between batches
+        # and row shards only get the selected rows within them
+        sampled = {name: m for name, m in self.measurands.items() if m.ss is not None}
+        self._selector = DecomPlan(sampled, word_size, counter, counter_reset)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def _shards(self, num_rows: int) -> list[Shard]:
+        names = tuple(self.measurands)
+        return _split(names, num_rows, self.max_workers, self.shard, self.min_rows)
+
+    def _check_word_size(self, data: VarUIntArray) -> None:
+        if data.word_size != self.word_size:
+            msg = f"data.word_size={data.word_size} does not match word_size={self.word_size}"
+            raise ValueError(msg)
+
+    def _result(
+        self, batch: FrameBatch, parts: list[dict[str, NDArray]], selection: Selection
+    ) -> DecomResult:
+        columns = _gather(self.measurands, self.shard, parts)
+        rows = {
+            name: selection[measurand.ss]
+            for name, measurand in self.measurands.items()
+            if measurand.ss is not None
+        }
+        return DecomResult(
+            time=batch.time, ctime=batch.ctime, columns=columns, rows=rows
+        )
+
+    def reset(self) -> None:
+        """Forget the minor frame count carried over from the previous batch."""
+        self._selector.reset()
+
+
+class ParallelDecom(_ShardedDecom):
+    """Run a DecomPlan across a pool of worker processes.
+
+    The measurands are sent to each worker once, when it starts. For each run the
+    frame data is copied into a shared memory block that the workers read in
+    place, so frames are never pickled; only the per-measurand results are sent
+    back. The work is split either by rows, where each worker decoms every
+    measurand for a range of frames, or by measurands, where each worker decoms a
+    subset of the measurands for every frame.
+
+    The frames selected for sampled measurands are found for the whole batch
+    before it is split, so batches must be run in order, as with `DecomPlan`.
+
+    Use as a context manager, or call `close`, to stop the workers.
+
+    Parameters
+    ----------
+    measurands
+        The measurands to extract, keyed by name.
+    word_size
+        The word size of the frames the executor will be run on.
+    max_workers
+        The number of worker processes, by default the number of CPUs.
+    shard
+        How to split the work: "rows" or "measurands".
+    min_rows
+        With row sharding, the minimum number of rows in a shard.
+    mp_context
+        The multiprocessing context used to start the workers.
+    counter
+        The minor frame counter, required if any measurand has a sampling
+        strategy.
+    counter_reset
+        The counter value at the start of a major frame, as for `DecomPlan`.
+    """
+
+    def __init__(
+        self,
+        measurands: Mapping[str, Measurand],
+        word_size: int,
+        max_workers: Optional[int] = None,
+        shard: Literal["rows", "measurands"] = "rows",
+        min_rows: int = DEFAULT_MIN_ROWS,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        counter: Optional[Parameter] = None,
+        counter_reset: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            measurands, word_size, max_workers, shard, min_rows, counter, counter_reset
+        )
+        self._executor = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.measurands, word_size, counter),
+        )
+
+    def run(self, batch: FrameBatch, raw: bool = False) -> DecomResult:
+        """Extract every measurand from `batch`, as `DecomPlan.run` would."""
+        data = batch.data
+        self._check_word_size(data)
+        selection = self._selector.select(batch)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        try:
+            shared = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+            shared[...] = data
+            del shared
+
+            shards = self._shards(len(data))
+            futures = [
+                self._executor.submit(
+                    _run_shard,
+                    shm.name,
+                    data.shape,
+                    data.dtype.str,
+                    start,
+                    stop,
+                    names,
+                    raw,
+                    _shard_selection(selection, start, stop),
+                )
+                for start, stop, names in shards
+            ]
+            parts = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return self._result(batch, parts, selection)
+
+
+class ThreadedDecom(_ShardedDecom):
+    """Run a DecomPlan across a pool of threads in this process.
+
+    NumPy releases the GIL in the gathers, bitwise operations and ufuncs that do
+    most of the work, so threads run in parallel without copying the frames or
+    the measurands. Row shards are views of the batch. The plans are built once
+    and are not modified by running them, so they are shared by every thread.
+    As with `ParallelDecom`, batches with sampled measurands must run in order.
+
+    Use as a context manager, or call `close`, to stop the threads.
+
+    Parameters
+    ----------
+    measurands
+        The measurands to extract, keyed by name.
+    word_size
+        The word size of the frames the executor will be run on.
+    max_workers
+        The number of threads, by default the number of CPUs.
+    shard
+        How to split the work: "rows" or "measurands".
+    min_rows
+        With row sharding, the minimum number of rows in a shard.
+    counter
+        The minor frame counter, required if any measurand has a sampling
+        strategy.
+    counter_reset
+        The counter value at the start of a major frame, as for `DecomPlan`.
+    """
+
+    def __init__(
+        self,
+        measurands: Mapping[str, Measurand],
+        word_size: int,
+        max_workers: Optional[int] = None,
+        shard: Literal["rows", "measurands"] = "rows",
+        min_rows: int = DEFAULT_MIN_ROWS,
+        counter: Optional[Parameter] = None,
+        counter_reset: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            measurands, word_size, max_workers, shard, min_rows, counter, counter_reset
+        )
+
+        # The measurand shards do not depend on the batch, so build their plans now
+        self._plans = {}
+        for _, _, names in self._shards(0):
+            subset = {name: self.measurands[name] for name in names}
+            self._plans[names] = DecomPlan(subset, word_size=word_size, counter=counter)
+        self._executor = ThreadPoolExecutor(self.max_workers)
+
+    def _run_shard(
+        self,
+        batch: FrameBatch,
+        start: int,
+        stop: int,
+        names: tuple[str, ...],
+        raw: bool,
+        selection: Selection,
+    ) -> dict[str, NDArray]:
+        shard = batch[start:stop]
+        return self._plans[names].run(shard, raw=raw, selection=selection).columns
+
+    def run(self, batch: FrameBatch, raw: bool = False) -> DecomResult:
+        """Extract every measurand from `batch`, as `DecomPlan.run` would."""
+        data = batch.data
+        self._check_word_size(data)
+
+        selection = self._selector.select(batch)
+        futures = [
+            self._executor.submit(
+                self._run_shard,
+                batch,
+                start,
+                stop,
+                names,
+                raw,
+                _shard_selection(selection, start, stop),
+            )
+            for start, stop, names in self._shards(len(batch))
+        ]
+        parts = [future.result() for future in futures]
+        return self._result(batch, parts, selection)
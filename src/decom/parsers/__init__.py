@@ -1,33 +1,65 @@
+"""Lark parsers for the decom languages.
+
+The parsers are built on first use rather than at import time, and Lark caches
+the analyzed LALR tables between processes, so importing this package (or only
+using one of the parsers) does not pay for analyzing every grammar.
+"""
+
+import functools
+
 import lark
 from lark import Lark
 
 from decom.parsers.calculator import CalculatorTransformer
+from decom.parsers.decom import DecomTransformer
 from decom.parsers.measurand import MeasurandTransformer
 from decom.parsers.parameter import ParameterTransformer
 
-calculator_parser = Lark.open(
-    "calculator.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=CalculatorTransformer(),
-)
-parameter_parser = Lark.open(
-    "parameter.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=ParameterTransformer(),
-)
-
 MergedMeasurandTransformer = lark.visitors.merge_transformers(
     MeasurandTransformer(),
     parameter=ParameterTransformer(),
     calculator=CalculatorTransformer(),
 )
-measurand_parser = Lark.open(
-    "measurand.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=MergedMeasurandTransformer,
+MergedDecomTransformer = lark.visitors.merge_transformers(
+    DecomTransformer(),
+    measurand=MergedMeasurandTransformer,
 )
 
-decom_parser = Lark.open("decom.lark", rel_to=__file__, parser="lalr")
+
+def _open(grammar: str, transformer=None) -> Lark:
+    # Lark keys its cache on the grammar, its imports, the options and the Lark version
+    return Lark.open(
+        grammar,
+        rel_to=__file__,
+        parser="lalr",
+        transformer=transformer,
+        cache=True,
+    )
+
+
+_BUILDERS = {
+    "calculator_parser": lambda: _open("calculator.lark", CalculatorTransformer()),
+    "parameter_parser": lambda: _open("parameter.lark", ParameterTransformer()),
+    "measurand_parser": lambda: _open("measurand.lark", MergedMeasurandTransformer),
+    "decom_parser": lambda: _open("decom.lark", MergedDecomTransformer),
+}
+
+
+@functools.cache
+def get_parser(name: str) -> Lark:
+    """The parser called `name`, built on the first call."""
+    if name not in _BUILDERS:
+        msg = f"no parser named {name!r}; expected one of {list(_BUILDERS)}"
+        raise ValueError(msg)
+    return _BUILDERS[name]()
+
+
+def __getattr__(name: str) -> Lark:
+    if name in _BUILDERS:
+        return get_parser(name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_BUILDERS])
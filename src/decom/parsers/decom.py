@@ -0,0 +1,89 @@
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from lark import Token, Transformer, v_args
+
+from decom.database import Database, Function
+from decom.measurand import Iterator, Measurand, SamplingStrategy
+from decom.measurand.sampling import STRATEGIES
+
+
+@dataclass
+class _Include:
+    path: str
+
+
+@dataclass
+class _Directive:
+    name: str
+    value: str
+
+
+@dataclass
+class _NamedMeasurand:
+    name: str
+    measurand: Measurand
+
+
+@dataclass
+class _Uselist:
+    name: str
+    members: list[_NamedMeasurand]
+
+
+@v_args(inline=True)
+class DecomTransformer(Transformer):
+    def start(self, *values: Any) -> Database:
+        database = Database()
+        for value in values:
+            if isinstance(value, _Include):
+                database.includes.append(value.path)
+            elif isinstance(value, _Directive):
+                database.directives[value.name] = value.value
+            elif isinstance(value, Function):
+                database.functions[value.name] = value
+            elif isinstance(value, _NamedMeasurand):
+                database.add_measurand(value.name, value.measurand)
+            elif isinstance(value, _Uselist):
+                members = {item.name: item.measurand for item in value.members}
+                database.add_uselist(value.name, members)
+        return database
+
+    def value(self, item: Any) -> Any:
+        return item
+
+    def directive(self, name: str, word: Token) -> _Directive:
+        return _Directive(name, str(word))
+
+    def directive_name(self, token: Token) -> str:
+        return str(token).lower()
+
+    def include(self, path: Token) -> _Include:
+        return _Include(str(path).strip())
+
+    def uselist(self, name: Token, *members: _NamedMeasurand) -> _Uselist:
+        return _Uselist(str(name), list(members))
+
+    def function(self, name: str, function: Token, *args: Token) -> Function:
+        return Function(name=name, function=str(function), args=[str(a) for a in args])
+
+    def name(self, *tokens: Token) -> str:
+        return ".".join(str(t) for t in tokens)
+
+    def named_measurand(self, name: str, *args: Any) -> _NamedMeasurand:
+        measurand = args[-1]
+        if len(args) == 2:
+            measurand = dataclasses.replace(measurand, ss=args[0])
+        return _NamedMeasurand(name, measurand)
+
+    def iterator(self, step: Token, stop: Optional[Token] = None) -> Iterator:
+        return Iterator(int(step), None if stop is None else int(stop))
+
+    def filter(
+        self, kind: Token, value: Token, iterator: Optional[Iterator] = None
+    ) -> SamplingStrategy:
+        strategy = STRATEGIES[str(kind).lower()]
+        if iterator is None:
+            return strategy(int(value))
+        return strategy(int(value), iterator.step, iterator.stop)
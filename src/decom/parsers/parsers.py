@@ -1,35 +1,8 @@
-import lark
-from lark import Lark
+# Kept for backwards compatibility; the parsers are defined in decom.parsers
+from decom.parsers import MergedMeasurandTransformer, get_parser  # noqa: F401
 
-from decom.parsers import (
-    CalculatorTransformer,
-    MeasurandTransformer,
-    ParameterTransformer,
-)
 
-calculator_parser = Lark.open(
-    "calculator.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=CalculatorTransformer(),
-)
-parameter_parser = Lark.open(
-    "parameter.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=ParameterTransformer(),
-)
+def __getattr__(name: str):
+    import decom.parsers
 
-MergedMeasurandTransformer = lark.visitors.merge_transformers(
-    MeasurandTransformer(),
-    parameter=ParameterTransformer(),
-    calculator=CalculatorTransformer(),
-)
-measurand_parser = Lark.open(
-    "measurand.lark",
-    rel_to=__file__,
-    parser="lalr",
-    transformer=MergedMeasurandTransformer,
-)
-
-decom_parser = Lark.open("decom.lark", rel_to=__file__, parser="lalr")
+    return getattr(decom.parsers, name)
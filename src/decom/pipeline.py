@@ -0,0 +1,342 @@
+"""Streaming decom: source -> framing -> batching -> decom plan -> sinks.
+
+Each stage runs as its own task and hands its output to the next through a
+bounded queue. When a later stage falls behind, the queue fills and the earlier
+stage waits, so a slow sink eventually stops the source from reading (for TCP
+and files) instead of buffering without limit. Framing and decom run in an
+executor so they do not block the event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Literal,
+    Optional,
+    Protocol,
+    Union,
+)
+
+import numpy as np
+
+from decom.bitstream import unpack_words
+from decom.model import FrameBatch
+from decom.plan import DecomPlan, DecomResult
+from decom.sync import SyncResult
+
+DEFAULT_READ_SIZE = 2**16
+DEFAULT_QUEUE_SIZE = 8
+
+Chunk = Union[bytes, bytearray, memoryview]
+Sink = Callable[[DecomResult], Union[None, Awaitable[None]]]
+
+# Marks the end of the stream in a stage queue
+_END = object()
+
+
+async def tcp_source(
+    host: str, port: int, read_size: int = DEFAULT_READ_SIZE
+) -> AsyncIterator[bytes]:
+    """Connect to a TCP server and yield what it sends until it closes."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while chunk := await reader.read(read_size):
+            yield chunk
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def file_source(
+    path: Union[str, os.PathLike],
+    read_size: int = DEFAULT_READ_SIZE,
+    follow: bool = False,
+    poll_interval: float = 0.1,
+) -> AsyncIterator[bytes]:
+    """Yield the contents of a file, optionally following it as it grows.
+
+    With `follow`, the file is polled every `poll_interval` seconds after the
+    end is reached, like `tail -f`, and the source never ends by itself.
+    """
+    with open(path, "rb") as file:
+        while True:
+            chunk = await asyncio.to_thread(file.read, read_size)
+            if chunk:
+                yield chunk
+            elif follow:
+                await asyncio.sleep(poll_interval)
+            else:
+                return
+
+
+class _DatagramQueue(asyncio.DatagramProtocol):
+    def __init__(self, source: "UDPSource") -> None:
+        self.source = source
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        try:
+            self.source._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.source.dropped += 1
+
+
+class UDPSource:
+    """Receive datagrams on a local address and yield each one.
+
+    UDP has no flow control, so when the pipeline falls behind and `queue_size`
+    datagrams are waiting, new datagrams are dropped and counted in `dropped`.
+    Iteration ends once the source is closed.
+
+    Parameters
+    ----------
+    host, port
+        The local address to bind. Port 0 picks a free port; see `address`.
+    queue_size
+        The number of datagrams buffered before dropping.
+    """
+
+    def __init__(self, host: str, port: int, queue_size: int = 1024) -> None:
+        self.host = host
+        self.port = port
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._transport: Optional[asyncio.DatagramTransport] = None
+
+    async def start(self) -> tuple[str, int]:
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DatagramQueue(self), local_addr=(self.host, self.port)
+        )
+        return self.address
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The bound (host, port)."""
+        return self._transport.get_extra_info("sockname")[:2]
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        # Wake the consumer even if the queue is full of datagrams
+        while True:
+            try:
+                self._queue.put_nowait(_END)
+                break
+            except asyncio.QueueFull:
+                self._queue.get_nowait()
+                self.dropped += 1
+
+    async def __aenter__(self) -> "UDPSource":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self._transport is None:
+            await self.start()
+        while (datagram := await self._queue.get()) is not _END:
+            yield datagram
+
+
+class Framer(Protocol):
+    """Turns chunks of a byte stream into frames, keeping any partial frame."""
+
+    def process(self, chunk: Chunk) -> Union[FrameBatch, SyncResult]: ...
+
+
+class FixedFramer:
+    """Split an already synchronized stream into back-to-back frames.
+
+    For streams that need synchronization, use a `FrameSynchronizer` instead.
+    The frames have NaT times.
+    """
+
+    def __init__(
+        self,
+        words_per_frame: int,
+        word_size: int,
+        bit_order: Literal["msb", "lsb"] = "msb",
+    ) -> None:
+        if (words_per_frame * word_size) % 8:
+            msg = "frames must be a whole number of bytes; use a FrameSynchronizer"
+            raise ValueError(msg)
+        self.words_per_frame = words_per_frame
+        self.word_size = word_size
+        self.bit_order = bit_order
+        self.frame_bytes = words_per_frame * word_size // 8
+        self._pending = b""
+
+    def process(self, chunk: Chunk) -> FrameBatch:
+        data = self._pending + bytes(chunk)
+        used = len(data) - len(data) % self.frame_bytes
+        self._pending = data[used:]
+        frames = unpack_words(
+            data[:used], self.word_size, self.words_per_frame, self.bit_order
+        )
+        times = np.full(len(frames), np.datetime64("NaT", "ns"))
+        return FrameBatch(ctime=times, time=times.copy(), data=frames)
+
+
+@dataclass
+class PipelineStats:
+    chunks: int = 0
+    bytes: int = 0
+    frames: int = 0
+    batches: int = 0
+
+
+class Pipeline:
+    """An asyncio pipeline from a byte source, through a DecomPlan, to sinks.
+
+    Frames are collected into batches of `batch_size`, or fewer if `max_latency`
+    seconds pass after the first frame of a batch arrives. Small batches and a
+    short `max_latency` favor latency; large ones favor throughput. Frames
+    without a time are stamped with the time their chunk was received.
+
+    Parameters
+    ----------
+    source
+        An async iterable of byte chunks, e.g. `tcp_source`, `file_source` or a
+        `UDPSource`.
+    framer
+        Turns chunks into frames, e.g. a `FixedFramer` or `FrameSynchronizer`.
+    plan
+        The decom plan run on each batch.
+    sinks
+        Called with each DecomResult, in order; may be coroutine functions.
+    batch_size
+        The largest number of frames in a batch.
+    max_latency
+        The longest time, in seconds, a frame waits for its batch to fill.
+    queue_size
+        The capacity of the queue between each pair of stages.
+    executor
+        Where framing and decom run; by default the event loop's executor.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[Chunk],
+        framer: Framer,
+        plan: DecomPlan,
+        sinks: Iterable[Sink] = (),
+        batch_size: int = 4096,
+        max_latency: float = 0.1,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        if batch_size < 1:
+            msg = f"batch_size={batch_size!r} must be positive"
+            raise ValueError(msg)
+
+        self.source = source
+        self.framer = framer
+        self.plan = plan
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.queue_size = queue_size
+        self.executor = executor
+        self.stats = PipelineStats()
+
+    async def run(self) -> PipelineStats:
+        """Run until the source ends and every result has reached the sinks."""
+        chunks: asyncio.Queue = asyncio.Queue(self.queue_size)
+        frames: asyncio.Queue = asyncio.Queue(self.queue_size)
+        results: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._ingest(chunks))
+            group.create_task(self._frame(chunks, frames))
+            group.create_task(self._decom(frames, results))
+            group.create_task(self._sink(results))
+        return self.stats
+
+    async def _offload(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _ingest(self, out: asyncio.Queue) -> None:
+        async for chunk in self.source:
+            self.stats.chunks += 1
+            self.stats.bytes += len(chunk)
+            await out.put((np.datetime64(time.time_ns(), "ns"), chunk))
+        await out.put(_END)
+
+    async def _frame(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        while (item := await inp.get()) is not _END:
+            received, chunk = item
+            result = await self._offload(self.framer.process, chunk)
+            batch = result.frames if isinstance(result, SyncResult) else result
+            if len(batch):
+                batch.time[np.isnat(batch.time)] = received
+                batch.ctime[np.isnat(batch.ctime)] = received
+                await out.put(batch)
+        await out.put(_END)
+
+    async def _decom(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        pending: list[FrameBatch] = []
+        count = 0
+        # When the oldest pending frame has waited max_latency
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            try:
+                item = await asyncio.wait_for(inp.get(), timeout)
+            except TimeoutError:
+                item = None
+
+            if item is _END:
+                break
+            if item is not None:
+                pending.append(item)
+                count += len(item)
+                if deadline is None:
+                    deadline = loop.time() + self.max_latency
+
+            if item is None or count >= self.batch_size:
+                pending = await self._emit(pending, out, partial=item is None)
+                count = sum(len(batch) for batch in pending)
+                deadline = deadline if pending else None
+
+        if pending:
+            await self._emit(pending, out, partial=True)
+        await out.put(_END)
+
+    async def _emit(
+        self, pending: list[FrameBatch], out: asyncio.Queue, partial: bool
+    ) -> list[FrameBatch]:
+        """Decom full batches of the pending frames, and with `partial` the rest.
+
+        Returns the frames left over.
+        """
+        frames = FrameBatch.concat(pending)
+        start = 0
+        while len(frames) - start >= self.batch_size or (
+            partial and start < len(frames)
+        ):
+            batch = frames[start : start + self.batch_size]
+            start += len(batch)
+            self.stats.frames += len(batch)
+            self.stats.batches += 1
+            await out.put(await self._offload(self.plan.run, batch))
+        return [frames[start:]] if start < len(frames) else []
+
+    async def _sink(self, inp: asyncio.Queue) -> None:
+        while (result := await inp.get()) is not _END:
+            for sink in self.sinks:
+                value = sink(result)
+                if asyncio.iscoroutine(value):
+                    await value
@@ -0,0 +1,356 @@
+import dataclasses
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Hashable, Iterator, Mapping, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.measurand import (
+    BasicParameter,
+    FragmentConstant,
+    FragmentWord,
+    FrameSelector,
+    Measurand,
+    Parameter,
+    ParameterKernel,
+    SamplingStrategy,
+    SelectorState,
+)
+from decom.model import FrameBatch
+from decom.timing import SampleTiming, flatten_samples, sample_times
+
+
+@dataclass
+class DecomResult:
+    """Columnar decom output: one array per measurand, aligned with the frame times.
+
+    Measurands with a sampling strategy only have values for the selected
+    frames; `rows` holds the frame (row) of each of their values. `sample_time`
+    optionally holds the time of every sample of each measurand, shaped like
+    its column.
+    """
+
+    time: NDArray[np.datetime64]
+    ctime: NDArray[np.datetime64]
+    columns: dict[str, NDArray]
+    sample_time: dict[str, NDArray[np.datetime64]] = field(default_factory=dict)
+    rows: dict[str, NDArray[np.intp]] = field(default_factory=dict)
+
+    def frame_time(self, name: str) -> NDArray[np.datetime64]:
+        """The time of the frame each value of `name` came from."""
+        if name in self.rows:
+            return self.time[self.rows[name]]
+        return self.time
+
+    def __getitem__(self, name: str) -> NDArray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def series(self, name: str) -> tuple[NDArray[np.datetime64], NDArray]:
+        """The samples of `name` as a time-ordered 1-D series of (times, values).
+
+        Uses the sample times if they were computed, otherwise the frame times.
+        """
+        time = self.sample_time.get(name)
+        if time is None:
+            time = self.frame_time(name)
+        if time.shape != self.columns[name].shape:
+            time = np.broadcast_to(time.reshape(-1, 1), self.columns[name].shape)
+        return flatten_samples(time, self.columns[name])
+
+
+def _bind(measurand: Measurand, word_size: int) -> Measurand:
+    """A copy of `measurand` whose parameter is bound to `word_size` data."""
+    bind = getattr(measurand.parameter, "bind", None)
+    if bind is None:
+        return measurand
+    return dataclasses.replace(measurand, parameter=bind(word_size))
+
+
+def _words(parameter: BasicParameter) -> list[FragmentWord]:
+    return [frag for frag in parameter.fragments if isinstance(frag, FragmentWord)]
+
+
+def _read_key(frag: FragmentWord) -> Hashable:
+    bits = None if frag.bits is None else tuple(sorted(frag.bits))
+    return (frag.word - int(frag.one_based), bits, frag.complement, frag.reverse)
+
+
+@dataclass
+class _Assembly:
+    name: str
+    measurand: Measurand
+    size: int
+    parts: list[Union[int, FragmentConstant]]
+
+
+class _Scratch(threading.local):
+    """Buffers reused from run to run, one set per thread."""
+
+    def __init__(self) -> None:
+        self.buffers: dict[tuple[str, np.dtype], NDArray] = {}
+
+    def get(self, role: str, dtype: np.dtype, num_rows: int) -> NDArray:
+        buffer = self.buffers.get((role, dtype))
+        if buffer is None or len(buffer) < num_rows:
+            buffer = self.buffers[(role, dtype)] = np.empty(num_rows, dtype=dtype)
+        return buffer[:num_rows]
+
+
+class DecomPlan:
+    """Extract many measurands from a FrameBatch in a single pass.
+
+    When the plan is compiled, the fragments of every `BasicParameter` are
+    collected and identical fragment reads (same word, bits, complement and
+    reverse) are shared between measurands. Running the plan gathers every word
+    column used by any measurand into one contiguous block, computes each
+    distinct fragment once, and then assembles and converts each measurand.
+    A measurand whose reads are not shared with any other is instead built by
+    its `ParameterKernel`, straight into its output, with scratch buffers that
+    are reused from run to run.
+
+    Measurands with other parameter types are built individually.
+
+    Measurands with a sampling strategy (e.g. `mfo(1)`) are only extracted from
+    the frames the strategy selects, which are found from the minor frame
+    `counter`. Measurands with equal strategies share one selection and one
+    gather of the selected frames.
+
+    The plan binds copies of the measurands' parameters to `word_size` and never
+    modifies them afterwards, so one plan can be run from several threads at once.
+    The exception is the minor frame count behind the sampling strategies, which
+    `select` carries from one batch to the next so that the major frame offsets
+    continue across batch boundaries. Batches of a stream must therefore be run
+    in order, or their selections made in order with `select` and passed to
+    `run`.
+
+    Parameters
+    ----------
+    measurands
+        The measurands to extract, keyed by name.
+    word_size
+        The word size of the frames the plan will be run on.
+    counter
+        The minor frame counter, required if any measurand has a sampling
+        strategy.
+    counter_reset
+        The counter value at the start of a major frame. If not given, a major
+        frame starts wherever the counter does not increase.
+    """
+
+    def __init__(
+        self,
+        measurands: Mapping[str, Measurand],
+        word_size: int,
+        counter: Optional[Parameter] = None,
+        counter_reset: Optional[int] = None,
+    ) -> None:
+        self.measurands = {
+            name: _bind(measurand, word_size) for name, measurand in measurands.items()
+        }
+        self.word_size = word_size
+        self.counter = None if counter is None else counter.bind(word_size)
+        self.counter_reset = counter_reset
+
+        # One plan for the measurands sampled with each distinct strategy
+        direct: dict[str, Measurand] = {}
+        sampled: dict[SamplingStrategy, dict[str, Measurand]] = {}
+        for name, measurand in self.measurands.items():
+            if measurand.ss is None:
+                direct[name] = measurand
+            else:
+                unsampled = dataclasses.replace(measurand, ss=None)
+                sampled.setdefault(measurand.ss, {})[name] = unsampled
+        if sampled and self.counter is None:
+            msg = "a counter is required for measurands with a sampling strategy"
+            raise ValueError(msg)
+
+        self._direct = direct
+        self._sampled = {
+            strategy: DecomPlan(group, word_size) for strategy, group in sampled.items()
+        }
+        self._selector_state: Optional[SelectorState] = None
+        self._compile()
+
+    def _compile(self) -> None:
+        # The number of measurands using each distinct read
+        uses: Counter[Hashable] = Counter()
+        for measurand in self._direct.values():
+            if isinstance(measurand.parameter, BasicParameter):
+                uses.update({_read_key(frag) for frag in _words(measurand.parameter)})
+
+        self._kernels: list[tuple[str, ParameterKernel]] = []
+        reads: dict[Hashable, FragmentWord] = {}
+        for name, measurand in self._direct.items():
+            parameter = measurand.parameter
+            if not isinstance(parameter, BasicParameter):
+                continue
+            if all(uses[_read_key(frag)] == 1 for frag in _words(parameter)):
+                self._kernels.append((name, parameter.compile(self.word_size)))
+                continue
+            for frag in _words(parameter):
+                reads.setdefault(_read_key(frag), frag)
+        kernels = {name for name, _ in self._kernels}
+        self._scratch = _Scratch()
+
+        # Order the reads by word so the column block is gathered left to right
+        keys = sorted(reads, key=lambda k: (k[0], repr(k[1:])))
+        columns = sorted({k[0] for k in keys})
+        slots = {column: idx for idx, column in enumerate(columns)}
+        read_index = {key: idx for idx, key in enumerate(keys)}
+
+        self._columns = np.array(columns, dtype=np.intp)
+        self._reads = [(slots[key[0]], reads[key]) for key in keys]
+        self._assemblies: list[_Assembly] = []
+        self._others: list[str] = []
+
+        for name, measurand in self._direct.items():
+            parameter = measurand.parameter
+            if not isinstance(parameter, BasicParameter):
+                self._others.append(name)
+                continue
+            if name in kernels:
+                continue
+
+            parts = []
+            for frag in parameter.fragments:
+                if isinstance(frag, FragmentWord):
+                    parts.append(read_index[_read_key(frag)])
+                else:
+                    parts.append(frag)
+            size = parameter._calculate_parameter_size(self.word_size)
+            self._assemblies.append(_Assembly(name, measurand, size, parts))
+
+    @property
+    def num_reads(self) -> int:
+        """The number of distinct fragment reads performed per run."""
+        return len(self._reads)
+
+    @property
+    def strategies(self) -> list[SamplingStrategy]:
+        """The distinct sampling strategies of the measurands."""
+        return list(self._sampled)
+
+    def select(self, batch: FrameBatch) -> dict[SamplingStrategy, NDArray[np.intp]]:
+        """The rows of `batch` selected by each sampling strategy.
+
+        The minor frame count is carried over to the next call, so call this for
+        the batches of a stream in order.
+        """
+        if not self._sampled:
+            return {}
+        counter = self.counter.build(batch.data)
+        selector = FrameSelector(counter, self.counter_reset, self._selector_state)
+        selection = {strategy: selector.rows(strategy) for strategy in self._sampled}
+        self._selector_state = selector.next_state()
+        return selection
+
+    def reset(self) -> None:
+        """Forget the minor frame count carried over from the previous batch."""
+        self._selector_state = None
+
+    def run(
+        self,
+        batch: FrameBatch,
+        raw: bool = False,
+        timing: Optional[SampleTiming] = None,
+        selection: Optional[Mapping[SamplingStrategy, NDArray[np.intp]]] = None,
+    ) -> DecomResult:
+        """Extract every measurand in the plan from `batch`.
+
+        Parameters
+        ----------
+        batch
+            The frames to decommutate.
+        raw
+            If True, return the raw parameter values without interp or EUC.
+        timing
+            If given, also compute the time of every sample from the frame time
+            and the position of the sample's first word in the frame.
+        selection
+            The rows selected by each sampling strategy, from `select`. By
+            default `select` is called, carrying the minor frame count over
+            from the previous run.
+
+        Returns
+        -------
+        DecomResult
+            The value of every measurand, keyed by name.
+        """
+        data = batch.data
+        if data.word_size != self.word_size:
+            msg = f"data.word_size={data.word_size} does not match plan.word_size={self.word_size}"
+            raise ValueError(msg)
+
+        num_rows = data.shape[0]
+        block = np.ascontiguousarray(data.view(np.ndarray)[:, self._columns].T)
+        values = [
+            frag.extract(block[slot], self.word_size) for slot, frag in self._reads
+        ]
+
+        columns = {}
+        for item in self._assemblies:
+            fragments = [
+                values[part] if isinstance(part, int) else part.build(data)
+                for part in item.parts
+            ]
+            result = item.measurand.parameter.assemble(fragments, item.size, num_rows)
+            columns[item.name] = result if raw else item.measurand.convert(result)
+
+        for name, kernel in self._kernels:
+            measurand = self._direct[name]
+            work = self._scratch.get("work", kernel.dtype, num_rows)
+            # The raw values only outlive the run if returned, or if `convert`
+            # may return them; a lookup table always makes a new array
+            out = None
+            if not raw and measurand.uses_lut(kernel.size):
+                out = self._scratch.get("out", kernel.dtype, num_rows)
+            result = kernel(data, out=out, work=work)
+            columns[name] = result if raw else measurand.convert(result)
+
+        for name in self._others:
+            measurand = self.measurands[name]
+            result = measurand.parameter.build(data)
+            columns[name] = result if raw else measurand.convert(result)
+
+        times = {}
+        if timing is not None:
+            for name, measurand in self._direct.items():
+                times[name] = sample_times(
+                    batch.time,
+                    measurand.parameter,
+                    timing,
+                    self.word_size,
+                    data.shape[1],
+                )
+
+        rows = {}
+        if self._sampled:
+            if selection is None:
+                selection = self.select(batch)
+            for strategy, plan in self._sampled.items():
+                selected = selection[strategy]
+                result = plan.run(batch[selected], raw=raw, timing=timing)
+                columns.update(result.columns)
+                times.update(result.sample_time)
+                rows.update(dict.fromkeys(result.columns, selected))
+
+        # Preserve the order in which the measurands were given
+        columns = {name: columns[name] for name in self.measurands}
+        return DecomResult(
+            time=batch.time,
+            ctime=batch.ctime,
+            columns=columns,
+            sample_time=times,
+            rows=rows,
+        )
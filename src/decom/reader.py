@@ -0,0 +1,111 @@
+import os
+from typing import Iterator, Literal, Optional, Union
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from decom import utils
+from decom.model import FrameBatch, VarUIntArray
+
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+class FrameFileReader:
+    """Read a recording of fixed-length frames through a memory map.
+
+    Each record in the file is an optional per-frame header followed by
+    `words_per_frame` words stored in the smallest unsigned container for
+    `word_size`. Frame data is only copied when it must be converted, i.e. when
+    the file byte order differs from the native one.
+
+    Parameters
+    ----------
+    path
+        The recording file.
+    words_per_frame
+        The number of words in each frame.
+    word_size
+        The number of bits in each word.
+    header
+        Optional structured dtype of the per-frame header. A `time` field, and
+        optionally a `ctime` field, are read as the frame times. Integer fields
+        are interpreted as nanoseconds since the epoch.
+    byteorder
+        The byte order of the words in the file.
+    offset
+        The number of bytes to skip at the start of the file.
+    chunk_size
+        The number of frames in each FrameBatch produced by iteration.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        words_per_frame: int,
+        word_size: int,
+        header: Optional[DTypeLike] = None,
+        byteorder: Literal["<", ">", "="] = ">",
+        offset: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            msg = f"chunk_size={chunk_size!r} must be positive"
+            raise ValueError(msg)
+
+        self.path = path
+        self.words_per_frame = words_per_frame
+        self.word_size = word_size
+        self.chunk_size = chunk_size
+
+        word = np.dtype(utils.word_size_to_uint(word_size)).newbyteorder(byteorder)
+        self.header = None if header is None else np.dtype(header)
+        if self.header is None:
+            self.dtype = np.dtype((word, (words_per_frame,)))
+        else:
+            if "time" not in self.header.names:
+                msg = "the frame header must have a 'time' field"
+                raise ValueError(msg)
+            self.dtype = np.dtype(
+                [("header", self.header), ("data", word, (words_per_frame,))]
+            )
+
+        size = os.path.getsize(path) - offset
+        self.trailing_bytes = size % self.dtype.itemsize
+        num_frames = size // self.dtype.itemsize
+        if num_frames:
+            self._records = np.memmap(
+                path, dtype=self.dtype, mode="r", offset=offset, shape=(num_frames,)
+            )
+        else:
+            self._records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[FrameBatch]:
+        for start in range(0, len(self), self.chunk_size):
+            yield self.read(start, start + self.chunk_size)
+
+    def _times(self, records: np.ndarray, name: str) -> NDArray[np.datetime64]:
+        if self.header is None or name not in self.header.names:
+            return np.full(len(records), np.datetime64("NaT", "ns"))
+        values = records["header"][name]
+        if np.issubdtype(values.dtype, np.datetime64):
+            return values.astype("datetime64[ns]", copy=False)
+        return values.astype(np.int64).astype("datetime64[ns]")
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> FrameBatch:
+        """Read the frames in [start, stop) as a FrameBatch."""
+        records = self._records[start:stop]
+        if self.header is None:
+            data = records
+            ctime = time = self._times(records, "time")
+        else:
+            data = records["data"]
+            time = self._times(records, "time")
+            ctime = (
+                self._times(records, "ctime") if "ctime" in self.header.names else time
+            )
+
+        data = VarUIntArray(np.asarray(data), word_size=self.word_size)
+        return FrameBatch(ctime=ctime, time=time, data=data)
@@ -0,0 +1,236 @@
+import enum
+from dataclasses import dataclass
+from typing import Literal, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import NDArray
+
+from decom.bitstream import unpack_words
+from decom.model import FrameBatch, VarUIntArray
+
+
+class SyncState(enum.Enum):
+    SEARCH = "search"
+    VERIFY = "verify"
+    LOCK = "lock"
+
+
+@dataclass
+class SyncResult:
+    """Frames found by a FrameSynchronizer and the bit errors in each sync word."""
+
+    frames: FrameBatch
+    errors: NDArray[np.uint8]
+
+
+class FrameSynchronizer:
+    """Find fixed-length frames in an unsynchronized bitstream.
+
+    The synchronizer searches for a sync word at the start of each frame,
+    allowing up to `max_errors` bit errors. In SEARCH every bit offset is scored
+    at once by correlating the stream with the sync pattern. A candidate is
+    accepted once `verify` consecutive frames start with the sync word, after
+    which the synchronizer is in LOCK and only checks the expected positions.
+    In LOCK up to `flywheel` consecutive frames with a bad sync word are still
+    emitted before the synchronizer returns to SEARCH.
+
+    State and any unused bits are kept between calls to `process`, so a frame
+    may span several chunks. The emitted frames have NaT times.
+
+    Parameters
+    ----------
+    sync_word
+        The sync pattern.
+    sync_size
+        The number of bits in the sync pattern, at most 64.
+    words_per_frame
+        The number of words in each frame, including the sync word.
+    word_size
+        The number of bits in each word.
+    max_errors
+        The number of bit errors allowed in a sync word.
+    verify
+        The number of consecutive sync words needed to lock.
+    flywheel
+        The number of consecutive bad sync words tolerated while locked.
+    bit_order
+        The bit order of the bytes given to `process`.
+    """
+
+    def __init__(
+        self,
+        sync_word: int,
+        sync_size: int,
+        words_per_frame: int,
+        word_size: int,
+        max_errors: int = 0,
+        verify: int = 2,
+        flywheel: int = 2,
+        bit_order: Literal["msb", "lsb"] = "msb",
+    ) -> None:
+        if not 1 <= sync_size <= 64:
+            msg = f"sync_size={sync_size!r} must be between 1 and 64"
+            raise ValueError(msg)
+        if sync_size > words_per_frame * word_size:
+            msg = "the sync word cannot be larger than the frame"
+            raise ValueError(msg)
+        if verify < 1:
+            msg = f"verify={verify!r} must be at least 1"
+            raise ValueError(msg)
+
+        self.sync_word = sync_word
+        self.sync_size = sync_size
+        self.words_per_frame = words_per_frame
+        self.word_size = word_size
+        self.frame_size = words_per_frame * word_size
+        self.max_errors = max_errors
+        self.verify = verify
+        self.flywheel = flywheel
+        self.bit_order = bit_order
+
+        self._pattern = np.array(
+            [(sync_word >> i) & 1 for i in range(sync_size - 1, -1, -1)], dtype=np.uint8
+        )
+        # +1 where the pattern has a one, -1 where it has a zero
+        self._weights = 2 * self._pattern.astype(np.int32) - 1
+        self._ones = int(self._pattern.sum())
+
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = SyncState.SEARCH
+        self.misses = 0
+        self._bits = np.zeros(0, dtype=np.uint8)
+
+    def _unpack(self, chunk: Union[bytes, bytearray, memoryview, NDArray]) -> NDArray:
+        if isinstance(chunk, np.ndarray):
+            data = chunk.view(np.uint8).ravel()
+        else:
+            data = np.frombuffer(chunk, dtype=np.uint8)
+        return np.unpackbits(
+            data, bitorder="big" if self.bit_order == "msb" else "little"
+        )
+
+    def _errors_everywhere(self, bits: NDArray) -> NDArray:
+        """The number of sync bit errors at every offset where the sync word fits."""
+        if len(bits) < self.sync_size:
+            return np.zeros(0, dtype=np.int32)
+        corr = np.correlate(bits.astype(np.int32), self._weights, mode="valid")
+        # Matched ones add one to the correlation, set bits outside the pattern subtract one
+        return self._ones - corr
+
+    def _errors_at(self, bits: NDArray, position: int, count: int) -> NDArray:
+        """The number of sync bit errors in `count` frames starting at `position`."""
+        if not count:
+            return np.zeros(0, dtype=np.intp)
+        windows = sliding_window_view(bits, self.sync_size)
+        windows = windows[position :: self.frame_size][:count]
+        return np.count_nonzero(windows != self._pattern, axis=1)
+
+    def _lost_at(self, errors: NDArray) -> tuple[int, int]:
+        """The index of the frame at which sync is lost, and the misses before it.
+
+        The index is `len(errors)` if sync is kept; the misses are then those at
+        the end, to carry over to the next frames.
+        """
+        bad = errors > self.max_errors
+        position = np.arange(len(errors))
+        # The consecutive bad frames up to each one, counting earlier misses
+        last_good = np.maximum.accumulate(np.where(bad, -1, position))
+        since = position - last_good
+        misses = np.where(last_good >= 0, since, position + 1 + self.misses)
+        lost = np.flatnonzero(misses > self.flywheel)
+        if len(lost):
+            return int(lost[0]), int(misses[lost[0]])
+        return len(errors), int(misses[-1]) if len(errors) else self.misses
+
+    def _search(self, bits: NDArray) -> Union[int, None]:
+        """Find the start of the first verified frame.
+
+        Returns the offset of the frame, or None if there is none. Sets the state
+        to VERIFY and keeps only the bits from the first undecided candidate if
+        more data is needed to verify it.
+
+        The stream is correlated a block of offsets at a time, so finding sync
+        again soon after it is lost does not score the rest of the stream.
+        """
+        span = (self.verify - 1) * self.frame_size
+        block = max(8 * self.frame_size, 4096)
+        for low in range(0, len(bits) - self.sync_size + 1, block):
+            errors = self._errors_everywhere(
+                bits[low : low + block + span + self.sync_size - 1]
+            )
+            candidates = np.flatnonzero(errors[:block] <= self.max_errors)
+            for candidate in candidates:
+                # Only possible in the last block, which ends with the stream
+                if candidate + span >= len(errors):
+                    self.state = SyncState.VERIFY
+                    self._bits = bits[low + candidate :]
+                    return None
+                following = candidate + self.frame_size * np.arange(1, self.verify)
+                if np.all(errors[following] <= self.max_errors):
+                    return low + int(candidate)
+
+        self.state = SyncState.SEARCH
+        self._bits = bits[max(len(bits) - self.sync_size + 1, 0) :]
+        return None
+
+    def _frames(self, bits: NDArray, starts: NDArray) -> VarUIntArray:
+        rows = sliding_window_view(bits, self.frame_size)[starts]
+        if self.frame_size % 8 == 0:
+            return unpack_words(np.packbits(rows), self.word_size, self.words_per_frame)
+
+        rows = rows.reshape(len(starts), self.words_per_frame, self.word_size)
+        weights = np.uint64(1) << np.arange(self.word_size - 1, -1, -1, dtype=np.uint64)
+        words = np.bitwise_or.reduce(rows.astype(np.uint64) * weights, axis=2)
+        return VarUIntArray(words, word_size=self.word_size)
+
+    def process(
+        self, chunk: Union[bytes, bytearray, memoryview, NDArray]
+    ) -> SyncResult:
+        """Synchronize the next chunk of the stream.
+
+        Returns
+        -------
+        SyncResult
+            The complete frames found so far, with their sync bit errors.
+        """
+        bits = np.concatenate([self._bits, self._unpack(chunk)])
+        starts, errors = [], []
+        position = 0
+
+        while True:
+            if self.state != SyncState.LOCK:
+                found = self._search(bits[position:])
+                if found is None:
+                    break
+                position += found
+                self.state = SyncState.LOCK
+                self.misses = 0
+
+            # Check every complete frame at the expected positions at once
+            count = (len(bits) - position) // self.frame_size
+            frame_errors = self._errors_at(bits, position, count)
+            kept, self.misses = self._lost_at(frame_errors)
+            starts.append(position + self.frame_size * np.arange(kept))
+            errors.append(frame_errors[:kept])
+
+            if kept == count:
+                self._bits = bits[position + count * self.frame_size :]
+                break
+            # Search again, starting just after the lost frame's start
+            self.state = SyncState.SEARCH
+            position += kept * self.frame_size + 1
+
+        starts = np.concatenate([np.zeros(0, np.intp), *starts])
+        errors = np.concatenate([np.zeros(0, np.intp), *errors])
+        if len(starts):
+            data = self._frames(bits, starts)
+        else:
+            data = VarUIntArray(
+                np.zeros((0, self.words_per_frame)), word_size=self.word_size
+            )
+        time = np.full(len(starts), np.datetime64("NaT", "ns"))
+        frames = FrameBatch(ctime=time, time=time.copy(), data=data)
+        return SyncResult(frames=frames, errors=np.array(errors, dtype=np.uint8))
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.measurand import BasicParameter, GeneratorParameter, Parameter
+
+
+@dataclass(frozen=True)
+class SampleTiming:
+    """How long each word of a frame takes, for timing samples within a frame.
+
+    Give either the link `bit_rate`, in bits per second, or the `frame_period`,
+    in seconds, over which the words of a frame are evenly spread. A sample is
+    timed at the start of its first word: the frame time plus the column of that
+    word times the word period.
+    """
+
+    bit_rate: Optional[float] = None
+    frame_period: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if (self.bit_rate is None) == (self.frame_period is None):
+            msg = "exactly one of bit_rate and frame_period must be given"
+            raise ValueError(msg)
+
+    def word_period(self, word_size: int, words_per_frame: int) -> float:
+        """The duration of one word, in seconds."""
+        if self.bit_rate is not None:
+            return word_size / self.bit_rate
+        return self.frame_period / words_per_frame
+
+    def offsets(
+        self, columns: NDArray[np.intp], word_size: int, words_per_frame: int
+    ) -> NDArray[np.timedelta64]:
+        """The time from the start of the frame to the start of each column."""
+        seconds = np.asarray(columns) * self.word_period(word_size, words_per_frame)
+        return np.round(seconds * 1e9).astype("timedelta64[ns]")
+
+
+def sample_columns(parameter: Parameter, words_per_frame: int) -> NDArray[np.intp]:
+    """The column of the first word of each sample of `parameter` in a frame.
+
+    A 0-d array for parameters with one sample per frame, otherwise one column
+    per sample.
+    """
+    if isinstance(parameter, GeneratorParameter):
+        return parameter.sample_columns(words_per_frame)
+    if isinstance(parameter, BasicParameter):
+        return np.array(parameter.first_column(), dtype=np.intp)
+    msg = f"cannot time the samples of {type(parameter).__name__}"
+    raise TypeError(msg)
+
+
+def sample_times(
+    time: NDArray[np.datetime64],
+    parameter: Parameter,
+    timing: SampleTiming,
+    word_size: int,
+    words_per_frame: int,
+) -> NDArray[np.datetime64]:
+    """The time of every sample of `parameter`, shaped like its built values."""
+    columns = sample_columns(parameter, words_per_frame)
+    offsets = timing.offsets(columns, word_size, words_per_frame)
+    return time.reshape(-1, *[1] * offsets.ndim) + offsets
+
+
+def flatten_samples(
+    time: NDArray[np.datetime64], values: NDArray
+) -> tuple[NDArray[np.datetime64], NDArray]:
+    """Flatten (frames x samples) times and values into a time-ordered series.
+
+    The samples of each frame are put in time order, and the frames are assumed
+    to be in time order already, so the result is ordered without a full sort.
+    """
+    if values.ndim < 2:
+        return time, values
+    if len(time):
+        order = np.argsort(time[0], kind="stable")
+        if np.any(np.diff(order) != 1):
+            time, values = time[:, order], values[:, order]
+    return time.reshape(-1), values.reshape(-1)
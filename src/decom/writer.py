@@ -0,0 +1,318 @@
+"""Streaming columnar writers for decom results.
+
+Results are buffered until `buffer_rows` rows have been written and then
+appended to the output a column at a time, so memory use depends on the buffer
+size and not on the length of the recording. Columns are keyed "time", "ctime",
+"eu/<measurand>" and, when raw values are written too, "raw/<measurand>".
+Measurands sampled in only some frames also get their frame times, keyed
+"time/<measurand>", and so have fewer rows than the "time" column. So do the
+measurands output change-only, whose columns hold only the samples kept by a
+`ChangeOnly`, flattened to one value per row, and the times of those samples.
+"""
+
+import abc
+import os
+import pathlib
+import urllib.parse
+from typing import Any, BinaryIO, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from decom.delta import ChangeOnly
+from decom.plan import DecomResult
+
+try:
+    import pyarrow as pa
+    from pyarrow import ipc
+except ImportError:
+    pa = None
+
+PathLike = Union[str, os.PathLike]
+
+DEFAULT_BUFFER_ROWS = 2**16
+
+# Room for the .npy header, so it can be rewritten in place as the file grows
+_NPY_HEADER_SIZE = 128
+
+
+def result_columns(
+    result: DecomResult, raw: Optional[DecomResult] = None
+) -> dict[str, NDArray]:
+    """The columns of `result`, and optionally `raw`, under their writer keys."""
+    columns = {"time": result.time, "ctime": result.ctime}
+    columns.update({f"eu/{name}": result[name] for name in result})
+    columns.update({f"time/{name}": result.frame_time(name) for name in result.rows})
+    if raw is not None:
+        if len(raw.time) != len(result.time):
+            msg = "raw and converted results must have the same number of rows"
+            raise ValueError(msg)
+        columns.update({f"raw/{name}": raw[name] for name in raw})
+    return columns
+
+
+class ColumnWriter(abc.ABC):
+    """Buffer decom results and write them out a column at a time.
+
+    Use as a context manager, or call `close`, to write the buffered rows.
+    `rows` counts the frames written; the buffer is flushed once any column,
+    including the columns of sampled measurands, holds `buffer_rows` rows.
+
+    Parameters
+    ----------
+    buffer_rows
+        The number of rows buffered before they are written.
+    change_only
+        Write only the changes of the measurands it includes; it carries its
+        state from write to write, so results must be written in order.
+    """
+
+    def __init__(
+        self,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        change_only: Optional[ChangeOnly] = None,
+    ) -> None:
+        self.buffer_rows = buffer_rows
+        self.change_only = change_only
+        self.rows = 0
+        self._columns: Optional[dict[str, tuple[np.dtype, tuple[int, ...]]]] = None
+        self._buffer: list[dict[str, NDArray]] = []
+        self._buffered: dict[str, int] = {}
+        self._frames = 0
+
+    def __enter__(self) -> "ColumnWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, result: DecomResult, raw: Optional[DecomResult] = None) -> None:
+        """Append the rows of `result`, and of `raw` if given."""
+        columns = result_columns(result, raw)
+        if self.change_only is not None:
+            columns.update(self._changes(result, raw))
+        columns = {key: np.asarray(value) for key, value in columns.items()}
+        layout = {key: (value.dtype, value.shape[1:]) for key, value in columns.items()}
+        if self._columns is None:
+            self._columns = layout
+        elif layout != self._columns:
+            msg = "the columns, dtypes or shapes differ from the first write"
+            raise ValueError(msg)
+
+        self._buffer.append(columns)
+        self._frames += len(result.time)
+        for key, values in columns.items():
+            self._buffered[key] = self._buffered.get(key, 0) + len(values)
+        if max(self._buffered.values()) >= self.buffer_rows:
+            self.flush()
+
+    def _changes(
+        self, result: DecomResult, raw: Optional[DecomResult]
+    ) -> dict[str, NDArray]:
+        """The columns of the measurands output change-only."""
+        columns = {}
+        for name in result:
+            if self.change_only.includes(name):
+                time, values = result.series(name)
+                keep = self.change_only.select(name, values)
+                columns[f"time/{name}"] = time[keep]
+                columns[f"eu/{name}"] = values[keep]
+                if raw is not None:
+                    columns[f"raw/{name}"] = raw.series(name)[1][keep]
+        return columns
+
+    def flush(self) -> None:
+        """Write the buffered rows."""
+        if not self._buffer:
+            return
+        columns = {
+            key: np.concatenate([chunk[key] for chunk in self._buffer])
+            for key in self._columns
+        }
+        self._write(columns)
+        self.rows += self._frames
+        self._buffer, self._buffered, self._frames = [], {}, 0
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    @abc.abstractmethod
+    def _write(self, columns: dict[str, NDArray]) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+class _NpyColumn:
+    """A .npy file whose header is rewritten as rows are appended.
+
+    The file is only open while rows are appended, so a writer with thousands
+    of columns does not hold thousands of file descriptors.
+    """
+
+    def __init__(self, path: pathlib.Path, dtype: np.dtype, shape: tuple[int, ...]):
+        self.path = path
+        self.dtype = dtype
+        self.shape = shape
+        self.rows = 0
+        with open(path, "wb") as file:
+            self._write_header(file)
+
+    def _write_header(self, file: BinaryIO) -> None:
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": False,
+                "shape": (self.rows, *self.shape),
+            }
+        )
+        size = _NPY_HEADER_SIZE - len(np.lib.format.MAGIC_PREFIX) - 4
+        if len(header) >= size:
+            msg = f"the header of {self.path} does not fit in {_NPY_HEADER_SIZE} bytes"
+            raise ValueError(msg)
+        file.seek(0)
+        file.write(np.lib.format.MAGIC_PREFIX + bytes([1, 0]))
+        file.write(size.to_bytes(2, "little"))
+        file.write(header.ljust(size - 1).encode("latin1") + b"\n")
+
+    def append(self, values: NDArray) -> None:
+        with open(self.path, "r+b") as file:
+            file.seek(0, os.SEEK_END)
+            file.write(np.ascontiguousarray(values).tobytes())
+            self.rows += len(values)
+            self._write_header(file)
+
+
+class NpyDirectoryWriter(ColumnWriter):
+    """Write each column to its own .npy file in a directory.
+
+    The files are valid .npy files after every flush, so they can be opened with
+    `np.load(..., mmap_mode="r")`, or all at once with `read_npy_directory`,
+    while the recording is still being written.
+
+    Parameters
+    ----------
+    directory
+        The output directory; it is created if needed.
+    buffer_rows
+        The number of rows buffered before they are written.
+    change_only
+        Write only the changes of the measurands it includes.
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        change_only: Optional[ChangeOnly] = None,
+    ) -> None:
+        super().__init__(buffer_rows, change_only)
+        self.directory = pathlib.Path(directory)
+        self._files: dict[str, _NpyColumn] = {}
+
+    def path(self, key: str) -> pathlib.Path:
+        """The file holding column `key`."""
+        kind, sep, name = key.partition("/")
+        if not sep:
+            return self.directory / f"{key}.npy"
+        return self.directory / kind / (urllib.parse.quote(name, safe="") + ".npy")
+
+    def _write(self, columns: dict[str, NDArray]) -> None:
+        for key, values in columns.items():
+            if key not in self._files:
+                path = self.path(key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._files[key] = _NpyColumn(path, values.dtype, values.shape[1:])
+            self._files[key].append(values)
+
+
+def read_npy_directory(
+    directory: PathLike, mmap_mode: Optional[str] = "r"
+) -> dict[str, NDArray]:
+    """Open every column written by an `NpyDirectoryWriter`, memory-mapped by default."""
+    directory = pathlib.Path(directory)
+    columns = {}
+    for path in sorted(directory.rglob("*.npy")):
+        relative = path.relative_to(directory)
+        name = urllib.parse.unquote(relative.name[: -len(".npy")])
+        key = "/".join([*relative.parent.parts, name])
+        columns[key] = np.load(path, mmap_mode=mmap_mode)
+    return columns
+
+
+class ArrowWriter(ColumnWriter):
+    """Write the columns as record batches of Arrow IPC files.
+
+    Requires pyarrow. Multi-dimensional columns, e.g. supercommutated
+    measurands, are stored as fixed-size lists. The files can be memory-mapped
+    with `pyarrow.memory_map` and `pyarrow.ipc.open_file`.
+
+    The columns with a row per frame go to `path`. A record batch needs columns
+    of equal length, so each measurand with its own times (see `series_path`)
+    gets a file of its own, with "time", "eu" and, if written, "raw" columns.
+
+    Parameters
+    ----------
+    path
+        The output file.
+    buffer_rows
+        The number of rows in each record batch.
+    change_only
+        Write only the changes of the measurands it includes.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        change_only: Optional[ChangeOnly] = None,
+    ) -> None:
+        if pa is None:
+            msg = "ArrowWriter requires pyarrow; install it with `pip install pyarrow`"
+            raise ImportError(msg)
+        super().__init__(buffer_rows, change_only)
+        self.path = pathlib.Path(path)
+        self._files: dict[Optional[str], tuple[Any, Any]] = {}
+
+    def series_path(self, name: str) -> pathlib.Path:
+        """The file holding measurand `name`, if it has times of its own."""
+        quoted = urllib.parse.quote(name, safe="")
+        return self.path.with_name(f"{self.path.stem}.{quoted}{self.path.suffix}")
+
+    @staticmethod
+    def _array(values: NDArray) -> "pa.Array":
+        if values.ndim == 1:
+            return pa.array(values)
+        width = int(np.prod(values.shape[1:]))
+        flat = pa.array(np.ascontiguousarray(values).reshape(-1))
+        return pa.FixedSizeListArray.from_arrays(flat, width)
+
+    def _write(self, columns: dict[str, NDArray]) -> None:
+        # Group the columns by file: None for the frames, else the measurand
+        series = {key[len("time/") :] for key in columns if key.startswith("time/")}
+        groups: dict[Optional[str], dict[str, NDArray]] = {None: {}}
+        groups.update({name: {"time": columns[f"time/{name}"]} for name in series})
+        for key, values in columns.items():
+            kind, _, name = key.partition("/")
+            if name in series:
+                groups[name][kind] = values
+            else:
+                groups[None][key] = values
+
+        for name, group in groups.items():
+            batch = pa.RecordBatch.from_arrays(
+                [self._array(values) for values in group.values()], names=list(group)
+            )
+            if name not in self._files:
+                path = self.path if name is None else self.series_path(name)
+                sink = pa.OSFile(str(path), "wb")
+                self._files[name] = (sink, ipc.new_file(sink, batch.schema))
+            self._files[name][1].write_batch(batch)
+
+    def _close(self) -> None:
+        for sink, writer in self._files.values():
+            writer.close()
+            sink.close()
+        self._files.clear()
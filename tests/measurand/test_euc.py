@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 from decom.measurand import EUC
+from decom.parsers import calculator_parser
 
 
 @pytest.mark.parametrize(
@@ -38,3 +39,33 @@ def test_euc_callable(euc: EUC, pv: float, expected: float):
     out = euc.apply(a)
     assert len(out) == num_rows
     assert out.tolist() == pytest.approx([expected] * num_rows)
+
+
+@pytest.mark.parametrize(
+    "text, func",
+    [
+        ("PV/2", lambda pv: pv / 2),
+        ("sin(PV)", lambda pv: math.sin(pv)),
+        ("if(PV-4,PV,0)", lambda pv: pv if pv > 4 else 0),
+    ],
+)
+def test_euc_expression(text: str, func: callable):
+    euc = EUC(scale_factor=calculator_parser.parse(text), scaled_bias=1)
+    assert not isinstance(euc.scale_factor, np.vectorize)
+    a = np.arange(10, dtype="uint8")
+    out = euc.apply(a)
+    assert out.tolist() == pytest.approx([func(pv) + 1 for pv in range(10)])
+
+
+@pytest.mark.parametrize(
+    "euc, coefficients",
+    [
+        (EUC(scale_factor=2), (0, 2)),
+        (EUC(data_bias=1, scale_factor=2, scaled_bias=3), (1, 2)),
+        (EUC(scale_factor=calculator_parser.parse("PV**2"), data_bias=1), (1, -2, 1)),
+        (EUC(scale_factor=calculator_parser.parse("sin(PV)")), None),
+        (EUC(scale_factor=lambda pv: pv), None),
+    ],
+)
+def test_euc_polynomial(euc: EUC, coefficients: tuple):
+    assert euc._polynomial == coefficients
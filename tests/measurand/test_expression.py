@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+import pytest
+
+from decom.measurand.expression import (
+    Apply,
+    Constant,
+    Polynomial,
+    Program,
+    Variable,
+    optimize,
+    to_polynomial,
+)
+from decom.parsers import calculator_parser
+
+
+@pytest.mark.parametrize(
+    "text, coefficients",
+    [
+        ("(PV*2)*3+1-1", (0, 6)),
+        ("PV/4+1", (1, 0.25)),
+        ("-PV", (0, -1)),
+        ("(PV+1)**2", (1, 2, 1)),
+        ("PV*PV*PV-PV", (0, -1, 0, 1)),
+        ("2*(PV-3)", (-6, 2)),
+    ],
+)
+def test_to_polynomial(text: str, coefficients: tuple):
+    node = calculator_parser.parse(text)
+    assert to_polynomial(node) == pytest.approx(coefficients)
+
+
+@pytest.mark.parametrize(
+    "text", ["sin(PV)", "1/PV", "PV**0.5", "PV**PV", "PV**9", "PV/49", "(PV+1)/7"]
+)
+def test_not_polynomial(text: str):
+    node = calculator_parser.parse(text)
+    assert to_polynomial(node) is None
+
+
+@pytest.mark.parametrize(
+    "text, expect",
+    [
+        ("(PV*2)*3+1-1", Polynomial((0, 6))),
+        ("(PV+0)*1", Variable()),
+        ("float(PV)/1", Variable()),
+        ("--PV", Variable()),
+        ("sin(PV*1)", Apply("sin", (Variable(),))),
+    ],
+)
+def test_optimize(text: str, expect):
+    assert calculator_parser.parse(text) == expect
+
+
+def test_common_subexpressions():
+    node = calculator_parser.parse("sin(PV)*sin(PV)+cos(PV)*cos(PV)")
+    assert isinstance(node, Program)
+    # PV, sin, mul, cos, mul, add
+    assert len(node.steps) == 6
+    pv = np.linspace(0, 10, 101)
+    assert node(pv).tolist() == pytest.approx([1.0] * len(pv))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "(PV*2)*3+1-1",
+        "PV**3/7-PV+2",
+        "if(PV-3,sqrt(PV*2+1),PV/4)",
+        "max(PV,2*PV-5)+min(3,PV)",
+        "sin(PV)*sin(PV)+PV",
+    ],
+)
+def test_optimize_matches_reference(text: str):
+    node = calculator_parser.parse(text)
+    pv = np.arange(20)
+    assert node(pv).tolist() == pytest.approx([node.reference(x) for x in range(20)])
+
+
+def test_optimize_number():
+    assert optimize(1.5) == 1.5
+    assert optimize(Apply("mul", (Variable(), Apply("neg", (Variable(),))))) == (
+        Polynomial((0, 0, -1))
+    )
+    assert calculator_parser.parse("PV**0") == Constant(1)
+
+
+@pytest.mark.parametrize("text", ["PV-PV", "PV*0+2", "(PV+1)-PV"])
+def test_no_cancellation(text: str):
+    node = calculator_parser.parse(text)
+    assert callable(node)
+    pv = np.array([1.0, np.inf, np.nan])
+    expected = [node.reference(x) for x in pv.tolist()]
+    np.testing.assert_array_equal(node(pv), expected)
+    assert np.isnan(expected[1:]).all()
+
+
+def test_common_polynomial_subexpressions():
+    node = calculator_parser.parse("sin(PV*2+1)+cos(PV*2+1)")
+    assert isinstance(node, Program)
+    # poly, sin, cos, add
+    assert len(node.steps) == 4
+    pv = np.linspace(0, 10, 11)
+    np.testing.assert_allclose(node(pv), np.sin(pv * 2 + 1) + np.cos(pv * 2 + 1))
+
+
+@pytest.mark.parametrize(
+    "text, reference",
+    [
+        ("floor(PV/49)", lambda pv: math.floor(pv / 49)),
+        ("floor((PV+1)/7)", lambda pv: math.floor((pv + 1) / 7)),
+        ("floor(PV*3/10)", lambda pv: math.floor(pv * 3 / 10)),
+    ],
+)
+def test_division_is_exact(text: str, reference):
+    node = calculator_parser.parse(text)
+    pv = np.arange(1001)
+    expected = [reference(x) for x in range(1001)]
+    assert node(pv).tolist() == expected
+    assert [node.reference(x) for x in range(1001)] == expected
+
+
+def test_division_at_multiples():
+    assert calculator_parser.parse("floor(PV/49)")(np.array([49])).tolist() == [1]
+    assert calculator_parser.parse("floor((PV+1)/7)").reference(13) == 2
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from decom.measurand import Interp
@@ -48,3 +49,67 @@ def test_2c(word_size: int, input_: int, expected: int):
     data = VarUIntArray([[input_]] * NUM_FRAMES, word_size=word_size)
     out = interp.apply(data)
     assert out.tolist() == [[expected]] * NUM_FRAMES
+
+
+@pytest.mark.parametrize(
+    "word_size, input_, expected",
+    [
+        (3, 0, 0),
+        (3, 3, 3),
+        (3, 4, 0),
+        (3, 5, -1),
+        (3, 7, -3),
+        (8, 127, 127),
+        (8, 128, 0),
+        (8, 129, -1),
+        (8, 255, -127),
+        (16, 0x8001, -1),
+    ],
+)
+def test_sm(word_size: int, input_: int, expected: int):
+    interp = Interp("sm")
+    data = VarUIntArray([[input_]] * NUM_FRAMES, word_size=word_size)
+    out = interp.apply(data)
+    assert out.tolist() == [[expected]] * NUM_FRAMES
+
+
+@pytest.mark.parametrize(
+    "mode, word_size, input_, expected",
+    [
+        ("ieee32", 32, 0x3F800000, 1.0),
+        ("ieee32", 32, 0xC0000000, -2.0),
+        ("ieee64", 64, 0x3FF8000000000000, 1.5),
+        ("1750a32", 32, 0x40000000, 0.5),
+        ("1750a32", 32, 0x40000001, 1.0),
+        ("1750a48", 48, 0x400000000000, 0.5),
+        ("ti32", 32, 0x00000000, 1.0),
+        ("ti32", 32, 0x01000000, 2.0),
+        ("ti40", 40, 0x0000000000, 1.0),
+    ],
+)
+def test_float(mode: str, word_size: int, input_: int, expected: float):
+    interp = Interp(mode)
+    data = VarUIntArray([[input_]] * NUM_FRAMES, word_size=word_size)
+    out = interp.apply(data)
+    assert out.shape == data.shape
+    assert out.tolist() == [[pytest.approx(expected)]] * NUM_FRAMES
+
+
+@pytest.mark.parametrize("mode", ["ieee32", "ieee64"])
+def test_ieee_zero_copy(mode: str):
+    word_size = 32 if mode == "ieee32" else 64
+    data = VarUIntArray([[0]] * NUM_FRAMES, word_size=word_size)
+    out = Interp(mode).apply(data)
+    assert np.shares_memory(out, data)
+
+
+@pytest.mark.parametrize("mode", ["ieee32", "1750a48", "ti40"])
+def test_float_word_size(mode: str):
+    data = VarUIntArray([[0]] * NUM_FRAMES, word_size=16)
+    with pytest.raises(ValueError):
+        Interp(mode).apply(data)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Interp("xyz")
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from decom.measurand import EUC, Measurand
+from decom.measurand.lut import LUT_CACHE, LookupTableCache
+from decom.parsers import calculator_parser, measurand_parser, parameter_parser
+
+from ..conftest import SAMPLE_DATA
+
+
+@pytest.mark.parametrize(
+    "text, word_size",
+    [
+        ("[1];u", 8),
+        ("[255];2c", 8),
+        ("[1+2];u;[PV/2, 1]", 8),
+        ("[200];2c;[sin(PV)*2]", 8),
+        ("[300:1-4+301];u;[if(PV-100,log(PV),0)]", 10),
+        ("[1]++32;2c;[PV*2]", 8),
+    ],
+)
+def test_measurand_lut(text: str, word_size: int):
+    measurand = measurand_parser.parse(text)
+    data = SAMPLE_DATA[word_size]
+    expected = measurand.build(data)
+
+    measurand.lut_bits = 16
+    out = measurand.build(data)
+    assert out.shape == expected.shape
+    np.testing.assert_allclose(out, expected)
+
+
+def test_measurand_lut_threshold():
+    LUT_CACHE.clear()
+    measurand = Measurand(
+        parameter_parser.parse("[1+2]"),
+        interp="u",
+        euc=EUC(scale_factor=calculator_parser.parse("sqrt(PV)")),
+        lut_bits=8,
+    )
+    measurand.build(SAMPLE_DATA[8])
+    assert len(LUT_CACHE) == 0
+
+    measurand.lut_bits = 16
+    measurand.build(SAMPLE_DATA[8])
+    assert len(LUT_CACHE) == 1
+
+    # The table is shared with other measurands performing the same conversion
+    other = Measurand(parameter_parser.parse("[3+4]"), "u", measurand.euc, lut_bits=16)
+    other.build(SAMPLE_DATA[8])
+    assert len(LUT_CACHE) == 1
+
+
+def test_measurand_lut_bits_limit():
+    parameter = parameter_parser.parse("[1+2+3+4]")
+    with pytest.raises(ValueError):
+        Measurand(parameter, lut_bits=32)
+    Measurand(parameter, lut_bits=24, max_lut_bits=24)
+
+    measurand = Measurand(parameter, lut_bits=16)
+    measurand.lut_bits = 32
+    with pytest.raises(ValueError):
+        measurand.build(SAMPLE_DATA[8])
+
+
+def test_measurand_interp_cached():
+    measurand = Measurand(parameter_parser.parse("[1]"), interp="2c")
+    assert measurand._interp() is measurand._interp()
+    measurand.interp = "u"
+    assert measurand._interp().mode == "u"
+
+
+def test_lut_cache_eviction():
+    cache = LookupTableCache(max_bytes=3 * 800)
+    for key in range(3):
+        cache.get(key, lambda: np.zeros(100))
+    assert len(cache) == 3
+
+    cache.get(0, lambda: np.zeros(100))
+    cache.get(3, lambda: np.zeros(100))
+    assert len(cache) == 3
+    assert 0 in cache
+    assert 1 not in cache
+    assert cache.nbytes == 3 * 800
+
+    cache.get(4, lambda: np.zeros(1000))
+    assert 4 not in cache
+    assert cache.nbytes <= cache.max_bytes
@@ -1,3 +1,5 @@
+import copy
+
 import numpy as np
 import pytest
 
@@ -7,6 +9,7 @@ from decom.measurand import (
     GeneratorParameter,
     SupercomParameter,
 )
+from decom.model import VarUIntArray
 from decom.parsers import parameter_parser
 
 from ..conftest import NUM_FRAMES, SAMPLE_DATA
@@ -125,3 +128,127 @@ def test_supercom_parameter(word_size: int, text: str, num_cols: int, range_: ra
 
     expected = np.array([[x for x in range_]] * NUM_FRAMES)
     assert result.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize(
+    "word_size, text",
+    [
+        (8, "[1+2]++2<17"),
+        (8, "[~1:1-4+xA]++3<40"),
+        (10, "[(1-2R)++4]"),
+        (8, "[64+63]--8"),
+    ],
+)
+def test_generator_parameter_matches_offsets(word_size: int, text: str):
+    gp = parameter_parser.parse(text)
+    data = SAMPLE_DATA[word_size]
+    result = gp.build(data)
+
+    if gp.iterator.step > 0:
+        start = gp.parameter.max_word()
+    else:
+        start = gp.parameter.min_word()
+    stop = gp.iterator.stop if gp.iterator.stop is not None else data.shape[1]
+    expected = [
+        gp.parameter.build(data, offset=target - start).tolist()
+        for target in range(start, stop, gp.iterator.step)
+    ]
+
+    assert result.flags.c_contiguous
+    assert result.word_size == gp.parameter.build(data).word_size
+    assert result.T.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "word_size, text",
+    [
+        (8, "[1]"),
+        (8, "[1+2]"),
+        (8, "[255:1-4+255]"),
+        (8, "[170R+85]"),
+        (8, "[~5-6]"),
+        (8, "[3:5-8R+xF]"),
+        (8, "[200] XOR xFF"),
+        (8, "[1:1,3,5,7+2]"),
+        (10, "[~1:2-3,7-8R]"),
+        (10, "[1-3R]"),
+        (12, "[1000:9-12]"),
+        (12, "[1001:1-3,9-12+xA]"),
+    ],
+)
+def test_parameter_kernel(word_size: int, text: str):
+    param = parameter_parser.parse(text)
+    data = SAMPLE_DATA[word_size]
+    expected = param.build(data)
+
+    kernel = param.compile(word_size)
+    out, work = kernel.allocate(NUM_FRAMES)
+    for _ in range(2):
+        result = kernel(data, out=out, work=work)
+        assert np.shares_memory(result, out)
+        assert result.word_size == expected.word_size
+        assert result.tolist() == expected.tolist()
+
+    assert kernel(data).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize(
+    "word_size, text",
+    [
+        (8, "[2+~1:1,3,5-7R]"),
+        (8, "[1:1,3,5,7R+2:2,4-6]"),
+        (10, "[1:1-2,5-6R+~2:3,9-10R]"),
+        (12, "[3+1:1-3,6,9-12R]"),
+    ],
+)
+def test_parameter_kernel_ranges(word_size: int, text: str):
+    rng = np.random.default_rng(0)
+    raw = rng.integers(0, 2**word_size, size=(100, 4))
+    data = VarUIntArray(raw, word_size=word_size)
+    param = parameter_parser.parse(text)
+    kernel = param.compile(word_size)
+    out, work = kernel.allocate(len(data))
+    assert kernel(data, out=out, work=work).tolist() == param.build(data).tolist()
+
+
+def test_parameter_kernel_buffers():
+    kernel = parameter_parser.parse("[1+2]").compile(8)
+    with pytest.raises(ValueError):
+        kernel(SAMPLE_DATA[8], out=np.empty(NUM_FRAMES, dtype="uint8"))
+    with pytest.raises(ValueError):
+        kernel(SAMPLE_DATA[10])
+
+
+@pytest.mark.parametrize(
+    "bits, value, expected",
+    [
+        ([1, 3, 5, 7], 0b10110101, 0b0111),
+        ([2, 3, 7, 8], 0b10110101, 0b1010),
+    ],
+)
+def test_fragment_word_noncontiguous_bits(bits: list[int], value: int, expected: int):
+    data = VarUIntArray([[value]] * NUM_FRAMES, word_size=8)
+    out = FragmentWord(word=1, bits=bits).build(data)
+    assert out.tolist() == [expected] * NUM_FRAMES
+
+
+@pytest.mark.parametrize("text", ["[1:1-4+2]", "[(1+2)++2<16]", "[1]++4"])
+def test_parameter_build_does_not_mutate(text: str):
+    param = parameter_parser.parse(text)
+    before = copy.deepcopy(param)
+    param.build(SAMPLE_DATA[8])
+    param.build(SAMPLE_DATA[10])
+    assert repr(param) == repr(before)
+
+
+@pytest.mark.parametrize("text", ["[1:1-4+2]", "[(1+2)++2<16]"])
+def test_parameter_bind(text: str):
+    param = parameter_parser.parse(text)
+    bound = param.bind(8)
+    assert bound is not param
+    assert repr(param) == repr(parameter_parser.parse(text))
+    assert bound.build(SAMPLE_DATA[8]).tolist() == param.build(SAMPLE_DATA[8]).tolist()
+    with pytest.raises(ValueError):
+        bound.build(SAMPLE_DATA[10])
+    with pytest.raises(ValueError):
+        bound.bind(10)
@@ -0,0 +1,65 @@
+import pytest
+
+from decom.measurand import FrameSelector, MinorFrameOffset, MinorFrameValue
+
+COUNTER = [2, 3, 0, 1, 2, 3, 0, 1, 2, 3]
+
+
+def test_offsets_from_decreasing_counter():
+    selector = FrameSelector(COUNTER)
+    assert selector.offsets.tolist() == [-1, -1, 0, 1, 2, 3, 0, 1, 2, 3]
+
+
+def test_offsets_from_first_frame():
+    selector = FrameSelector([0, 1, 2, 3, 0, 1, 2, 3])
+    assert selector.offsets.tolist() == [0, 1, 2, 3, 0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("reset", [None, 0])
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_offsets_across_batches(reset, size: int):
+    expected = FrameSelector(COUNTER, reset).offsets.tolist()
+    offsets, state = [], None
+    for start in range(0, len(COUNTER), size):
+        selector = FrameSelector(COUNTER[start : start + size], reset, state)
+        offsets.extend(selector.offsets.tolist())
+        state = selector.next_state()
+    assert offsets == expected
+
+
+def test_offsets_from_reset_value():
+    selector = FrameSelector([5, 0, 1, 1, 2, 0, 1], reset=1)
+    assert selector.offsets.tolist() == [-1, -1, 0, 0, 1, 2, 0]
+
+
+@pytest.mark.parametrize(
+    "strategy, rows",
+    [
+        (MinorFrameValue(2), [0, 4, 8]),
+        (MinorFrameValue(1, 2), [1, 3, 5, 7, 9]),
+        (MinorFrameValue(0, 1, 2), [2, 3, 6, 7]),
+        (MinorFrameOffset(0), [2, 6]),
+        (MinorFrameOffset(1, 2), [3, 5, 7, 9]),
+        (MinorFrameOffset(0, 1, 1), [2, 6]),
+    ],
+)
+def test_rows(strategy, rows):
+    assert FrameSelector(COUNTER).rows(strategy).tolist() == rows
+
+
+def test_rows_shared_between_equal_strategies():
+    selector = FrameSelector(COUNTER)
+    assert selector.rows(MinorFrameOffset(1, 2)) is selector.rows(
+        MinorFrameOffset(1, 2)
+    )
+    assert MinorFrameValue(1) != MinorFrameOffset(1)
+
+
+def test_strategy_str():
+    assert str(MinorFrameOffset(2, 2)) == "mfo(2++2)"
+    assert str(MinorFrameValue(1, 4, 16)) == "mfv(1++4<16)"
+
+
+def test_strategy_step_must_be_positive():
+    with pytest.raises(ValueError):
+        MinorFrameValue(1, 0)
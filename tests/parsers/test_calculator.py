@@ -1,5 +1,6 @@
 import math
 
+import numpy as np
 import pytest
 
 from decom.parsers import calculator_parser
@@ -53,51 +54,76 @@ def test_parser(text: str, expect: float):
     assert value == pytest.approx(expect)
 
 
-@pytest.mark.parametrize(
-    "text, func",
-    [
-        ("sin(PV)", lambda pv: math.sin(pv)),
-        ("PV*1.0", lambda pv: pv * 1.0),
-        ("-PV", lambda pv: -pv),
-        ("PV * 1e3", lambda pv: pv * 1e3),
-        ("PV*1e-3", lambda pv: pv * 1e-3),
-        ("PV-1e3", lambda pv: pv - 1e3),
-        ("PV*2**16", lambda pv: pv * 2**16),
-        ("1/2*PV", lambda pv: pv / 2),
-        ("PV/2**16", lambda pv: pv / 2**16),
-        ("(1+2)*3*PV", lambda pv: pv * 9),
-        ("E*PV", lambda pv: pv * math.e),
-        ("PI*PV", lambda pv: pv * math.pi),
-        ("float(PV)", lambda pv: pv),
-        ("fix(PV/3)", lambda pv: math.floor(pv / 3)),
-        ("round(PV/3)", lambda pv: round(pv / 3)),
-        ("floor(PV/2)", lambda pv: math.floor(pv / 2)),
-        ("ceil(PV/2)", lambda pv: math.ceil(pv / 2)),
-        ("nxtwo(PV+1.5)", lambda pv: 2 ** math.ceil(math.log(pv + 1.5) / math.log(2))),
-        ("PV*sin(PI/2)", lambda pv: pv),
-        ("PV*cos(PI/2)", lambda pv: pv * 0),
-        ("PV*tan(PI/4)", lambda pv: pv * 1),
-        ("asin(1)/(PV+100)", lambda pv: math.pi / 2 / (pv + 100)),
-        ("PV*acos(0)", lambda pv: pv * math.pi / 2),
-        ("PV*atan(1)", lambda pv: pv * math.pi / 4),
-        ("PV*atan2(1e-9,0)", lambda pv: pv * math.pi / 2),
-        ("atan2(PV,sqrt(3)/2)", lambda pv: math.atan2(pv, math.sqrt(3) / 2)),
-        ("deg(PV)", lambda pv: 180 / math.pi * pv),
-        ("rad(PV)", lambda pv: pv * math.pi / 180),
-        ("abs(PV)", lambda pv: abs(pv)),
-        ("abs(-PV)", lambda pv: abs(-pv)),
-        ("exp(PV)", lambda pv: math.e**pv),
-        ("tento(PV)", lambda pv: 10**pv),
-        ("ln(PV+1)", lambda pv: math.log(pv + 1)),
-        ("log(PV+1)", lambda pv: math.log10(pv + 1)),
-        ("PV*sqrt(4)", lambda pv: pv * 2),
-        ("if(0,PV,1)", lambda pv: 1),
-        ("if(1,PV,0)", lambda pv: pv),
-    ],
-)
+CALLABLES = [
+    ("sin(PV)", lambda pv: math.sin(pv)),
+    ("PV*1.0", lambda pv: pv * 1.0),
+    ("-PV", lambda pv: -pv),
+    ("PV * 1e3", lambda pv: pv * 1e3),
+    ("PV*1e-3", lambda pv: pv * 1e-3),
+    ("PV-1e3", lambda pv: pv - 1e3),
+    ("PV*2**16", lambda pv: pv * 2**16),
+    ("1/2*PV", lambda pv: pv / 2),
+    ("PV/2**16", lambda pv: pv / 2**16),
+    ("(1+2)*3*PV", lambda pv: pv * 9),
+    ("E*PV", lambda pv: pv * math.e),
+    ("PI*PV", lambda pv: pv * math.pi),
+    ("float(PV)", lambda pv: pv),
+    ("fix(PV/3)", lambda pv: math.floor(pv / 3)),
+    ("round(PV/3)", lambda pv: round(pv / 3)),
+    ("floor(PV/2)", lambda pv: math.floor(pv / 2)),
+    ("ceil(PV/2)", lambda pv: math.ceil(pv / 2)),
+    ("nxtwo(PV+1.5)", lambda pv: 2 ** math.ceil(math.log(pv + 1.5) / math.log(2))),
+    ("PV*sin(PI/2)", lambda pv: pv),
+    ("PV*cos(PI/2)", lambda pv: pv * 0),
+    ("PV*tan(PI/4)", lambda pv: pv * 1),
+    ("asin(1)/(PV+100)", lambda pv: math.pi / 2 / (pv + 100)),
+    ("PV*acos(0)", lambda pv: pv * math.pi / 2),
+    ("PV*atan(1)", lambda pv: pv * math.pi / 4),
+    ("PV*atan2(1e-9,0)", lambda pv: pv * math.pi / 2),
+    ("atan2(PV,sqrt(3)/2)", lambda pv: math.atan2(pv, math.sqrt(3) / 2)),
+    ("deg(PV)", lambda pv: 180 / math.pi * pv),
+    ("rad(PV)", lambda pv: pv * math.pi / 180),
+    ("abs(PV)", lambda pv: abs(pv)),
+    ("abs(-PV)", lambda pv: abs(-pv)),
+    ("exp(PV)", lambda pv: math.e**pv),
+    ("tento(PV)", lambda pv: 10**pv),
+    ("ln(PV+1)", lambda pv: math.log(pv + 1)),
+    ("log(PV+1)", lambda pv: math.log10(pv + 1)),
+    ("PV*sqrt(4)", lambda pv: pv * 2),
+    ("if(0,PV,1)", lambda pv: 1),
+    ("if(1,PV,0)", lambda pv: pv),
+    ("if(PV-5,PV,-PV)", lambda pv: pv if pv > 5 else -pv),
+    ("max(PV,3,PV/2)", lambda pv: max(pv, 3, pv / 2)),
+    ("min(PV,3,PV/2)", lambda pv: min(pv, 3, pv / 2)),
+    ("hamdist(PV,5)", lambda pv: f"{pv ^ 5:b}".count("1")),
+    ("nxtwo(PV+1)", lambda pv: 2 ** math.ceil(math.log(pv + 1, 2))),
+]
+
+
+@pytest.mark.parametrize("pv", [2.5, np.array([1.0, 2.5]), np.array([np.nan])])
+def test_hamdist_requires_integers(pv):
+    node = calculator_parser.parse("hamdist(PV,5)")
+    with pytest.raises(TypeError):
+        node(pv)
+    with pytest.raises(TypeError):
+        node.reference(2.5)
+
+
+@pytest.mark.parametrize("text, func", CALLABLES)
 def test_callable_parser(text: str, func: callable):
     print(f"text = {text!r}")
     out = calculator_parser.parse(text)
     for pv in range(10):
         print(f"pv = {pv} --> func(pv) = {func(pv)} =?= out(pv) = {out(pv)}")
         assert func(pv) == pytest.approx(out(pv))
+
+
+@pytest.mark.parametrize("text, func", CALLABLES)
+def test_vectorized_parser(text: str, func: callable):
+    out = calculator_parser.parse(text)
+    pv = np.arange(10)
+    result = out(pv)
+    assert isinstance(result, np.ndarray)
+    assert result.shape == pv.shape
+    assert result.tolist() == pytest.approx([func(x) for x in range(10)])
+    assert result.tolist() == pytest.approx([out.reference(x) for x in range(10)])
@@ -1,14 +1,51 @@
-# import pathlib
+import pathlib
 
-# import pytest
+import pytest
 
-# from decom.parsers import decom_parser
+from decom.database import Database
+from decom.measurand import Measurand, MinorFrameValue
+from decom.parsers import decom_parser
 
-# decom_files = list(pathlib.Path("tests/scripts/").glob("*.decom"))
+decom_files = list(pathlib.Path("tests/scripts/").glob("*.decom"))
 
 
-# @pytest.mark.parametrize("decom_file", decom_files)
-# def test_lark(decom_file: pathlib.Path):
-#     text = decom_file.read_text()
-#     tree = decom_parser.parse(text)
-#     assert tree
+@pytest.mark.parametrize("decom_file", decom_files)
+def test_lark(decom_file: pathlib.Path):
+    text = decom_file.read_text()
+    database = decom_parser.parse(text)
+    assert isinstance(database, Database)
+    assert all(isinstance(m, Measurand) for m in database.measurands.values())
+
+
+def test_decom_values():
+    text = pathlib.Path("tests/scripts/includes.decom").read_text()
+    database = decom_parser.parse(text)
+    assert database.includes == ["/absolute/path.decom", "./relative/path.decom"]
+    assert list(database) == ["B1", "parent.B7", "Ch4"]
+    assert list(database.uselist("parent")) == ["Ch4"]
+    assert database.functions["parent2.parent1"].function == "function_b"
+    assert database.functions["parent1"].args == ["-arg", "val", "-arg", "val"]
+
+
+def test_decom_include_comment():
+    database = decom_parser.parse("INCLUDE = sub/a.decom  # note\nX = [1]\n")
+    assert database.includes == ["sub/a.decom"]
+
+
+def test_decom_interps():
+    text = pathlib.Path("tests/scripts/interps.decom").read_text()
+    database = decom_parser.parse(text)
+    assert database["u1"].interp is None
+    assert database["i2"].interp == "2c"
+    assert database["interp_ieee64"].interp == "ieee64"
+
+
+def test_decom_directive_and_filter():
+    database = decom_parser.parse("DIRECTIVE_ONE = abc\nX=mfv(2++4<16)[1]")
+    assert database.directives == {"directive_one": "abc"}
+    assert database["X"].ss == MinorFrameValue(2, 4, 16)
+
+
+def test_decom_duplicate_name():
+    with pytest.raises(ValueError, match="more than once"):
+        decom_parser.parse("X = [1]\nX = [2]\n")
@@ -115,3 +115,16 @@ def test_parameters_ne(text: str):
         print(b.strip())
         b = parameter_parser.parse(b.strip())
         assert a != b
+
+
+def test_parsers_built_lazily():
+    import decom.parsers
+    from decom.parsers import parsers as compat
+
+    assert decom.parsers.get_parser("parameter_parser") is parameter_parser
+    assert compat.parameter_parser is parameter_parser
+    assert "decom_parser" in dir(decom.parsers)
+    with pytest.raises(ValueError):
+        decom.parsers.get_parser("nope")
+    with pytest.raises(AttributeError):
+        decom.parsers.nope
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from decom.alarms import AlarmEngine
+from decom.measurand import AlarmLevel, Limits, LimitSet, Measurand
+from decom.parsers import measurand_parser
+from decom.plan import DecomResult
+
+T0 = np.datetime64("2020-01-01", "ns")
+LIMITS = LimitSet(red_low=0, yellow_low=10, yellow_high=90, red_high=100)
+
+
+def make_measurand(limits: Limits) -> Measurand:
+    measurand = measurand_parser.parse("[1]")
+    measurand.limits = limits
+    return measurand
+
+
+def make_result(start: int = 0, **columns) -> DecomResult:
+    length = len(next(iter(columns.values())))
+    time = T0 + np.arange(start, start + length, dtype="timedelta64[s]")
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    return DecomResult(time=time, ctime=time, columns=columns)
+
+
+def transitions(events, name="a"):
+    return [
+        ((event.time - T0) // np.timedelta64(1, "s"), event.level)
+        for event in events
+        if event.name == name
+    ]
+
+
+Y, R, N = AlarmLevel.YELLOW, AlarmLevel.RED, AlarmLevel.NOMINAL
+
+
+def test_static_limits():
+    measurands = {
+        "a": make_measurand(Limits(LIMITS)),
+        "b": measurand_parser.parse("[1]"),
+    }
+    engine = AlarmEngine(measurands)
+    values = [50, 95, 105, 95, 50, 5, -1, 50]
+    events = engine.process(make_result(a=values, b=[0] * len(values)))
+    assert transitions(events) == [
+        (1, Y),
+        (2, R),
+        (3, Y),
+        (4, N),
+        (5, Y),
+        (6, R),
+        (7, N),
+    ]
+    assert events[0].previous == N and events[0].value == 95
+    assert engine.level("a") == N
+    assert "b" not in engine.limits
+
+
+def test_persistence():
+    engine = AlarmEngine({"a": make_measurand(Limits(LIMITS, persistence=3))})
+    events = engine.process(make_result(a=[95, 95, 50, 95, 95, 95, 95, 50]))
+    assert transitions(events) == [(5, Y), (7, N)]
+
+
+def test_hysteresis():
+    engine = AlarmEngine({"a": make_measurand(Limits(LIMITS, hysteresis=5))})
+    events = engine.process(make_result(a=[91, 88, 86, 91, 84, 91]))
+    assert transitions(events) == [(0, Y), (4, N), (5, Y)]
+
+
+def test_state_limits():
+    limits = Limits(LIMITS, state="mode", states={1: LimitSet(yellow_high=40)})
+    engine = AlarmEngine({"a": make_measurand(limits)})
+    events = engine.process(make_result(a=[50, 50, 50, 50], mode=[0, 1, 1, 0]))
+    assert transitions(events) == [(1, Y), (3, N)]
+
+
+def test_state_carried_across_batches():
+    values = [50, 95, 95, 95, 91, 88, 86, 84, 105, 50, 95, 95]
+    limits = Limits(LIMITS, persistence=2, hysteresis=5)
+    whole = AlarmEngine({"a": make_measurand(limits)})
+    expected = transitions(whole.process(make_result(a=values)))
+
+    engine = AlarmEngine({"a": make_measurand(limits)})
+    events = []
+    for start in range(0, len(values), 5):
+        events += engine.process(make_result(start, a=values[start : start + 5]))
+    assert transitions(events) == expected == [(2, Y), (7, N), (11, Y)]
+
+
+def test_stacked_measurands():
+    engine = AlarmEngine(
+        {
+            "a": make_measurand(Limits(LIMITS)),
+            "b": make_measurand(Limits(LimitSet(red_high=0), persistence=2)),
+        }
+    )
+    events = engine.process(make_result(a=[50, 95], b=[1, 1]))
+    assert [(event.name, event.level) for event in events] == [("a", Y), ("b", R)]
+
+
+def test_sampled_and_supercommutated():
+    result = make_result(a=[[50, 95], [50, 50]], b=[105], mode=[0, 1])
+    result.rows["b"] = np.array([1])
+    engine = AlarmEngine(
+        {
+            "a": make_measurand(Limits(LIMITS)),
+            "b": make_measurand(Limits(LIMITS, state="mode", states={1: LIMITS})),
+        }
+    )
+    events = engine.process(result)
+    assert [(event.name, event.level) for event in events] == [
+        ("a", Y),
+        ("a", N),
+        ("b", R),
+    ]
+    assert events[2].time == result.time[1]
+
+
+def test_missing_state_measurand():
+    limits = Limits(LIMITS, state="mode", states={1: LIMITS})
+    engine = AlarmEngine({"a": make_measurand(limits)})
+    with pytest.raises(ValueError):
+        engine.process(make_result(a=[1]))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"persistence": 0}, {"hysteresis": -1}, {"states": {1: LIMITS}}]
+)
+def test_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        Limits(LIMITS, **kwargs)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from decom.assembly import assemble_major_frames
+from decom.model import FrameBatch, VarUIntArray
+from decom.parsers import parameter_parser
+
+WORDS = 4
+
+
+def make_frames(counter: list[int]) -> FrameBatch:
+    n = len(counter)
+    t0 = np.datetime64("2020-01-01", "ns")
+    time = t0 + np.arange(n, dtype="timedelta64[s]")
+    data = np.zeros((n, WORDS), dtype=np.uint8)
+    data[:, 0] = counter
+    data[:, 1] = np.arange(n)
+    return FrameBatch(time=time, ctime=time, data=VarUIntArray(data, word_size=8))
+
+
+def test_contiguous_is_view():
+    frames = make_frames([0, 1, 2, 3] * 3)
+    major = assemble_major_frames(frames, parameter_parser.parse("[1]"), 4)
+    assert major.data.shape == (3, 4, WORDS)
+    assert np.shares_memory(major.data, frames.data)
+    assert major.data.word_size == 8
+    assert major.complete.all()
+    # A subcommutated word is a single column slice
+    assert major.data[:, 2, 1].tolist() == [2, 6, 10]
+
+
+@pytest.mark.parametrize(
+    "counter, first, rows",
+    [
+        # Starts mid major frame and ends early
+        (
+            [2, 3, 0, 1, 2, 3, 0],
+            0,
+            [[-1, -1, 0, 1], [2, 3, 4, 5], [6, -1, -1, -1]],
+        ),
+        # Dropped minor frames
+        ([0, 1, 3, 0, 2, 3], 0, [[0, 1, -1, 2], [3, -1, 4, 5]]),
+        # One-based counter with an out of range value
+        ([1, 2, 9, 1, 2], 1, [[0, 1], [3, 4]]),
+    ],
+)
+def test_incomplete(counter: list[int], first: int, rows: list):
+    minor_frames = len(rows[0])
+    frames = make_frames(counter)
+    major = assemble_major_frames(frames, np.array(counter), minor_frames, first=first)
+
+    expected_valid = [[r >= 0 for r in row] for row in rows]
+    assert major.valid.tolist() == expected_valid
+    assert major.data[..., 1].tolist() == [[max(r, 0) for r in row] for row in rows]
+    assert np.isnat(major.time[~major.valid]).all()
+    present = [r for row in rows for r in row if r >= 0]
+    assert major.time[major.valid].tolist() == frames.time[present].tolist()
+
+
+def test_minor():
+    frames = make_frames([0, 1, 2, 0, 2, 0, 1, 2])
+    major = assemble_major_frames(frames, frames.data[:, 0], 3)
+    minor = major.minor(1)
+    assert minor.data[:, 1].tolist() == [1, 6]
+    assert major.complete.tolist() == [True, False, True]
+
+
+def test_counter_length():
+    with pytest.raises(ValueError):
+        assemble_major_frames(make_frames([0, 1]), np.array([0]), 2)
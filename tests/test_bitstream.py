@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from decom.bitstream import unpack_words
+
+
+def pack(words: list[int], word_size: int, bit_order: str) -> bytes:
+    """Reference bit packing, one bit at a time."""
+    bits = []
+    for word in words:
+        word_bits = [(word >> i) & 1 for i in range(word_size)]
+        if bit_order == "msb":
+            word_bits.reverse()
+        bits.extend(word_bits)
+    bits.extend([0] * (-len(bits) % 8))
+    return np.packbits(
+        bits, bitorder="big" if bit_order == "msb" else "little"
+    ).tobytes()
+
+
+@pytest.mark.parametrize("bit_order", ["msb", "lsb"])
+@pytest.mark.parametrize("word_size", [1, 3, 8, 10, 12, 16, 24, 31, 57, 60, 64])
+def test_unpack_words(word_size: int, bit_order: str):
+    rng = np.random.default_rng(word_size)
+    words_per_frame = 7
+    num_frames = 5
+    words = rng.integers(0, 2**word_size, num_frames * words_per_frame, dtype=np.uint64)
+    words = [int(w) for w in words]
+    buffer = pack(words, word_size, bit_order)
+
+    out = unpack_words(buffer, word_size, words_per_frame, bit_order=bit_order)
+    assert out.shape == (num_frames, words_per_frame)
+    assert out.word_size == word_size
+    assert out.ravel().tolist() == words
+
+
+def test_unpack_words_partial_frame():
+    buffer = pack(list(range(10)), 12, "msb")
+    out = unpack_words(np.frombuffer(buffer, dtype=np.uint8), 12, 4)
+    assert out.tolist() == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+@pytest.mark.parametrize("word_size, bit_order", [(0, "msb"), (65, "msb"), (8, "x")])
+def test_unpack_words_invalid(word_size: int, bit_order: str):
+    with pytest.raises(ValueError):
+        unpack_words(b"\x00" * 16, word_size, 1, bit_order=bit_order)
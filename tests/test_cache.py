@@ -0,0 +1,67 @@
+import pathlib
+
+import pytest
+
+from decom.cache import ParseCache, include_closure
+
+
+@pytest.fixture
+def files(tmp_path: pathlib.Path) -> pathlib.Path:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "main.decom").write_text("INCLUDE = sub/a.decom  # a\nX = [1]\n")
+    (tmp_path / "sub" / "a.decom").write_text("INCLUDE = ../b.decom\nY = [2]\n")
+    (tmp_path / "b.decom").write_text("INCLUDE = main.decom\nZ = [3]\n")
+    return tmp_path
+
+
+def test_include_closure(files: pathlib.Path):
+    closure = include_closure(files / "main.decom")
+    assert closure == [
+        (files / "main.decom").resolve(),
+        (files / "sub" / "a.decom").resolve(),
+        (files / "b.decom").resolve(),
+    ]
+
+
+def test_parse_cache(files: pathlib.Path):
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return pathlib.Path(path).read_text()
+
+    cache = ParseCache(files / "cache")
+    path = files / "main.decom"
+    assert cache.load(path, parse, namespace="text") == path.read_text()
+    assert cache.load(path, parse, namespace="text") == path.read_text()
+    assert len(calls) == 1
+
+    # Editing an included file invalidates the entry
+    (files / "b.decom").write_text("Z = [4]\n")
+    cache.load(path, parse, namespace="text")
+    assert len(calls) == 2
+
+    cache.clear()
+    cache.load(path, parse, namespace="text")
+    assert len(calls) == 3
+
+
+def test_parse_cache_namespace(files: pathlib.Path):
+    cache = ParseCache(files / "cache")
+    path = files / "main.decom"
+    with pytest.raises(ValueError):
+        cache.load(path, lambda path: 1)
+
+    # Parsers with the same name do not share entries
+    assert cache.load(path, lambda path: 1, namespace="one") == 1
+    assert cache.load(path, lambda path: 2, namespace="two") == 2
+    assert cache.key(path, pathlib.Path.read_text) != cache.key(path, include_closure)
+
+
+def test_parse_cache_corrupt(files: pathlib.Path):
+    cache = ParseCache(files / "cache")
+    path = files / "main.decom"
+    tree = cache.load(path)
+    entry = next((files / "cache").glob("*.pickle"))
+    entry.write_bytes(b"not a pickle")
+    assert cache.load(path) == tree
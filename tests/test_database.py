@@ -0,0 +1,43 @@
+import pathlib
+
+import pytest
+
+from decom.cache import ParseCache
+from decom.database import load_database
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> pathlib.Path:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "main.decom").write_text(
+        "INCLUDE = sub/a.decom\nINCLUDE = sub/b.decom\nM = [1]\n"
+    )
+    # a and b both include c, and c includes main again
+    (tmp_path / "sub" / "a.decom").write_text("INCLUDE = c.decom\nA = [2];2c\n")
+    (tmp_path / "sub" / "b.decom").write_text(
+        "INCLUDE = c.decom\nL.USELIST = {\n  B = [3];\n}\n"
+    )
+    (tmp_path / "sub" / "c.decom").write_text("INCLUDE = ../main.decom\nC = [4]\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_database(tree: pathlib.Path, max_workers: int):
+    database = load_database(tree / "main.decom", max_workers=max_workers)
+    assert list(database) == ["M", "A", "B", "C"]
+    assert database["A"].interp == "2c"
+    assert "B" in database.uselist("L")
+    assert len(database.files) == 4
+
+
+def test_load_database_duplicate(tree: pathlib.Path):
+    (tree / "sub" / "c.decom").write_text("A = [5]\n")
+    with pytest.raises(ValueError, match="'A'"):
+        load_database(tree / "main.decom", max_workers=1)
+
+
+def test_load_database_cached(tree: pathlib.Path):
+    cache = ParseCache(tree / "cache")
+    first = load_database(tree / "main.decom", max_workers=1, cache=cache)
+    assert len(list((tree / "cache").glob("*.pickle"))) == 4
+    assert load_database(tree / "main.decom", max_workers=2, cache=cache) == first
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from decom.delta import ChangeOnly
+from decom.plan import DecomResult
+
+
+def make_result(values, start: int = 0) -> DecomResult:
+    offsets = np.arange(start, start + len(values), dtype="timedelta64[s]")
+    time = np.datetime64("2020-01-01", "ns") + offsets
+    return DecomResult(
+        time=time,
+        ctime=time,
+        columns={"a": np.asarray(values), "b": np.asarray(values)},
+    )
+
+
+def test_change_only():
+    result = make_result([1, 1, 2, 2, 2, 3, 1])
+    time, values = ChangeOnly().process(result)["a"]
+    assert values.tolist() == [1, 2, 3, 1]
+    np.testing.assert_array_equal(time, result.time[[0, 2, 5, 6]])
+
+
+def test_change_only_selected_names():
+    output = ChangeOnly(names=["a"]).process(make_result([1, 1, 2]))
+    assert output["a"][1].tolist() == [1, 2]
+    assert output["b"][1].tolist() == [1, 1, 2]
+
+
+def test_change_only_across_batches():
+    delta = ChangeOnly()
+    assert delta.select("a", np.array([1, 1, 2])).tolist() == [0, 2]
+    assert delta.select("a", np.array([2, 2])).tolist() == []
+    assert delta.select("a", np.array([], dtype=int)).tolist() == []
+    assert delta.select("a", np.array([2, 3])).tolist() == [1]
+    delta.reset()
+    assert delta.select("a", np.array([3])).tolist() == [0]
+
+
+def test_change_only_nan():
+    delta = ChangeOnly()
+    values = np.array([np.nan, np.nan, 1.0, np.nan])
+    assert delta.select("a", values).tolist() == [0, 2, 3]
+    assert delta.select("a", np.array([np.nan])).tolist() == []
+
+
+def test_keyframes():
+    delta = ChangeOnly(keyframe_every=3)
+    assert delta.select("a", np.array([1] * 8)).tolist() == [0, 3, 6]
+    # The keyframe interval carries over the batch boundary
+    assert delta.select("a", np.array([1, 1, 2, 2, 2, 2])).tolist() == [1, 2, 5]
+    assert delta.select("a", np.array([2])).tolist() == []
+    assert delta.select("a", np.array([2, 2])).tolist() == [1]
+
+
+@pytest.mark.parametrize("every", [1, 2, 5, 7])
+def test_keyframes_match_batches(every: int):
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 2, 200) * rng.integers(0, 2, 200)
+    expected = ChangeOnly(keyframe_every=every).select("a", values)
+
+    delta = ChangeOnly(keyframe_every=every)
+    keep = []
+    for start in range(0, len(values), 13):
+        chunk = delta.select("a", values[start : start + 13])
+        keep.extend(chunk + start)
+    assert keep == expected.tolist()
+
+    gaps = np.diff(np.concatenate([expected, [len(values)]]))
+    assert gaps.max() <= every
+
+
+def test_keyframe_every_must_be_positive():
+    with pytest.raises(ValueError):
+        ChangeOnly(keyframe_every=0)
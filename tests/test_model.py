@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 
 from decom import utils
-from decom.model import FrameBatch, VarUIntArray
+from decom.model import FrameBatch, FrameRingBuffer, IndexedFrameBatch, VarUIntArray
 
 from .conftest import NUM_FRAMES, SAMPLE_DATA
 
@@ -51,3 +51,103 @@ def test_frame_batch_slice():
         ctime=np.atleast_1d(time[0]),
         data=np.atleast_2d(data[0]),
     )
+
+
+def make_frames(start: int, count: int) -> FrameBatch:
+    t0 = np.datetime64("2020-01-01", "ns")
+    rows = np.arange(start, start + count)
+    time = t0 + rows.astype("timedelta64[s]")
+    data = VarUIntArray(rows[:, None] * [1, 2], word_size=16)
+    return FrameBatch(time=time, ctime=time, data=data)
+
+
+def test_frame_batch_slice_is_view():
+    fb = make_frames(0, NUM_FRAMES)
+    for part in [fb[2:5], fb[3], fb[-1]]:
+        assert np.shares_memory(part.data, fb.data)
+        assert part.data.word_size == 16
+    assert fb[-1] == make_frames(NUM_FRAMES - 1, 1)
+    assert fb[[1, 3]] == FrameBatch.concat([fb[1], fb[3]])
+    assert len(fb[fb.data[:, 0] % 2 == 0]) == NUM_FRAMES // 2
+
+
+def test_frame_batch_eq_nat():
+    fb = make_frames(0, 3)
+    nat = np.full(3, np.datetime64("NaT", "ns"))
+    assert FrameBatch(time=nat, ctime=nat, data=fb.data) == FrameBatch(
+        time=nat.copy(), ctime=nat.copy(), data=fb.data.copy()
+    )
+    assert fb != fb[:2]
+    with pytest.raises(TypeError):
+        fb == 1
+
+
+def test_frame_batch_concat():
+    parts = [make_frames(0, 3), make_frames(3, 0), make_frames(3, 4)]
+    result = FrameBatch.concat(parts)
+    assert result == make_frames(0, 7)
+    assert result.data.word_size == 16
+    assert not any(np.shares_memory(result.data, part.data) for part in parts)
+
+    with pytest.raises(ValueError):
+        FrameBatch.concat([])
+    with pytest.raises(ValueError):
+        other = VarUIntArray(parts[0].data, word_size=8)
+        FrameBatch.concat([parts[0], FrameBatch(parts[0].ctime, parts[0].time, other)])
+
+
+@pytest.mark.parametrize("sizes", [[1] * 12, [3, 4, 5], [7, 7], [20], [0, 2, 9]])
+def test_frame_ring_buffer(sizes: list[int]):
+    ring = FrameRingBuffer(capacity=8, words_per_frame=2, word_size=16)
+    start = 0
+    for size in sizes:
+        ring.append(make_frames(start, size))
+        start += size
+        assert len(ring) == min(start, 8)
+        assert ring.total == start
+        assert ring.latest() == make_frames(start - len(ring), len(ring))
+        assert ring.latest(3) == make_frames(max(start - 3, 0), min(start, 3))
+        assert len(ring) == 0 or np.shares_memory(ring.latest().data, ring._data)
+
+
+def test_frame_ring_buffer_mismatch():
+    ring = FrameRingBuffer(capacity=4, words_per_frame=3, word_size=16)
+    with pytest.raises(ValueError):
+        ring.append(make_frames(0, 2))
+
+
+def make_indexed(index: list[int]) -> IndexedFrameBatch:
+    t0 = np.datetime64("2020-01-01", "ns")
+    time = t0 + np.arange(len(index), dtype="timedelta64[s]")
+    data = VarUIntArray(np.arange(len(index))[:, None] * [1, 1], word_size=8)
+    fb = FrameBatch(time=time, ctime=time, data=data)
+    return IndexedFrameBatch(index=VarUIntArray(index, word_size=8), frames=fb)
+
+
+@pytest.mark.parametrize(
+    "values, rows",
+    [
+        (3, [3, 11]),
+        (300, []),
+        ((1, 4), [1, 5, 9, 13]),
+        ((3, 8), [3, 11]),
+        ((9, 8), []),
+        ([(0, 4), (1, 4)], [0, 1, 4, 5, 8, 9, 12, 13]),
+        ([(2, 0), (2, 4)], [2, 6, 10, 14]),
+        ([[5]], [5, 13]),
+    ],
+)
+def test_indexed_frame_batch_select(values, rows: list[int]):
+    ifb = make_indexed([x % 8 for x in range(16)])
+    out = ifb.select(values)
+    assert out.data[:, 0].tolist() == rows
+    assert out.time.tolist() == ifb.frames.time[rows].tolist()
+
+
+def test_indexed_frame_batch_groups_cached():
+    ifb = make_indexed([x % 8 for x in range(16)])
+    for value in range(8):
+        assert ifb.rows(value, 8).tolist() == [value, value + 8]
+    assert list(ifb._groups) == [8]
+    assert ifb.rows(1).tolist() == [1, 9]
+    assert list(ifb._groups) == [8, 0]
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from decom import packets
+from decom.packets import PacketDemultiplexer, PacketFormat, demux_packets
+
+
+def ccsds(apid: int, payload: bytes) -> bytes:
+    header = bytearray(6)
+    header[0:2] = (0x0800 | apid).to_bytes(2, "big")
+    header[2:4] = (0xC000).to_bytes(2, "big")
+    header[4:6] = (len(payload) - 1).to_bytes(2, "big")
+    return bytes(header) + payload
+
+
+PACKETS = [
+    (5, bytes(range(10))),
+    (7, bytes(range(3))),
+    (5, bytes(range(10, 20))),
+    (9, bytes(range(1))),
+    (5, bytes(range(20, 30))),
+]
+STREAM = b"".join(ccsds(apid, payload) for apid, payload in PACKETS)
+
+
+def test_demux():
+    batch, used = demux_packets(STREAM + b"\x08\x05\xc0")
+    assert used == len(STREAM)
+    assert batch.ids.tolist() == [apid for apid, _ in PACKETS]
+    assert batch.lengths.tolist() == [6 + len(p) for _, p in PACKETS]
+    for idx, (_, payload) in enumerate(PACKETS):
+        assert batch.packet(idx)[6:].tobytes() == payload
+        assert np.shares_memory(batch.packet(idx), batch.buffer)
+
+
+def test_select_and_groups():
+    batch, _ = demux_packets(STREAM)
+    fives = batch.select(5)
+    assert len(fives) == 3
+    assert fives.buffer is batch.buffer
+    assert [fives.packet(i)[6] for i in range(3)] == [0, 10, 20]
+
+    groups = batch.groups()
+    assert sorted(groups) == [5, 7, 9]
+    assert groups[7].offsets.tolist() == [16]
+
+
+def test_to_frames():
+    batch, _ = demux_packets(STREAM)
+    frames = batch.select(5).to_frames()
+    assert frames.data.shape == (3, 16)
+    assert frames.data[:, 6].tolist() == [0, 10, 20]
+
+    # Evenly spaced packets are a strided view of the buffer
+    stream = b"".join(ccsds(3, bytes([i] * 4)) for i in range(5))
+    frames = demux_packets(stream)[0].to_frames()
+    assert np.shares_memory(frames.data, np.frombuffer(stream, dtype=np.uint8))
+    assert frames.data[:, 6].tolist() == list(range(5))
+
+    with pytest.raises(ValueError):
+        batch.to_frames()
+
+    packets = batch.to_packet_batch()
+    assert packets.select(9).data.shape == (1, 7)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 17, 1000])
+def test_demultiplexer_chunks(chunk_size: int):
+    demux = PacketDemultiplexer()
+    ids, payloads = [], []
+    for start in range(0, len(STREAM), chunk_size):
+        batch = demux.process(STREAM[start : start + chunk_size])
+        ids.extend(batch.ids.tolist())
+        payloads.extend(batch.packet(i)[6:].tobytes() for i in range(len(batch)))
+    assert ids == [apid for apid, _ in PACKETS]
+    assert payloads == [p for _, p in PACKETS]
+
+
+def test_demultiplexer_waits_for_long_packet(monkeypatch):
+    calls = []
+    demux_packets_ = packets.demux_packets
+
+    def counting(data, *args, **kwargs):
+        if len(data):
+            calls.append(len(data))
+        return demux_packets_(data, *args, **kwargs)
+
+    monkeypatch.setattr(packets, "demux_packets", counting)
+    stream = ccsds(3, bytes(1000)) + ccsds(4, bytes(2))
+    demux = PacketDemultiplexer()
+    ids = []
+    for start in range(0, len(stream), 10):
+        ids.extend(demux.process(stream[start : start + 10]).ids.tolist())
+    assert ids == [3, 4]
+    # Once for the first header, then once each packet is complete
+    assert len(calls) == 3
+
+
+def test_little_endian_format():
+    fmt = PacketFormat(
+        length_offset=0,
+        length_size=2,
+        length_adjust=0,
+        id_offset=2,
+        id_size=1,
+        id_mask=0xFF,
+        byteorder="little",
+    )
+    stream = bytes([5, 0, 1, 9, 9, 4, 0, 2, 8])
+    batch, used = demux_packets(stream, fmt)
+    assert used == 9
+    assert batch.ids.tolist() == [1, 2]
+    assert batch.lengths.tolist() == [5, 4]
+
+
+def test_short_packet():
+    fmt = PacketFormat(length_adjust=0)
+    with pytest.raises(ValueError):
+        demux_packets(bytes([0, 0, 0, 0, 0, 2, 0, 0, 0, 0]), fmt)
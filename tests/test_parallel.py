@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from decom.measurand import MinorFrameOffset, MinorFrameValue
+from decom.model import FrameBatch, VarUIntArray
+from decom.parallel import ParallelDecom, ThreadedDecom
+from decom.parsers import measurand_parser, parameter_parser
+from decom.plan import DecomPlan
+
+from .test_plan import MEASURANDS, make_counted_batch
+
+
+def make_batch(num_rows: int) -> FrameBatch:
+    rng = np.random.default_rng(0)
+    t0 = np.datetime64("2020-01-01", "ns")
+    time = t0 + np.arange(num_rows, dtype="timedelta64[s]")
+    data = VarUIntArray(rng.integers(0, 2**10, size=(num_rows, 256)), word_size=10)
+    return FrameBatch(time=time, ctime=time, data=data)
+
+
+@pytest.mark.parametrize("executor", [ParallelDecom, ThreadedDecom])
+@pytest.mark.parametrize("shard", ["rows", "measurands"])
+def test_parallel_matches_plan(executor: type, shard: str):
+    measurands = {k: measurand_parser.parse(v) for k, v in MEASURANDS.items()}
+    batch = make_batch(100)
+    expected = DecomPlan(measurands, word_size=10).run(batch)
+
+    with executor(measurands, 10, max_workers=2, shard=shard, min_rows=10) as pool:
+        result = pool.run(batch)
+        assert pool.run(batch[:0])["h"].shape == (0, 8)
+
+    assert list(result) == list(expected)
+    assert result.time is batch.time
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name])
+
+
+@pytest.mark.parametrize("executor", [ParallelDecom, ThreadedDecom])
+@pytest.mark.parametrize("shard", ["rows", "measurands"])
+def test_parallel_sampling(executor: type, shard: str):
+    measurands = {
+        "all": measurand_parser.parse("[2]"),
+        "first": measurand_parser.parse("[2]"),
+        "odd": measurand_parser.parse("[2];u;[PV*2]"),
+    }
+    measurands["first"].ss = MinorFrameOffset(0)
+    measurands["odd"].ss = MinorFrameValue(1, 2)
+    counter = parameter_parser.parse("[1]")
+    batch = make_counted_batch()
+    expected = DecomPlan(measurands, word_size=8, counter=counter).run(batch)
+
+    # Split mid major frame, so the offsets must carry over between batches
+    with executor(
+        measurands, 8, max_workers=2, shard=shard, min_rows=2, counter=counter
+    ) as pool:
+        results = [pool.run(batch[:5]), pool.run(batch[5:])]
+
+    for name in measurands:
+        values = np.concatenate([result[name] for result in results])
+        times = np.concatenate([result.frame_time(name) for result in results])
+        np.testing.assert_array_equal(values, expected[name])
+        np.testing.assert_array_equal(times, expected.frame_time(name))
+    assert results[0].rows["first"].tolist() == [2]
+    assert results[1].rows["first"].tolist() == [1]
+
+
+def test_parallel_shards():
+    measurands = {k: measurand_parser.parse(v) for k, v in MEASURANDS.items()}
+    with ParallelDecom(measurands, 10, max_workers=4, min_rows=30) as pool:
+        assert [s[:2] for s in pool._shards(100)] == [(0, 33), (33, 66), (66, 100)]
+        assert pool._shards(10) == [(0, 10, tuple(MEASURANDS))]
+        pool.shard = "measurands"
+        assert [len(s[2]) for s in pool._shards(100)] == [2, 2, 2, 2]
+
+
+@pytest.mark.parametrize("executor", [ParallelDecom, ThreadedDecom])
+def test_parallel_word_size_mismatch(executor: type):
+    with executor({}, word_size=8, max_workers=1) as pool:
+        with pytest.raises(ValueError):
+            pool.run(make_batch(10))
@@ -0,0 +1,175 @@
+import asyncio
+import pathlib
+
+import numpy as np
+import pytest
+
+from decom.model import FrameBatch, VarUIntArray
+from decom.parsers import measurand_parser
+from decom.pipeline import FixedFramer, Pipeline, UDPSource, file_source, tcp_source
+from decom.plan import DecomPlan
+from decom.sync import FrameSynchronizer
+
+WORDS_PER_FRAME = 16
+NUM_FRAMES = 50
+
+
+def make_frames() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, size=(NUM_FRAMES, WORDS_PER_FRAME), dtype=np.uint8)
+    frames[:, :2] = [0xFA, 0xF3]
+    return frames
+
+
+def make_plan() -> DecomPlan:
+    measurands = {"a": "[3+4];u", "b": "[5];2c;[PV*2]", "c": "[6]++2;u"}
+    return DecomPlan(
+        {name: measurand_parser.parse(text) for name, text in measurands.items()},
+        word_size=8,
+    )
+
+
+def expected(frames: np.ndarray) -> dict[str, np.ndarray]:
+    time = np.full(len(frames), np.datetime64("NaT", "ns"))
+    batch = FrameBatch(time=time, ctime=time, data=VarUIntArray(frames, word_size=8))
+    return make_plan().run(batch).columns
+
+
+def check(results: list, frames: np.ndarray) -> None:
+    for name, column in expected(frames).items():
+        np.testing.assert_allclose(np.concatenate([r[name] for r in results]), column)
+    assert all(not np.isnat(r.time).any() for r in results)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_pipeline_batches(batch_size: int):
+    frames = make_frames()
+    results = []
+    pipeline = Pipeline(
+        chunked(frames.tobytes(), 37),
+        FixedFramer(WORDS_PER_FRAME, 8),
+        make_plan(),
+        sinks=[results.append],
+        batch_size=batch_size,
+        queue_size=1,
+    )
+    stats = asyncio.run(pipeline.run())
+
+    check(results, frames)
+    assert stats.frames == NUM_FRAMES
+    assert all(len(r.time) <= batch_size for r in results)
+    assert stats.batches == len(results)
+
+
+def test_pipeline_max_latency():
+    frames = make_frames()
+    results = []
+
+    async def main():
+        first_batch = asyncio.Event()
+
+        async def source():
+            yield frames[:3].tobytes()
+            # The rest only arrives once the first frames were sent on their own
+            await first_batch.wait()
+            yield frames[3:].tobytes()
+
+        def sink(result):
+            results.append(result)
+            first_batch.set()
+
+        pipeline = Pipeline(
+            source(),
+            FixedFramer(WORDS_PER_FRAME, 8),
+            make_plan(),
+            sinks=[sink],
+            batch_size=1000,
+            max_latency=0.01,
+        )
+        await pipeline.run()
+
+    asyncio.run(main())
+    assert [len(r.time) for r in results] == [3, NUM_FRAMES - 3]
+
+
+def test_pipeline_tcp_sync():
+    frames = make_frames()
+    # Garbage before the first frame is skipped by the synchronizer
+    data = b"\x12\x34\x56" + frames.tobytes()
+    results = []
+
+    async def sink(result):
+        await asyncio.sleep(0)
+        results.append(result)
+
+    async def main():
+        async def handle(reader, writer):
+            for start in range(0, len(data), 100):
+                writer.write(data[start : start + 100])
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            sync = FrameSynchronizer(0xFAF3, 16, WORDS_PER_FRAME, 8, verify=1)
+            pipeline = Pipeline(tcp_source(host, port), sync, make_plan(), [sink])
+            return await pipeline.run()
+
+    stats = asyncio.run(main())
+    assert stats.bytes == len(data)
+    check(results, frames)
+
+
+def test_pipeline_udp():
+    frames = make_frames()
+    results = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        source = UDPSource("127.0.0.1", 0)
+        address = await source.start()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=address
+        )
+        pipeline = Pipeline(source, FixedFramer(WORDS_PER_FRAME, 8), make_plan())
+        pipeline.sinks.append(results.append)
+        task = asyncio.create_task(pipeline.run())
+        for frame in frames:
+            transport.sendto(frame.tobytes())
+            await asyncio.sleep(0)
+        while pipeline.stats.chunks < NUM_FRAMES:
+            await asyncio.sleep(0.01)
+        transport.close()
+        source.close()
+        await asyncio.wait_for(task, 5)
+        return source.dropped
+
+    assert asyncio.run(main()) == 0
+    check(results, frames)
+
+
+def test_file_source(tmp_path: pathlib.Path):
+    path = tmp_path / "frames.bin"
+    path.write_bytes(make_frames().tobytes())
+
+    async def main():
+        return b"".join([chunk async for chunk in file_source(path, read_size=100)])
+
+    assert asyncio.run(main()) == path.read_bytes()
+
+
+def test_fixed_framer():
+    framer = FixedFramer(WORDS_PER_FRAME, 8)
+    frames = make_frames()
+    data = frames.tobytes()
+    assert len(framer.process(data[:20])) == 1
+    assert framer.process(data[20:]).data.tolist() == frames[1:].tolist()
+    with pytest.raises(ValueError):
+        FixedFramer(3, 10)
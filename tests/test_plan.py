@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from decom.measurand import MinorFrameOffset, MinorFrameValue
+from decom.model import FrameBatch, VarUIntArray
+from decom.parsers import measurand_parser, parameter_parser
+from decom.plan import DecomPlan
+
+from .conftest import NUM_FRAMES, SAMPLE_DATA
+
+MEASURANDS = {
+    "a": "[1];u",
+    "b": "[1+2];u",
+    "c": "[2+1];2c",
+    "d": "[3:1-4+4];u;[PV*2, 1]",
+    "e": "[3:5-8R+xF];u",
+    "f": "[~5-6];2c;[sin(PV)]",
+    "g": "[200] XOR xFF;u",
+    "h": "[1]++32;u",
+}
+
+
+def make_batch(word_size: int) -> FrameBatch:
+    t0 = np.datetime64("2020-01-01", "ns")
+    time = t0 + np.arange(NUM_FRAMES, dtype="timedelta64[s]")
+    return FrameBatch(time=time, ctime=time, data=SAMPLE_DATA[word_size])
+
+
+@pytest.mark.parametrize("word_size", [8, 10])
+def test_plan_matches_measurands(word_size: int):
+    measurands = {k: measurand_parser.parse(v) for k, v in MEASURANDS.items()}
+    batch = make_batch(word_size)
+    plan = DecomPlan(measurands, word_size=word_size)
+    result = plan.run(batch)
+
+    assert list(result) == list(MEASURANDS)
+    assert result.time is batch.time
+    for name, measurand in measurands.items():
+        expected = measurand.build(batch.data)
+        np.testing.assert_allclose(result[name], expected)
+
+
+def test_plan_shares_reads():
+    measurands = {
+        "a": measurand_parser.parse("[1+2]"),
+        "b": measurand_parser.parse("[2+1];2c"),
+        "c": measurand_parser.parse("[1:1-4]"),
+        "d": measurand_parser.parse("[1:4-1]"),
+    }
+    plan = DecomPlan(measurands, word_size=8)
+    assert plan.num_reads == 3
+
+
+def test_plan_kernels():
+    measurands = {k: measurand_parser.parse(v) for k, v in MEASURANDS.items()}
+    plan = DecomPlan(measurands, word_size=8)
+    # "a", "b" and "c" share the reads of words 1 and 2
+    assert [name for name, _ in plan._kernels] == ["d", "e", "f", "g"]
+
+    batch = make_batch(8)
+    first = plan.run(batch)
+    kept = {name: first[name].copy() for name in first}
+    second = plan.run(batch[2:5])
+    for name, measurand in measurands.items():
+        np.testing.assert_array_equal(first[name], kept[name])
+        np.testing.assert_allclose(second[name], measurand.build(batch.data[2:5]))
+
+
+def test_plan_raw():
+    measurands = {"a": measurand_parser.parse("[1+2];u;[PV/2]")}
+    result = DecomPlan(measurands, word_size=8).run(make_batch(8), raw=True)
+    assert result["a"].tolist() == [0x0102] * NUM_FRAMES
+
+
+def test_plan_word_size_mismatch():
+    plan = DecomPlan({"a": measurand_parser.parse("[1]")}, word_size=10)
+    with pytest.raises(ValueError):
+        plan.run(make_batch(8))
+
+
+def make_counted_batch() -> FrameBatch:
+    # Word 1 is a minor frame counter cycling 0-3, word 2 the frame number
+    data = VarUIntArray(np.zeros((NUM_FRAMES, 4), dtype=np.uint8), word_size=8)
+    data[:, 0] = (np.arange(NUM_FRAMES) + 2) % 4
+    data[:, 1] = np.arange(NUM_FRAMES)
+    batch = make_batch(8)
+    return FrameBatch(time=batch.time, ctime=batch.ctime, data=data)
+
+
+def test_plan_sampling_strategies():
+    measurands = {
+        "all": measurand_parser.parse("[2]"),
+        "first": measurand_parser.parse("[2]"),
+        "odd": measurand_parser.parse("[2];u;[PV*2]"),
+        "odd_again": measurand_parser.parse("[3]"),
+    }
+    measurands["first"].ss = MinorFrameOffset(0)
+    measurands["odd"].ss = MinorFrameOffset(1, 2)
+    measurands["odd_again"].ss = MinorFrameOffset(1, 2)
+    counter = parameter_parser.parse("[1]")
+    batch = make_counted_batch()
+    plan = DecomPlan(measurands, word_size=8, counter=counter)
+    result = plan.run(batch)
+
+    assert list(result) == list(measurands)
+    assert result["all"].tolist() == list(range(NUM_FRAMES))
+    assert result["first"].tolist() == [2, 6]
+    assert result["odd"].tolist() == [6, 10, 14, 18]
+    assert "all" not in result.rows
+    assert result.rows["odd"] is result.rows["odd_again"]
+    np.testing.assert_array_equal(result.frame_time("first"), batch.time[[2, 6]])
+    np.testing.assert_array_equal(result.series("odd")[0], batch.time[[3, 5, 7, 9]])
+
+
+@pytest.mark.parametrize("size", [1, 3, 4])
+def test_plan_sampling_across_batches(size: int):
+    measurands = {
+        "a": measurand_parser.parse("[2]"),
+        "b": measurand_parser.parse("[2]"),
+    }
+    measurands["a"].ss = MinorFrameOffset(0)
+    measurands["b"].ss = MinorFrameValue(1, 2)
+    counter = parameter_parser.parse("[1]")
+    batch = make_counted_batch()
+    expected = DecomPlan(measurands, word_size=8, counter=counter).run(batch)
+
+    plan = DecomPlan(measurands, word_size=8, counter=counter)
+    results = [plan.run(batch[i : i + size]) for i in range(0, NUM_FRAMES, size)]
+    for name in measurands:
+        values = np.concatenate([result[name] for result in results])
+        times = np.concatenate([result.frame_time(name) for result in results])
+        np.testing.assert_array_equal(values, expected[name])
+        np.testing.assert_array_equal(times, expected.frame_time(name))
+
+    plan.reset()
+    assert plan.run(batch[2:3])["a"].tolist() == []
+
+
+def test_plan_sampling_requires_counter():
+    measurand = measurand_parser.parse("[2]")
+    measurand.ss = MinorFrameValue(1)
+    with pytest.raises(ValueError):
+        DecomPlan({"a": measurand}, word_size=8)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from decom import utils
+from decom.reader import FrameFileReader
+
+NUM_FRAMES = 10
+WORDS = 16
+
+
+@pytest.mark.parametrize(
+    "word_size, byteorder", [(8, ">"), (12, ">"), (12, "<"), (32, "=")]
+)
+def test_reader_no_header(tmp_path, word_size: int, byteorder: str):
+    dtype = np.dtype(utils.word_size_to_uint(word_size))
+    values = np.arange(NUM_FRAMES * WORDS).reshape(NUM_FRAMES, WORDS) % 2**word_size
+    path = tmp_path / "frames.bin"
+    values.astype(dtype.newbyteorder(byteorder)).tofile(path)
+
+    reader = FrameFileReader(path, WORDS, word_size, byteorder=byteorder, chunk_size=4)
+    assert len(reader) == NUM_FRAMES
+
+    batches = list(reader)
+    assert [len(b.time) for b in batches] == [4, 4, 2]
+    data = np.concatenate([b.data for b in batches])
+    assert data.tolist() == values.tolist()
+    assert batches[0].data.word_size == word_size
+    assert np.isnat(batches[0].time).all()
+
+
+def test_reader_header(tmp_path):
+    header = np.dtype([("time", ">i8"), ("ctime", ">i8")])
+    record = np.dtype([("header", header), ("data", "u1", (WORDS,))])
+    records = np.zeros(NUM_FRAMES, dtype=record)
+    records["header"]["time"] = np.arange(NUM_FRAMES) * 1_000_000
+    records["header"]["ctime"] = np.arange(NUM_FRAMES) * 2_000_000
+    records["data"] = np.arange(WORDS)
+
+    path = tmp_path / "frames.bin"
+    with open(path, "wb") as f:
+        f.write(b"\xff" * 7)
+        records.tofile(f)
+        f.write(b"\x00" * 5)
+
+    reader = FrameFileReader(path, WORDS, 8, header=header, offset=7)
+    assert len(reader) == NUM_FRAMES
+    assert reader.trailing_bytes == 5
+
+    batch = reader.read(2, 5)
+    t0 = np.datetime64("1970-01-01", "ns")
+    ms = np.timedelta64(1, "ms")
+    assert batch.time.tolist() == (t0 + np.arange(2, 5) * ms).tolist()
+    assert batch.ctime.tolist() == (t0 + np.arange(2, 5) * 2 * ms).tolist()
+    assert batch.data.tolist() == [list(range(WORDS))] * 3
+
+    # Native-order frame data is not copied
+    assert np.shares_memory(batch.data, reader._records)
+
+
+def test_reader_requires_time(tmp_path):
+    path = tmp_path / "frames.bin"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        FrameFileReader(path, WORDS, 8, header=np.dtype([("ctime", "i8")]))
+    assert len(FrameFileReader(path, WORDS, 8)) == 0
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from decom.sync import FrameSynchronizer, SyncState
+
+SYNC = 0x1ACFFC1D
+WORDS = 16
+
+
+def make_frames(rng, num_frames: int) -> np.ndarray:
+    frames = rng.integers(0, 256, (num_frames, WORDS), dtype=np.uint8)
+    frames[:, :4] = np.frombuffer(SYNC.to_bytes(4, "big"), dtype=np.uint8)
+    return frames
+
+
+def to_stream(frames: np.ndarray, prefix_bits: int, rng) -> np.ndarray:
+    prefix = rng.integers(0, 2, prefix_bits, dtype=np.uint8)
+    bits = np.concatenate([prefix, np.unpackbits(frames.ravel())])
+    return np.packbits(bits)
+
+
+def run(sync: FrameSynchronizer, stream: np.ndarray, chunk_size: int):
+    frames, errors = [], []
+    for start in range(0, len(stream), chunk_size):
+        result = sync.process(stream[start : start + chunk_size].tobytes())
+        frames.extend(result.frames.data.tolist())
+        errors.extend(result.errors.tolist())
+    return frames, errors
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+@pytest.mark.parametrize("prefix_bits", [0, 13, 300, 20_000])
+def test_sync_finds_frames(chunk_size: int, prefix_bits: int):
+    rng = np.random.default_rng(prefix_bits)
+    frames = make_frames(rng, 20)
+    stream = to_stream(frames, prefix_bits, rng)
+
+    sync = FrameSynchronizer(SYNC, 32, WORDS, 8)
+    out, errors = run(sync, stream, chunk_size)
+
+    assert sync.state == SyncState.LOCK
+    assert out == frames.tolist()
+    assert errors == [0] * len(frames)
+
+
+def test_sync_bit_errors():
+    rng = np.random.default_rng(1)
+    frames = make_frames(rng, 10)
+    frames[3, 0] ^= 0b00000101
+    frames[6, 2] ^= 0b10000000
+    stream = to_stream(frames, 5, rng)
+
+    sync = FrameSynchronizer(SYNC, 32, WORDS, 8, max_errors=2)
+    out, errors = run(sync, stream, 32)
+    assert out == frames.tolist()
+    assert errors == [0, 0, 0, 2, 0, 0, 1, 0, 0, 0]
+
+
+def test_sync_flywheel_and_reacquire():
+    rng = np.random.default_rng(2)
+    frames = make_frames(rng, 12)
+    # Corrupt the sync of frames 4-6; a flywheel of 2 keeps frames 4 and 5
+    frames[4:7, :4] = 0x55
+    stream = to_stream(frames, 0, rng)
+
+    sync = FrameSynchronizer(SYNC, 32, WORDS, 8, flywheel=2)
+    out, errors = run(sync, stream, 1000)
+    assert out == frames[:6].tolist() + frames[7:].tolist()
+    assert errors[4] > 0 and errors[5] > 0
+
+
+def test_sync_non_byte_frames():
+    rng = np.random.default_rng(3)
+    words = rng.integers(0, 2**10, (6, 5), dtype=np.uint16)
+    words[:, 0] = 0b1110101100
+    word_bits = [[(w >> i) & 1 for i in range(9, -1, -1)] for w in words.ravel()]
+    prefix = rng.integers(0, 2, 3, dtype=np.uint8)
+    bits = np.concatenate([prefix, np.ravel(word_bits).astype(np.uint8)])
+    sync = FrameSynchronizer(0b1110101100, 10, 5, 10, verify=3)
+    result = sync.process(np.packbits(bits))
+    assert result.frames.data.tolist() == words.tolist()
+    assert result.frames.data.word_size == 10
+
+
+def test_sync_no_frames():
+    sync = FrameSynchronizer(SYNC, 32, WORDS, 8)
+    result = sync.process(bytes(100))
+    assert len(result.frames.time) == 0
+    assert result.frames.data.shape == (0, WORDS)
+    assert sync.state == SyncState.SEARCH
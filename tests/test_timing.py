@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from decom.model import FrameBatch, VarUIntArray
+from decom.parsers import measurand_parser, parameter_parser
+from decom.plan import DecomPlan
+from decom.timing import SampleTiming, flatten_samples, sample_columns
+
+WORDS_PER_FRAME = 16
+
+
+def make_batch(num_rows: int = 4) -> FrameBatch:
+    t0 = np.datetime64("2020-01-01", "ns")
+    # 16 words of 8 bits at 1 kbit/s is 128 ms per frame
+    time = t0 + np.arange(num_rows) * np.timedelta64(128, "ms")
+    data = np.arange(num_rows * WORDS_PER_FRAME).reshape(num_rows, WORDS_PER_FRAME)
+    return FrameBatch(time=time, ctime=time, data=VarUIntArray(data, word_size=8))
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("[3+4]", 2),
+        ("[4+3]", 2),
+        ("[2]++4", [1, 5, 9, 13]),
+        ("[(1+2)++4<12]", [0, 4, 8]),
+        ("[14]--4", [13, 9, 5, 1]),
+    ],
+)
+def test_sample_columns(text: str, expected):
+    columns = sample_columns(parameter_parser.parse(text), WORDS_PER_FRAME)
+    assert columns.tolist() == expected
+
+
+def test_sample_timing():
+    with pytest.raises(ValueError):
+        SampleTiming()
+    with pytest.raises(ValueError):
+        SampleTiming(bit_rate=1, frame_period=1)
+    assert SampleTiming(bit_rate=1000).word_period(8, WORDS_PER_FRAME) == 0.008
+    assert SampleTiming(frame_period=0.128).word_period(8, WORDS_PER_FRAME) == 0.008
+
+
+@pytest.mark.parametrize(
+    "timing", [SampleTiming(bit_rate=1000), SampleTiming(frame_period=0.128)]
+)
+def test_plan_sample_time(timing: SampleTiming):
+    measurands = {
+        "a": measurand_parser.parse("[3]"),
+        "up": measurand_parser.parse("[2]++4"),
+        "down": measurand_parser.parse("[14]--4"),
+    }
+    batch = make_batch()
+    result = DecomPlan(measurands, word_size=8).run(batch, timing=timing)
+
+    ms = np.timedelta64(1, "ms")
+    assert result.sample_time["a"].tolist() == (batch.time + 16 * ms).tolist()
+    assert result.sample_time["up"].shape == result["up"].shape
+    offsets = result.sample_time["up"][1] - batch.time[1]
+    assert (offsets // ms).tolist() == [8 * c for c in [1, 5, 9, 13]]
+
+    # Every sample is one word, and each series visits the words in stream order
+    for name, start in [("up", 1), ("down", 1)]:
+        time, values = result.series(name)
+        assert np.all(np.diff(time) > np.timedelta64(0, "ns"))
+        assert values.tolist() == sorted(values.tolist())
+        assert time[0] == batch.time[0] + start * 8 * ms
+
+
+def test_series_without_timing():
+    result = DecomPlan({"up": measurand_parser.parse("[2]++4")}, 8).run(make_batch())
+    time, values = result.series("up")
+    assert time.tolist() == np.repeat(make_batch().time, 4).tolist()
+    assert len(values) == 16
+
+
+def test_flatten_samples_empty():
+    time = np.zeros((0, 3), dtype="datetime64[ns]")
+    assert flatten_samples(time, np.zeros((0, 3)))[1].shape == (0,)
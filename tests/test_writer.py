@@ -0,0 +1,182 @@
+import os
+import pathlib
+
+import numpy as np
+import pytest
+
+from decom.delta import ChangeOnly
+from decom.measurand import MinorFrameOffset
+from decom.parsers import measurand_parser, parameter_parser
+from decom.plan import DecomPlan
+from decom.writer import ArrowWriter, NpyDirectoryWriter, read_npy_directory
+
+from .conftest import NUM_FRAMES
+from .test_parallel import make_batch
+from .test_plan import make_counted_batch
+
+MEASURANDS = {"a": "[1+2];u;[PV/2]", "b/c": "[3];2c", "d": "[1]++64;u"}
+
+
+def make_plan() -> DecomPlan:
+    measurands = {k: measurand_parser.parse(v) for k, v in MEASURANDS.items()}
+    return DecomPlan(measurands, word_size=10)
+
+
+def make_sampled_plan() -> DecomPlan:
+    measurands = {name: measurand_parser.parse("[2]") for name in ["all", "odd"]}
+    measurands["odd"].ss = MinorFrameOffset(1, 2)
+    return DecomPlan(measurands, word_size=8, counter=parameter_parser.parse("[1]"))
+
+
+def make_slow_batch():
+    # Word 1 changes every 25 frames
+    batch = make_batch(100)
+    batch.data[:, 0] = np.arange(100) // 25
+    return batch
+
+
+def test_npy_directory_writer(tmp_path: pathlib.Path):
+    plan = make_plan()
+    batch = make_batch(100)
+    with NpyDirectoryWriter(tmp_path, buffer_rows=30) as writer:
+        for start in range(0, 100, 7):
+            part = batch[start : start + 7]
+            writer.write(plan.run(part), raw=plan.run(part, raw=True))
+        # Flushed files can be read while writing continues
+        assert len(read_npy_directory(tmp_path)["time"]) == writer.rows > 0
+    assert writer.rows == 100
+
+    columns = read_npy_directory(tmp_path)
+    assert sorted(columns) == sorted(
+        ["time", "ctime"]
+        + [f"{kind}/{name}" for kind in ["eu", "raw"] for name in MEASURANDS]
+    )
+    assert isinstance(columns["eu/a"], np.memmap)
+    assert (tmp_path / "eu" / "b%2Fc.npy").exists()
+
+    expected, raw = plan.run(batch), plan.run(batch, raw=True)
+    np.testing.assert_array_equal(columns["time"], batch.time)
+    for name in MEASURANDS:
+        np.testing.assert_array_equal(columns[f"eu/{name}"], expected[name])
+        np.testing.assert_array_equal(columns[f"raw/{name}"], raw[name])
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_npy_directory_writer_closes_files(tmp_path: pathlib.Path):
+    plan = make_plan()
+    before = len(os.listdir("/proc/self/fd"))
+    writer = NpyDirectoryWriter(tmp_path, buffer_rows=1)
+    for _ in range(3):
+        writer.write(plan.run(make_batch(5)))
+    assert len(os.listdir("/proc/self/fd")) == before
+    writer.close()
+    assert len(read_npy_directory(tmp_path)["eu/a"]) == 15
+
+
+def test_npy_directory_writer_mismatch(tmp_path: pathlib.Path):
+    plan = make_plan()
+    writer = NpyDirectoryWriter(tmp_path)
+    writer.write(plan.run(make_batch(5)))
+    with pytest.raises(ValueError):
+        writer.write(plan.run(make_batch(5), raw=True))
+
+
+def test_npy_directory_writer_sampled(tmp_path: pathlib.Path):
+    batch = make_counted_batch()
+    expected = make_sampled_plan().run(batch)
+    plan = make_sampled_plan()
+    with NpyDirectoryWriter(tmp_path, buffer_rows=3) as writer:
+        for start in range(0, NUM_FRAMES, 3):
+            writer.write(plan.run(batch[start : start + 3]))
+    assert writer.rows == NUM_FRAMES
+
+    columns = read_npy_directory(tmp_path)
+    assert len(columns["time"]) == len(columns["eu/all"]) == NUM_FRAMES
+    np.testing.assert_array_equal(columns["eu/odd"], expected["odd"])
+    np.testing.assert_array_equal(columns["time/odd"], expected.frame_time("odd"))
+
+
+def test_npy_directory_writer_change_only(tmp_path: pathlib.Path):
+    measurands = {"slow": "[1];u;[PV/2]", "fast": "[2]"}
+    plan = DecomPlan(
+        {k: measurand_parser.parse(v) for k, v in measurands.items()}, word_size=10
+    )
+    batch = make_slow_batch()
+    change_only = ChangeOnly(names=["slow"])
+    with NpyDirectoryWriter(tmp_path, 30, change_only) as writer:
+        for start in range(0, 100, 7):
+            part = batch[start : start + 7]
+            writer.write(plan.run(part), raw=plan.run(part, raw=True))
+    assert writer.rows == 100
+
+    columns = read_npy_directory(tmp_path)
+    assert len(columns["eu/fast"]) == 100
+    assert columns["eu/slow"].tolist() == [0, 0.5, 1, 1.5]
+    assert columns["raw/slow"].tolist() == [0, 1, 2, 3]
+    np.testing.assert_array_equal(columns["time/slow"], batch.time[::25])
+    assert "time/fast" not in columns
+    assert os.path.getsize(tmp_path / "eu" / "slow.npy") < os.path.getsize(
+        tmp_path / "eu" / "fast.npy"
+    )
+
+
+def test_arrow_writer(tmp_path: pathlib.Path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    plan = make_plan()
+    batch = make_batch(50)
+    path = tmp_path / "out.arrow"
+    with ArrowWriter(path, buffer_rows=20) as writer:
+        for start in range(0, 50, 10):
+            writer.write(plan.run(batch[start : start + 10]))
+
+    with pa.memory_map(str(path)) as source:
+        table = pyarrow.ipc.open_file(source).read_all()
+    assert table.num_rows == 50
+    expected = plan.run(batch)
+    np.testing.assert_array_equal(table["eu/a"].to_numpy(), expected["a"])
+    assert len(table["eu/d"][0]) == expected["d"].shape[1] == 4
+
+
+def test_arrow_writer_sampled(tmp_path: pathlib.Path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    batch = make_counted_batch()
+    expected = make_sampled_plan().run(batch)
+    plan = make_sampled_plan()
+    path = tmp_path / "out.arrow"
+    with ArrowWriter(path, buffer_rows=4) as writer:
+        for start in range(0, NUM_FRAMES, 3):
+            writer.write(plan.run(batch[start : start + 3]))
+    assert writer.series_path("odd") == tmp_path / "out.odd.arrow"
+
+    tables = {}
+    for name, file in [("frames", path), ("odd", writer.series_path("odd"))]:
+        with pa.memory_map(str(file)) as source:
+            tables[name] = pyarrow.ipc.open_file(source).read_all()
+    assert tables["frames"].column_names == ["time", "ctime", "eu/all"]
+    assert tables["frames"].num_rows == NUM_FRAMES
+    assert tables["odd"].column_names == ["time", "eu"]
+    np.testing.assert_array_equal(tables["odd"]["eu"].to_numpy(), expected["odd"])
+    np.testing.assert_array_equal(
+        tables["odd"]["time"].to_numpy(), expected.frame_time("odd")
+    )
+
+
+def test_arrow_writer_change_only(tmp_path: pathlib.Path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    plan = DecomPlan({"slow": measurand_parser.parse("[1]")}, word_size=10)
+    batch = make_slow_batch()
+    path = tmp_path / "out.arrow"
+    with ArrowWriter(path, buffer_rows=40, change_only=ChangeOnly()) as writer:
+        for start in range(0, 100, 10):
+            writer.write(plan.run(batch[start : start + 10]))
+
+    with pa.memory_map(str(writer.series_path("slow"))) as source:
+        table = pyarrow.ipc.open_file(source).read_all()
+    assert table["eu"].to_pylist() == [0, 1, 2, 3]
+    np.testing.assert_array_equal(table["time"].to_numpy(), batch.time[::25])